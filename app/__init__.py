@@ -1,4 +1,7 @@
 # abhinav6284/planora/Planora-4ab166033a1dad0a7ca4cb76b7b906a7dd5dfb66/app/__init__.py
+from .api.imports import bp as imports_bp
+from .api.export import bp as export_bp
+from .api.calendar import bp as calendar_bp
 from .api.focus_sessions import bp as focus_sessions_bp
 from .api.notes import bp as notes_bp
 from .api.profile import bp as profile_bp
@@ -12,19 +15,21 @@ from .api.auth import bp as auth_bp
 from flask import Flask, render_template, request, make_response
 from flask_cors import CORS
 from datetime import datetime
-from .extensions import db, migrate, jwt, limiter, oauth
+from .extensions import db, migrate, jwt, limiter, oauth, cache, jobs, plan_cache, project_index, focus_timers
 from .config import config
+from .commands import counters_cli, indexes_cli, ranks_cli, jobs_cli, purge_cli, timers_cli
 from flask_jwt_extended import JWTManager
 import os
 import logging
 
 
-def create_app(config_name='default'):
+def create_app(config_name='default', config_overrides=None):
     app = Flask(__name__,
                 template_folder='../templates',
                 static_folder='../static')
 
     app.config.from_object(config[config_name])
+    app.config.update(config_overrides or {})
 
     # Initialize extensions
     db.init_app(app)
@@ -32,6 +37,11 @@ def create_app(config_name='default'):
     jwt.init_app(app)
     limiter.init_app(app)
     oauth.init_app(app)
+    cache.init_app(app)
+    jobs.init_app(app)
+    plan_cache.init_app(app)
+    project_index.init_app(app)
+    focus_timers.init_app(app)
 
     oauth.register(
         name='google',
@@ -63,6 +73,8 @@ def create_app(config_name='default'):
         from .models.project import Project
         from .models.category import Category
         from .models.focus_session import FocusSession
+        from .models.task_counter import UserTaskCounter, CategoryTaskCounter
+        from .models.task_time import TaskTimeRollup
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
@@ -74,6 +86,16 @@ def create_app(config_name='default'):
     app.register_blueprint(notes_bp, url_prefix='/api/notes')
     app.register_blueprint(focus_sessions_bp, url_prefix='/api/focus_sessions')
     app.register_blueprint(roadmap_bp, url_prefix='/api/roadmap')
+    app.register_blueprint(calendar_bp, url_prefix='/api')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    app.register_blueprint(imports_bp, url_prefix='/api/import')
+
+    app.cli.add_command(counters_cli)
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(ranks_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(purge_cli)
+    app.cli.add_command(timers_cli)
 
     @app.route('/')
     def landing_page():
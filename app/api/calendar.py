@@ -0,0 +1,66 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..extensions import db
+from ..services.cache import cached_json_response
+from ..services.calendar import parse_bound, parse_window, task_events, focus_session_events, iter_ics
+import logging
+
+bp = Blueprint('calendar', __name__)
+
+
+@bp.route('/calendar/events', methods=['GET'])
+@jwt_required()
+def get_events():
+    """
+    Task due dates and focus sessions inside ?start=&end= (half-open),
+    as FullCalendar events. Each source is a range scan on its date index.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        try:
+            start, end = parse_window(request.args)
+        except ValueError as ve:
+            return jsonify({'success': False, 'message': f'Invalid calendar window: {ve}'}), 400
+
+        def build():
+            events = task_events(user_id, start, end) + focus_session_events(user_id, start, end)
+            return {
+                'success': True,
+                'events': events,
+                'start': start.isoformat(),
+                'end': end.isoformat()
+            }, 200
+
+        return cached_json_response(f'calendar:events:{start.isoformat()}:{end.isoformat()}', user_id, build)
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to fetch calendar events for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
+
+
+@bp.route('/calendar.ics', methods=['GET'])
+@jwt_required()
+def export_ics():
+    """
+    Stream the user's tasks and focus sessions as an iCalendar feed.
+    ?start= and ?end= are optional; without them the whole history is exported.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        try:
+            start = parse_bound(request.args['start']) if request.args.get('start') else None
+            end = parse_bound(request.args['end']) if request.args.get('end') else None
+        except ValueError as ve:
+            return jsonify({'success': False, 'message': f'Invalid date: {ve}'}), 400
+
+        response = Response(
+            stream_with_context(iter_ics(user_id, start, end, host=request.host)),
+            mimetype='text/calendar'
+        )
+        response.headers['Content-Disposition'] = 'attachment; filename=planora.ics'
+        return response
+
+    except Exception as e:
+        logging.error(f"Failed to export calendar for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
@@ -1,123 +1,184 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..extensions import db
+from ..extensions import db, cache
+from ..services.cache import cached_json_response
 from ..models.user import User
 from ..models.task import Task
 from ..models.project import Project
+from ..services.stats import compute_task_stats, compute_project_progress
+from ..services.loaders import get_project_loader
+from ..services.calendar import parse_window, task_events
 import logging
 from datetime import datetime, date, timedelta
 from sqlalchemy import func
 
 bp = Blueprint('dashboard', __name__)
 
+# Sections of the dashboard payload, in the order /data emits them
+DASHBOARD_SECTIONS = ('user', 'stats', 'projects', 'tasks', 'calendar_tasks')
+
+
+def _parse_include(raw):
+    """Parse ?include=a,b into a tuple of known section names; None when invalid."""
+    if not raw:
+        return DASHBOARD_SECTIONS
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    # 'calendar' is accepted as a shorthand for the calendar_tasks section
+    if 'calendar' in requested:
+        requested.discard('calendar')
+        requested.add('calendar_tasks')
+    if not requested or requested - set(DASHBOARD_SECTIONS):
+        return None
+    return tuple(name for name in DASHBOARD_SECTIONS if name in requested)
+
+
+def _build_user_section(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email if hasattr(user, 'email') else None
+    }
+
+
+def _build_stats_section(user_id):
+    # Calculate comprehensive statistics in a single aggregate query
+    counts = compute_task_stats(user_id)
+    total_tasks = counts['total']
+    completed_tasks = counts['completed']
+
+    total_projects = db.session.query(func.count(Project.id)).filter_by(
+        user_id=user_id,
+        status='active'
+    ).scalar()
+
+    return {
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'in_progress_tasks': counts['in_progress'],
+        'todo_tasks': counts['todo'],
+        'cancelled_tasks': counts['cancelled'],
+        'overdue_tasks': counts['overdue'],
+        'today_tasks': counts['due_today'],
+        'this_week_completed': counts['completed_this_week'],
+        'completion_rate': int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0,
+        'total_projects': total_projects
+    }
+
+
+def _build_projects_section(user_id):
+    projects = db.session.query(Project).filter_by(
+        user_id=user_id, 
+        status='active'
+    ).order_by(Project.created_at.desc()).all()
+
+    # Progress of every project from one grouped query through the association table
+    progress_by_project = compute_project_progress(p.id for p in projects)
+
+    project_data = []
+    for p in projects:
+        progress = progress_by_project[p.id]
+        project_data.append({
+            'id': p.id,
+            'name': p.name,
+            'description': p.description,
+            'status': p.status,
+            'progress': progress['progress'],
+            'task_count': progress['task_count'],
+            'completed_count': progress['completed_count'],
+            'created_at': p.created_at.isoformat() if p.created_at else None
+        })
+    return project_data
+
+
+def _build_tasks_section(user_id):
+    tasks = db.session.query(Task).filter_by(
+        user_id=user_id
+    ).order_by(Task.due_date.asc()).all()
+
+    # Tasks only link to projects through the association table
+    projects_by_task = get_project_loader().load_for_tasks(t.id for t in tasks)
+
+    task_data = []
+    for t in tasks:
+        task_project = projects_by_task.get(t.id)
+        task_data.append({
+            'id': t.id,
+            'title': t.title,
+            'description': t.description,
+            'status': t.status,
+            'priority': t.priority,
+            'due_date': t.due_date.isoformat() if t.due_date else None,
+            'project_id': task_project.id if task_project else None,
+            'estimated_duration': t.estimated_duration,
+            'created_at': t.created_at.isoformat() if t.created_at else None,
+            'completed_at': t.completed_at.isoformat() if t.completed_at else None
+        })
+    return task_data
+
+
+def _build_dashboard_data(user_id, include=DASHBOARD_SECTIONS, window=None):
+    """Build the requested dashboard sections; returns (payload, status)."""
+    # Get user with error handling
+    user = db.session.get(User, user_id)
+    if not user:
+        return {'success': False, 'message': 'User not found'}, 404
+
+    data = {}
+    if 'user' in include:
+        data['user'] = _build_user_section(user)
+    if 'stats' in include:
+        data['stats'] = _build_stats_section(user_id)
+    if 'projects' in include:
+        data['projects'] = _build_projects_section(user_id)
+    if 'tasks' in include:
+        data['tasks'] = _build_tasks_section(user_id)
+    if 'calendar_tasks' in include:
+        start, end = window
+        data['calendar_tasks'] = task_events(user_id, start, end)
+        data['calendar_window'] = {'start': start.isoformat(), 'end': end.isoformat()}
+    data['last_updated'] = datetime.now().isoformat()
+
+    return {'success': True, 'data': data}, 200
+
+
+def _section_response(name, user_id, build):
+    """Serve one dashboard section from the per-user cache."""
+    def build_section():
+        payload = build()
+        return {'success': True, 'data': payload, 'last_updated': datetime.now().isoformat()}, 200
+    return cached_json_response(f'dashboard:{name}', user_id, build_section)
+
+
 @bp.route('/data', methods=['GET'])
 @jwt_required()
 def dashboard_data():
     """
-    Fetches and returns all necessary data for the user's dashboard,
-    including comprehensive statistics and data for all dashboard sections.
+    Fetches and returns the data for the user's dashboard. All sections are
+    returned by default; ?include=stats,projects narrows the payload to the
+    sections the current view needs, and ?start=&end= set the calendar window.
+    The payload is cached per user until their next write and carries an ETag.
     """
     try:
         user_id_str = get_jwt_identity()
         user_id = int(user_id_str)
 
-        # Get user with error handling
-        user = db.session.get(User, user_id)
-        if not user:
-            return jsonify({'success': False, 'message': 'User not found'}), 404
-
-        # Fetch data with optimized queries
-        projects = db.session.query(Project).filter_by(
-            user_id=user_id, 
-            status='active'
-        ).order_by(Project.created_at.desc()).all()
-
-        tasks = db.session.query(Task).filter_by(
-            user_id=user_id
-        ).order_by(Task.due_date.asc()).all()
-
-        # Calculate comprehensive statistics
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == 'completed'])
-        in_progress_tasks = len([t for t in tasks if t.status == 'in-progress'])
-        overdue_tasks = len([t for t in tasks if t.due_date and t.due_date < datetime.now() and t.status != 'completed'])
-
-        # Calculate productivity metrics
-        today_tasks = [t for t in tasks if t.due_date and t.due_date.date() == date.today()]
-        this_week_completed = len([t for t in tasks if t.completed_at and t.completed_at >= datetime.now() - timedelta(days=7)])
-
-        # Prepare data with enhanced structure
-        project_data = []
-        for p in projects:
-            project_tasks = [t for t in tasks if t.project_id == p.id]
-            project_completed = len([t for t in project_tasks if t.status == 'completed'])
-            progress = int((project_completed / len(project_tasks)) * 100) if project_tasks else 0
-
-            project_data.append({
-                'id': p.id,
-                'name': p.name,
-                'description': p.description,
-                'status': p.status,
-                'progress': progress,
-                'task_count': len(project_tasks),
-                'created_at': p.created_at.isoformat() if p.created_at else None
-            })
-
-        task_data = []
-        for t in tasks:
-            task_data.append({
-                'id': t.id,
-                'title': t.title,
-                'description': t.description,
-                'status': t.status,
-                'priority': t.priority,
-                'due_date': t.due_date.isoformat() if t.due_date else None,
-                'project_id': t.project_id,
-                'estimated_duration': t.estimated_duration,
-                'created_at': t.created_at.isoformat() if t.created_at else None,
-                'completed_at': t.completed_at.isoformat() if hasattr(t, 'completed_at') and t.completed_at else None
-            })
-
-        # Calendar events for FullCalendar
-        calendar_task_data = []
-        for t in tasks:
-            if t.due_date:
-                calendar_task_data.append({
-                    'id': f'task_{t.id}',
-                    'title': t.title,
-                    'start': t.due_date.isoformat(),
-                    'backgroundColor': '#00d4ff' if t.status != 'completed' else '#2ea043',
-                    'borderColor': '#00d4ff' if t.status != 'completed' else '#2ea043'
-                })
-
-        # Enhanced statistics
-        stats = {
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'todo_tasks': total_tasks - completed_tasks - in_progress_tasks,
-            'overdue_tasks': overdue_tasks,
-            'today_tasks': len(today_tasks),
-            'this_week_completed': this_week_completed,
-            'completion_rate': int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0,
-            'total_projects': len(projects)
-        }
-
-        return jsonify({
-            'success': True,
-            'data': {
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email if hasattr(user, 'email') else None
-                },
-                'stats': stats,
-                'projects': project_data,
-                'tasks': task_data,
-                'calendar_tasks': calendar_task_data,
-                'last_updated': datetime.now().isoformat()
-            }
-        }), 200
+        include = _parse_include(request.args.get('include'))
+        if include is None:
+            return jsonify({
+                'success': False,
+                'message': f"include must be a comma-separated list of: {', '.join(DASHBOARD_SECTIONS)}"
+            }), 400
+
+        window = None
+        cache_name = 'dashboard:data:' + ','.join(include)
+        if 'calendar_tasks' in include:
+            try:
+                window = parse_window(request.args)
+            except ValueError as ve:
+                return jsonify({'success': False, 'message': f'Invalid calendar window: {ve}'}), 400
+            cache_name += f':{window[0].isoformat()}:{window[1].isoformat()}'
+
+        return cached_json_response(cache_name, user_id, lambda: _build_dashboard_data(user_id, include, window))
 
     except ValueError as ve:
         logging.error(f"Invalid user_id format: {user_id_str}. Error: {ve}")
@@ -127,38 +188,114 @@ def dashboard_data():
         logging.error(f"Failed to fetch dashboard data for user_id {get_jwt_identity()}. Error: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
 
+
 @bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_stats():
-    """Get detailed statistics for analytics dashboard"""
+    """Task and project counters for the dashboard stat cards."""
+    try:
+        user_id = int(get_jwt_identity())
+        return _section_response('stats', user_id, lambda: _build_stats_section(user_id))
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to fetch stats for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'Failed to fetch statistics'}), 500
+
+
+@bp.route('/projects', methods=['GET'])
+@jwt_required()
+def get_dashboard_projects():
+    """Active projects with their progress."""
+    try:
+        user_id = int(get_jwt_identity())
+        return _section_response('projects', user_id, lambda: _build_projects_section(user_id))
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to fetch dashboard projects for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
+
+
+@bp.route('/tasks', methods=['GET'])
+@jwt_required()
+def get_dashboard_tasks():
+    """The user's tasks ordered by due date."""
+    try:
+        user_id = int(get_jwt_identity())
+        return _section_response('tasks', user_id, lambda: _build_tasks_section(user_id))
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to fetch dashboard tasks for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
+
+
+@bp.route('/calendar', methods=['GET'])
+@jwt_required()
+def get_dashboard_calendar():
+    """Calendar events for tasks due inside ?start=&end= (half-open)."""
     try:
         user_id = int(get_jwt_identity())
+        try:
+            start, end = parse_window(request.args)
+        except ValueError as ve:
+            return jsonify({'success': False, 'message': f'Invalid calendar window: {ve}'}), 400
 
-        # Get task statistics by date for charts
-        task_stats = db.session.query(
-            func.date(Task.created_at).label('date'),
-            func.count(Task.id).label('count'),
-            Task.status
-        ).filter_by(user_id=user_id).group_by(
-            func.date(Task.created_at), Task.status
-        ).all()
-
-        # Get project statistics
-        project_stats = db.session.query(
-            func.date(Project.created_at).label('date'),
-            func.count(Project.id).label('count')
-        ).filter_by(user_id=user_id).group_by(
-            func.date(Project.created_at)
-        ).all()
-
-        # Format data for charts
-        chart_data = {
-            'tasks_by_date': [{'date': str(stat.date), 'count': stat.count, 'status': stat.status} for stat in task_stats],
-            'projects_by_date': [{'date': str(stat.date), 'count': stat.count} for stat in project_stats]
-        }
-
-        return jsonify({'success': True, 'data': chart_data}), 200
+        return _section_response(
+            f'calendar:{start.isoformat()}:{end.isoformat()}', user_id,
+            lambda: task_events(user_id, start, end)
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to fetch calendar for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
+
+
+def _build_chart_data(user_id):
+    """Per-day task and project counts for the analytics charts."""
+    # Get task statistics by date for charts
+    task_stats = db.session.query(
+        func.date(Task.created_at).label('date'),
+        func.count(Task.id).label('count'),
+        Task.status
+    ).filter_by(user_id=user_id).group_by(
+        func.date(Task.created_at), Task.status
+    ).all()
+
+    # Get project statistics
+    project_stats = db.session.query(
+        func.date(Project.created_at).label('date'),
+        func.count(Project.id).label('count')
+    ).filter_by(user_id=user_id).group_by(
+        func.date(Project.created_at)
+    ).all()
+
+    # Format data for charts
+    chart_data = {
+        'tasks_by_date': [{'date': str(stat.date), 'count': stat.count, 'status': stat.status} for stat in task_stats],
+        'projects_by_date': [{'date': str(stat.date), 'count': stat.count} for stat in project_stats]
+    }
+
+    return {'success': True, 'data': chart_data}, 200
+
+
+@bp.route('/charts', methods=['GET'])
+@jwt_required()
+def get_chart_data():
+    """Get detailed statistics for analytics dashboard"""
+    try:
+        user_id = int(get_jwt_identity())
+        return cached_json_response('dashboard:charts', user_id, lambda: _build_chart_data(user_id))
 
     except Exception as e:
         logging.error(f"Failed to fetch stats for user {get_jwt_identity()}. Error: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'Failed to fetch statistics'}), 500
+
+
+@bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def cache_stats():
+    """Hit/miss counters of the dashboard response cache, for monitoring."""
+    return jsonify({'success': True, 'data': cache.get_stats()}), 200
@@ -0,0 +1,45 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..services.export import EXPORT_FORMATS, EXPORT_TABLES, ExportUnavailable, iter_export, parse_tables
+import logging
+
+bp = Blueprint('export', __name__)
+
+
+@bp.route('', methods=['GET'])
+@jwt_required()
+def export_data():
+    """
+    Stream all of the user's data. ?format=ndjson (default) emits one JSON
+    object per row; csv and parquet emit a zip with one file per table.
+    ?tables=tasks,notes limits the export to the named tables.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'message': f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+            }), 400
+
+        tables = parse_tables(request.args.get('tables'))
+        if tables is None:
+            return jsonify({
+                'success': False,
+                'message': f"tables must be a comma-separated list of: {', '.join(EXPORT_TABLES)}"
+            }), 400
+
+        try:
+            chunks, mimetype, filename = iter_export(user_id, export_format, tables)
+        except ExportUnavailable as eu:
+            return jsonify({'success': False, 'message': str(eu)}), 501
+
+        response = Response(stream_with_context(chunks), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        return response
+
+    except Exception as e:
+        logging.error(f"Failed to export data for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
@@ -1,19 +1,39 @@
 # app/api/focus_sessions.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..extensions import db
+from ..extensions import db, focus_timers, limiter
 from ..models.focus_session import FocusSession
-from datetime import datetime
+from ..models.task import Task
+from ..services.cache import cached_json_response, invalidates_user_cache
+from ..services.focus_analytics import compute_focus_analytics, parse_analytics_args
+from ..services.focus_sessions import close_untracked_session, finish_session, reap_orphaned_sessions
+from ..services.focus_timers import TimerStateError, focused_seconds, to_public as timer_to_public
+from datetime import datetime, timezone
+import logging
 
 bp = Blueprint('focus_sessions', __name__)
 
 
+def _owned_timer(session_id, user_id):
+    timer = focus_timers.get(session_id)
+    return timer if timer is not None and timer['user_id'] == user_id else None
+
+
+def _timer_response(timer):
+    return jsonify({'success': True, 'timer': timer_to_public(timer, focus_timers.timeout)}), 200
+
+
 @bp.route('/start', methods=['POST'])
 @jwt_required()
+@invalidates_user_cache
 def start_session():
+    """Create the session row and start its timer; the only write until stop."""
     user_id = int(get_jwt_identity())
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     task_id = data.get('task_id')
+    # Stopping the session credits its time to the task
+    if task_id is not None and not Task.query.filter_by(id=task_id, user_id=user_id).first():
+        return jsonify({'success': False, 'message': 'Task not found or access denied.'}), 404
 
     session = FocusSession(
         user_id=user_id,
@@ -24,19 +44,113 @@ def start_session():
     db.session.add(session)
     db.session.commit()
 
-    return jsonify({'success': True, 'session_id': session.id}), 201
+    timer = focus_timers.start(session.id, user_id, task_id,
+                               now=session.started_at.replace(tzinfo=timezone.utc).timestamp())
+    try:
+        reap_orphaned_sessions()
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Reaping orphaned focus sessions failed. Error: {e}", exc_info=True)
+
+    return jsonify({
+        'success': True,
+        'session_id': session.id,
+        'timer': timer_to_public(timer, focus_timers.timeout)
+    }), 201
+
+
+@bp.route('/active', methods=['GET'])
+@jwt_required()
+@limiter.exempt
+def get_active_timers():
+    """The user's running and paused timers, read from the timer registry only."""
+    user_id = int(get_jwt_identity())
+    timers = [timer_to_public(timer, focus_timers.timeout) for timer in focus_timers.for_user(user_id)]
+    return jsonify({'success': True, 'timers': timers}), 200
+
+
+@bp.route('/<int:session_id>/timer', methods=['GET'])
+@jwt_required()
+@limiter.exempt
+def get_timer(session_id):
+    timer = _owned_timer(session_id, int(get_jwt_identity()))
+    if timer is None:
+        return jsonify({'success': False, 'message': 'No active timer for this session'}), 404
+    return _timer_response(timer)
+
+
+@bp.route('/<int:session_id>/<any(pause, resume, heartbeat):action>', methods=['POST'])
+@jwt_required()
+@limiter.exempt
+def update_timer(session_id, action):
+    """Pause, resume or keep alive a running session without touching the database."""
+    if _owned_timer(session_id, int(get_jwt_identity())) is None:
+        return jsonify({'success': False, 'message': 'No active timer for this session'}), 404
+    try:
+        timer = getattr(focus_timers, action)(session_id)
+    except TimerStateError as e:
+        return jsonify({'success': False, 'message': str(e)}), 409
+    if timer is None:
+        # Stopped or reaped in the meantime
+        return jsonify({'success': False, 'message': 'No active timer for this session'}), 404
+
+    if action == 'heartbeat':
+        try:
+            reap_orphaned_sessions()
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f"Reaping orphaned focus sessions failed. Error: {e}", exc_info=True)
+    return _timer_response(timer)
 
 
 @bp.route('/<int:session_id>/stop', methods=['POST'])
 @jwt_required()
+@invalidates_user_cache
 def stop_session(session_id):
+    """
+    End the session with the focus time from its timer, so pauses are not
+    counted. A session whose timer was lost is closed as the reaper would,
+    with no focus time.
+    """
     user_id = int(get_jwt_identity())
     session = FocusSession.query.filter_by(
         id=session_id, user_id=user_id).first_or_404()
+    if session.ended_at is not None:
+        return jsonify({'success': False, 'message': 'Session already ended'}), 409
 
-    session.ended_at = datetime.utcnow()
-    duration = (session.ended_at - session.started_at).total_seconds() / 60
-    session.duration = int(duration)
+    ended_at = datetime.utcnow()
+    timer = focus_timers.stop(session_id)
+    if timer is not None:
+        finish_session(session, focused_seconds(timer, ended_at.replace(tzinfo=timezone.utc).timestamp()), ended_at)
+        message = 'Session stopped'
+    else:
+        close_untracked_session(session)
+        message = 'Session stopped; its timer was lost, so no focus time was recorded'
     db.session.commit()
 
-    return jsonify({'success': True, 'message': 'Session stopped'}), 200
+    return jsonify({'success': True, 'message': message, 'duration': session.duration}), 200
+
+
+@bp.route('/analytics', methods=['GET'])
+@jwt_required()
+def get_analytics():
+    """
+    Daily/weekly focus totals, streaks, a weekday x hour heatmap, minutes per
+    task and the productivity trend over ?days= (default 365) in ?tz=.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        try:
+            days, tz_name, tz = parse_analytics_args(request.args)
+        except ValueError as ve:
+            return jsonify({'success': False, 'message': f'Invalid analytics request: {ve}'}), 400
+
+        def build():
+            return {'success': True, 'data': compute_focus_analytics(user_id, days, tz_name, tz)}, 200
+
+        return cached_json_response(f'focus:analytics:{days}:{tz_name}', user_id, build)
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to compute focus analytics for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
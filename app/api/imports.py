@@ -0,0 +1,61 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..extensions import db
+from ..services.cache import invalidates_user_cache
+from ..services.importer import IMPORT_FORMATS, ImportFormatError, detect_format, import_tasks
+import io
+import logging
+
+bp = Blueprint('imports', __name__)
+
+
+@bp.route('', methods=['POST'])
+@jwt_required()
+@invalidates_user_cache
+def import_data():
+    """
+    Import tasks from an uploaded CSV, NDJSON or JSON file (a plain task list,
+    a Todoist export or a Trello board), sent as the multipart field `file`
+    or as the raw request body with ?format=. Projects are matched by name and
+    created when missing. Rows that fail validation are skipped and reported;
+    ?dry_run=true only validates.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+
+        upload = request.files.get('file')
+        if upload is not None:
+            stream, filename = upload.stream, upload.filename
+        else:
+            stream, filename = io.BytesIO(request.get_data()), None
+
+        import_format = detect_format(filename, request.args.get('format'))
+        if import_format not in IMPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'message': f"format must be one of: {', '.join(IMPORT_FORMATS)}"
+            }), 400
+
+        dry_run = request.args.get('dry_run', 'false').lower() == 'true'
+
+        try:
+            report = import_tasks(user_id, stream, import_format, dry_run=dry_run)
+        except (ImportFormatError, UnicodeDecodeError) as fe:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': f'Could not read the file: {fe}'}), 400
+
+        if dry_run:
+            db.session.rollback()
+            return jsonify({'success': True, **report}), 200
+
+        if report['valid'] == 0:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': 'No valid rows to import.', **report}), 400
+
+        db.session.commit()
+        return jsonify({'success': True, **report}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to import data for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
+from ..services.cache import invalidates_user_cache
 from ..models.note import Note
 from ..models.project import Project
+from ..services.loaders import get_project_loader
+from ..services.note_search import note_search_filter, search_notes as run_note_search
 from datetime import datetime
 import logging
 
@@ -10,6 +13,7 @@ bp = Blueprint('notes', __name__)
 
 @bp.route('', methods=['POST'])
 @jwt_required()
+@invalidates_user_cache
 def create_note():
     """Create a new note with optional project association."""
     try:
@@ -86,13 +90,7 @@ def get_notes():
             query = query.filter(Note.project_id == project_id)
 
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    Note.title.ilike(search_term),
-                    Note.content.ilike(search_term)
-                )
-            )
+            query = query.filter(note_search_filter(search))
 
         # Apply sorting
         if sort_by == 'created_at':
@@ -104,10 +102,13 @@ def get_notes():
 
         notes = query.order_by(order_by).all()
 
+        # Resolve all referenced projects in one IN query
+        projects = get_project_loader().load_many(n.project_id for n in notes)
+
         # Format note data with project information
         note_data = []
         for note in notes:
-            project = Project.query.get(note.project_id) if note.project_id else None
+            project = projects.get(note.project_id)
 
             note_data.append({
                 'id': note.id,
@@ -149,7 +150,7 @@ def get_note(note_id):
         if not note:
             return jsonify({'success': False, 'message': 'Note not found or access denied'}), 404
 
-        project = Project.query.get(note.project_id) if note.project_id else None
+        project = get_project_loader().load(note.project_id)
 
         return jsonify({
             'success': True,
@@ -173,6 +174,7 @@ def get_note(note_id):
 
 @bp.route('/<int:note_id>', methods=['PUT'])
 @jwt_required()
+@invalidates_user_cache
 def update_note(note_id):
     """Update an existing note."""
     try:
@@ -197,12 +199,14 @@ def update_note(note_id):
                 return jsonify({'success': False, 'message': 'Note content cannot be empty'}), 400
             note.content = data['content'].strip()
 
+        loader = get_project_loader()
         if 'project_id' in data:
             if data['project_id']:
                 project = Project.query.filter_by(id=data['project_id'], user_id=user_id).first()
                 if not project:
                     return jsonify({'success': False, 'message': 'Project not found or access denied'}), 404
                 note.project_id = data['project_id']
+                loader.prime(project)
             else:
                 note.project_id = None
 
@@ -213,7 +217,7 @@ def update_note(note_id):
         db.session.commit()
 
         # Get updated note data with project info
-        project = Project.query.get(note.project_id) if note.project_id else None
+        project = loader.load(note.project_id)
 
         return jsonify({
             'success': True,
@@ -239,6 +243,7 @@ def update_note(note_id):
 
 @bp.route('/<int:note_id>', methods=['DELETE'])
 @jwt_required()
+@invalidates_user_cache
 def delete_note(note_id):
     """Delete a note."""
     try:
@@ -250,7 +255,7 @@ def delete_note(note_id):
 
         note_title = note.title  # Store for response message
 
-        db.session.delete(note)
+        note.soft_delete()
         db.session.commit()
 
         return jsonify({
@@ -279,18 +284,12 @@ def search_notes():
         if not query_text:
             return jsonify({'success': False, 'message': 'Search query is required'}), 400
 
+        page = max(request.args.get('page', 1, type=int) or 1, 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int) or 20, 1), 100)
+
         # Build search query
         search_query = Note.query.filter_by(user_id=user_id)
 
-        # Text search
-        search_term = f"%{query_text}%"
-        search_query = search_query.filter(
-            db.or_(
-                Note.title.ilike(search_term),
-                Note.content.ilike(search_term)
-            )
-        )
-
         # Project filter
         if project_id:
             search_query = search_query.filter(Note.project_id == project_id)
@@ -310,25 +309,21 @@ def search_notes():
             except ValueError:
                 return jsonify({'success': False, 'message': 'Invalid created_before date format'}), 400
 
-        # Execute search
-        notes = search_query.order_by(Note.updated_at.desc()).all()
+        # Ranked full-text search (tsvector on PostgreSQL, Python fallback elsewhere)
+        rows, has_more = run_note_search(search_query, query_text, page=page, per_page=per_page)
+        projects = get_project_loader().load_many(row['note'].project_id for row in rows)
 
-        # Format results with highlighting (basic)
         results = []
-        for note in notes:
-            project = Project.query.get(note.project_id) if note.project_id else None
-
-            # Simple highlighting - replace with proper highlighting library in production
-            highlighted_title = note.title.replace(query_text, f"<mark>{query_text}</mark>") if query_text.lower() in note.title.lower() else note.title
-            highlighted_content = note.content[:200] + "..." if len(note.content) > 200 else note.content
-            if query_text.lower() in highlighted_content.lower():
-                highlighted_content = highlighted_content.replace(query_text, f"<mark>{query_text}</mark>")
+        for row in rows:
+            note = row['note']
+            project = projects.get(note.project_id)
 
             results.append({
                 'id': note.id,
                 'title': note.title,
-                'highlighted_title': highlighted_title,
-                'content_preview': highlighted_content,
+                'highlighted_title': row['highlighted_title'],
+                'content_preview': row['content_preview'],
+                'rank': row['rank'],
                 'project_id': note.project_id,
                 'project_name': project.name if project else None,
                 'created_at': note.created_at.isoformat() if hasattr(note, 'created_at') and note.created_at else None,
@@ -340,6 +335,9 @@ def search_notes():
             'data': {
                 'results': results,
                 'count': len(results),
+                'page': page,
+                'per_page': per_page,
+                'has_more': has_more,
                 'query': query_text,
                 'search_parameters': {
                     'project_id': project_id,
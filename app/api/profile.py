@@ -3,6 +3,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
 from ..models.user import User
+from ..services.cache import invalidates_user_cache
 import logging
 
 bp = Blueprint('profile', __name__)
@@ -18,6 +19,7 @@ def get_profile():
 
 @bp.route('', methods=['PUT'])
 @jwt_required()
+@invalidates_user_cache
 def update_profile():
     user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
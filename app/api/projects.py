@@ -1,11 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-from app.models.focus_session import FocusSession
-from app.models.note import Note
 from ..extensions import db
+from ..services.cache import invalidates_user_cache
+from ..services.tombstones import soft_delete_project
 from ..models.project import Project
-from ..models.task import Task
 import logging
 
 bp = Blueprint('projects', __name__)
@@ -13,6 +12,7 @@ bp = Blueprint('projects', __name__)
 
 @bp.route('', methods=['POST'])
 @jwt_required()
+@invalidates_user_cache
 def create_project():
     """Create a new project."""
     try:
@@ -65,6 +65,7 @@ def get_projects():
 
 @bp.route('/<int:project_id>', methods=['PUT'])
 @jwt_required()
+@invalidates_user_cache
 def update_project(project_id):
     """Update an existing project."""
     try:
@@ -87,24 +88,24 @@ def update_project(project_id):
 
 @bp.route('/<int:project_id>', methods=['DELETE'])
 @jwt_required()
+@invalidates_user_cache
 def delete_project(project_id):
-    """Delete a project and its associated tasks, notes, and focus sessions."""
+    """
+    Delete a project and its associated tasks and notes. Rows are only
+    marked deleted here; `flask purge run` removes them later.
+    """
     try:
         user_id = int(get_jwt_identity())
         project = Project.query.filter_by(
             id=project_id, user_id=user_id).first_or_404()
 
-        # Manually delete associated notes
-        Note.query.filter_by(project_id=project.id).delete()
-
-        # Manually delete associated tasks and their focus sessions
-        for task in project.tasks:
-            FocusSession.query.filter_by(task_id=task.id).delete()
-            db.session.delete(task)
-
-        db.session.delete(project)
+        removed = soft_delete_project(user_id, project.id)
         db.session.commit()
-        return jsonify({'success': True, 'message': 'Project and all associated data have been deleted.'}), 200
+        return jsonify({
+            'success': True,
+            'message': 'Project and all associated data have been deleted.',
+            'data': {'deleted': removed}
+        }), 200
     except Exception as e:
         db.session.rollback()
         logging.error(
@@ -1,21 +1,21 @@
 # planora/app/api/roadmap.py
 
-from datetime import datetime
-from flask import Blueprint, jsonify, logging, request
+import json
+import logging
+import time
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..extensions import db
+from ..extensions import db, cache
+from ..services.cache import invalidates_user_cache
 from ..models.project import Project
 from ..models.task import Task
-# We will reuse the AI project generator
-from .ai import generate_project_from_goal
-import google.generativeai as genai
-import os
-import json
+from ..services.task_tree import progress_for_tasks
+from ..services.chat import AnswerStreamer, build_chat_prompt, parse_action, perform_action
+from ..services.llm import get_llm_client
+from ..services import metrics
 
 bp = Blueprint('roadmap', __name__)
 
-genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-
 
 @bp.route('/data', methods=['GET'])
 @jwt_required()
@@ -26,6 +26,12 @@ def roadmap_data():
         projects = Project.query.filter_by(user_id=user_id).order_by(
             Project.created_at.desc()).all()
 
+        tasks_by_project = {
+            project.id: project.tasks.order_by(Task.due_date.asc()).all() for project in projects}
+
+        # Progress for every task from one grouped subtask query
+        progress = progress_for_tasks([t for tasks in tasks_by_project.values() for t in tasks])
+
         projects_data = []
         for project in projects:
             project_dict = {
@@ -33,7 +39,7 @@ def roadmap_data():
                 'name': project.name,
                 'description': project.description,
                 'status': project.status,
-                'tasks': [task.to_dict() for task in project.tasks.order_by(task.due_date.asc())]
+                'tasks': [task.to_dict(progress=progress[task.id]) for task in tasks_by_project[project.id]]
             }
             projects_data.append(project_dict)
 
@@ -47,6 +53,7 @@ def roadmap_data():
 
 @bp.route('/chat', methods=['POST'])
 @jwt_required()
+@invalidates_user_cache
 def project_chat_agent():
     """
     Handles AI chat conversations with an intelligent task and project assistant.
@@ -58,88 +65,83 @@ def project_chat_agent():
     if not user_message:
         return jsonify({'success': False, 'message': 'Message is required.'}), 400
 
-    projects = Project.query.filter_by(user_id=user_id).all()
-    project_list = "\n".join(
-        [f"- {p.name} (ID: {p.id})" for p in projects]) if projects else "No projects yet."
-
-    prompt = f"""You are 'Planora Agent', an AI assistant that helps users plan their work.
+    try:
+        started = time.perf_counter()
+        prompt = build_chat_prompt(user_id, user_message)
+        action_plan = parse_action(get_llm_client().generate(prompt))
+        metrics.latency('chat.reply_ms').observe((time.perf_counter() - started) * 1000)
 
-    **USER'S PROJECTS:**
-    {project_list}
+        return jsonify(perform_action(user_id, action_plan))
 
-    **USER'S REQUEST:** "{user_message}"
+    except Exception as e:
+        db.session.rollback()
+        logging.error(
+            f"Chat agent failed for user {user_id}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': f'An error occurred: {str(e)}'}), 500
 
-    **YOUR TASK:**
-    Analyze the user's request and choose an action. Respond ONLY with a single, clean JSON object.
 
-    1.  **If the user wants to add a task:**
-        - Identify the task title, the project it belongs to, and estimate a duration in minutes.
-        - Create a brief, one-sentence description for the task.
-        - Format your response like this:
-        {{"action": "add_task", "task": {{"title": "Task Title", "description": "A brief description.", "estimated_duration": 60, "project_name": "Project Name"}}}}
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
-    2.  **If the user wants to create a new project:**
-        - Format your response like this:
-        {{"action": "create_project", "goal": "The user's goal for the new project."}}
 
-    3.  **For any other request (questions, greetings, etc.):**
-        - Provide a helpful, conversational answer.
-        - Format your response like this:
-        {{"action": "answer", "response": "Your conversational reply."}}
+@bp.route('/chat/stream', methods=['POST'])
+@jwt_required()
+def project_chat_agent_stream():
     """
+    Server-sent-events variant of /chat. "token" events carry the text of an
+    answer as the model produces it; add_task/create_project replies are
+    acted on once their JSON is complete. The final "done" event carries the
+    same payload /chat returns, plus ttfb_ms.
+    """
+    data = request.get_json() or {}
+    user_id = int(get_jwt_identity())
+    user_message = data.get('message')
 
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace('```json', '').replace('```', '')
-        action_plan = json.loads(cleaned_response)
-
-        action = action_plan.get('action')
-
-        if action == 'add_task':
-            task_details = action_plan.get('task')
-            project_name = task_details.get('project_name')
-            project = Project.query.filter(Project.name.ilike(
-                f"%{project_name}%"), Project.user_id == user_id).first()
-
-            if not project:
-                return jsonify({'success': True, 'reply': f"I couldn't find a project named '{project_name}'.", 'action_taken': 'none'})
-
-            new_task = Task(
-                title=task_details.get('title'),
-                description=task_details.get('description'),
-                estimated_duration=task_details.get('estimated_duration'),
-                user_id=user_id,
-                due_date=datetime.utcnow()
-            )
-            project.tasks.append(new_task)
-            db.session.commit()
-
-            return jsonify({
-                'success': True,
-                'reply': f"OK, I've added '{new_task.title}' to the '{project.name}' project for you.",
-                'action_taken': 'task_added',
-                'new_task': new_task.to_dict()
-            })
-
-        # --- THIS IS THE FIX ---
-        elif action == 'create_project':
-            goal = action_plan.get('goal', 'Untitled Project')
-            new_project = Project(name=goal, user_id=user_id,
-                                  description="Generated by Planora AI.")
-            db.session.add(new_project)
-            db.session.commit()
-            return jsonify({
-                'success': True,
-                'reply': f"Great! I've created a new project for you: '{new_project.name}'.",
-                'action_taken': 'reload'  # Tells frontend to refresh data
-            })
-        # --- END OF FIX ---
-
-        else:  # Answer
-            return jsonify({'success': True, 'reply': action_plan.get('response'), 'action_taken': 'none'})
+    if not user_message:
+        return jsonify({'success': False, 'message': 'Message is required.'}), 400
 
-    except Exception as e:
-        logging.error(
-            f"Chat agent failed for user {user_id}. Error: {e}", exc_info=True)
-        return jsonify({'success': False, 'message': f'An error occurred: {str(e)}'}), 500
+    started = time.perf_counter()
+    prompt = build_chat_prompt(user_id, user_message)
+    client = get_llm_client()
+
+    def events():
+        streamer = AnswerStreamer()
+        ttfb_ms = None
+        try:
+            for chunk in client.stream(prompt):
+                text = streamer.feed(chunk)
+                if text:
+                    if ttfb_ms is None:
+                        ttfb_ms = (time.perf_counter() - started) * 1000
+                        metrics.latency('chat_stream.ttfb_ms').observe(ttfb_ms)
+                    yield _sse('token', {'text': text})
+
+            result = perform_action(user_id, parse_action(streamer.buffer))
+            if result.get('action_taken') != 'none':
+                cache.invalidate_user(user_id)
+
+            total_ms = (time.perf_counter() - started) * 1000
+            metrics.latency('chat_stream.total_ms').observe(total_ms)
+            if ttfb_ms is None:
+                # Nothing was streamed, so the first byte is the final reply
+                ttfb_ms = total_ms
+                metrics.latency('chat_stream.ttfb_ms').observe(ttfb_ms)
+            yield _sse('done', dict(result, ttfb_ms=round(ttfb_ms, 1)))
+
+        except Exception as e:
+            db.session.rollback()
+            logging.error(
+                f"Streaming chat agent failed for user {user_id}. Error: {e}", exc_info=True)
+            yield _sse('error', {'success': False, 'message': 'An error occurred while generating the reply.'})
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@bp.route('/chat/metrics', methods=['GET'])
+@jwt_required()
+def chat_metrics():
+    """Latency of the chat endpoints in this process, including streaming TTFB."""
+    return jsonify({'success': True, 'data': metrics.snapshot('chat')}), 200
@@ -1,15 +1,81 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
+from ..services.cache import cached_json_response, invalidates_user_cache
 from ..models.task import Task
-from ..models.project import Project
-from datetime import datetime
+from ..models.category import Category
+from ..models.project import Project, project_task_association
+from ..models.task_counter import TaskCounterDeltas
+from ..services.loaders import get_project_loader
+from ..services.stats import compute_task_stats
+from ..services.estimation import compute_estimation_accuracy, parse_estimation_args
+from ..services import ranking
+from ..services.ranking import key_between, last_rank
+from ..services.task_tree import load_task_tree, DEFAULT_MAX_DEPTH, MAX_DEPTH_LIMIT
+from ..services.tombstones import soft_delete_task
+from ..services.pagination import (InvalidCursor, decode_cursor, encode_cursor, keyset_filter,
+                                   keyset_order, parse_limit)
+from datetime import datetime, timedelta
+from collections import defaultdict
+from sqlalchemy import bindparam, case
+from sqlalchemy.orm import load_only
 import logging
 
 bp = Blueprint('tasks', __name__)
 
+# Custom priority ordering: high, medium, low
+PRIORITY_RANK = {'high': 3, 'medium': 2, 'low': 1}
+priority_rank = case(PRIORITY_RANK, value=Task.priority, else_=0)
+
+# sort_by -> (SQL sort expression, Python value of that expression for a loaded task)
+TASK_SORT_KEYS = {
+    'created_at': (Task.created_at, lambda t: t.created_at),
+    'due_date': (Task.due_date, lambda t: t.due_date),
+    'priority': (priority_rank, lambda t: PRIORITY_RANK.get(t.priority, 0)),
+    'title': (Task.title, lambda t: t.title),
+    'rank': (Task.rank, lambda t: t.rank),
+}
+TASK_SORT_COLUMNS = {
+    'created_at': (Task.created_at,),
+    'due_date': (Task.due_date,),
+    'priority': (Task.priority,),
+    'title': (Task.title,),
+    'rank': (Task.rank,),
+}
+
+# Listing field -> (columns it needs, serializer taking (task, project))
+TASK_FIELDS = {
+    'id': ((), lambda t, p: t.id),
+    'title': ((Task.title,), lambda t, p: t.title),
+    'description': ((Task.description,), lambda t, p: t.description),
+    'priority': ((Task.priority,), lambda t, p: t.priority),
+    'status': ((Task.status,), lambda t, p: t.status),
+    'due_date': ((Task.due_date,), lambda t, p: t.due_date.isoformat() if t.due_date else None),
+    'estimated_duration': ((Task.estimated_duration,), lambda t, p: t.estimated_duration),
+    'position': ((Task.position,), lambda t, p: t.position),
+    'rank': ((Task.rank,), lambda t, p: t.rank),
+    'category_id': ((Task.category_id,), lambda t, p: t.category_id),
+    'project_id': ((), lambda t, p: p.id if p else None),
+    'project_name': ((), lambda t, p: p.name if p else None),
+    'created_at': ((Task.created_at,), lambda t, p: t.created_at.isoformat() if t.created_at else None),
+    'is_overdue': ((Task.due_date, Task.status),
+                   lambda t, p: t.due_date < datetime.now() if t.due_date and t.status != 'completed' else False),
+}
+
+
+def _parse_fields(raw_fields):
+    """Return the requested listing fields as a set, or None if any is unknown."""
+    if not raw_fields:
+        return set(TASK_FIELDS)
+    fields = {f.strip() for f in raw_fields.split(',') if f.strip()}
+    if not fields or not fields <= TASK_FIELDS.keys():
+        return None
+    return fields | {'id'}
+
+
 @bp.route('', methods=['POST'])
 @jwt_required()
+@invalidates_user_cache
 def create_task():
     """Create a new task with enhanced validation and error handling."""
     try:
@@ -25,6 +91,7 @@ def create_task():
 
         # Validate project ownership if project_id is provided
         project_id = data.get('project_id')
+        project = None
         if project_id:
             project = Project.query.filter_by(id=project_id, user_id=user_id).first()
             if not project:
@@ -77,8 +144,11 @@ def create_task():
             due_date=due_date,
             estimated_duration=estimated_duration,
             user_id=user_id,
-            project_id=project_id
+            # New tasks go to the end of their column
+            rank=key_between(last_rank(user_id, None), None)
         )
+        if project:
+            task.projects.append(project)
 
         db.session.add(task)
         db.session.commit()
@@ -98,7 +168,7 @@ def create_task():
                     'status': task.status,
                     'due_date': task.due_date.isoformat() if task.due_date else None,
                     'estimated_duration': task.estimated_duration,
-                    'project_id': task.project_id,
+                    'project_id': project.id if project else None,
                     'project_name': project_name,
                     'created_at': task.created_at.isoformat() if hasattr(task, 'created_at') and task.created_at else None
                 }
@@ -116,7 +186,13 @@ def create_task():
 @bp.route('', methods=['GET'])
 @jwt_required()
 def get_tasks():
-    """Get user's tasks with enhanced filtering and sorting options."""
+    """
+    Get user's tasks with filtering, sorting, keyset pagination and field projection.
+
+    Pass `limit` and the `next_cursor` of the previous page as `cursor` to walk
+    the list; `fields=id,title,status` restricts both the response and the
+    columns loaded from the database.
+    """
     try:
         user_id = int(get_jwt_identity())
 
@@ -124,15 +200,27 @@ def get_tasks():
         project_id = request.args.get('project_id', type=int)
         status = request.args.get('status')
         priority = request.args.get('priority')
-        sort_by = request.args.get('sort_by', 'created_at')  # created_at, due_date, priority, title
+        sort_by = request.args.get('sort_by', 'created_at')  # created_at, due_date, priority, title, rank
         sort_order = request.args.get('sort_order', 'desc')  # asc, desc
+        category_id = request.args.get('category_id', type=int)
+        cursor = request.args.get('cursor')
+        limit = parse_limit(request.args.get('limit'))
+
+        if sort_by not in TASK_SORT_KEYS:
+            sort_by = 'created_at'
+        if sort_order not in ('asc', 'desc'):
+            sort_order = 'desc'
+
+        fields = _parse_fields(request.args.get('fields'))
+        if fields is None:
+            return jsonify({'success': False, 'message': 'Unknown field requested'}), 400
 
         # Build query
         query = Task.query.filter_by(user_id=user_id)
 
         # Apply filters
         if project_id:
-            query = query.filter(Task.project_id == project_id)
+            query = query.filter(Task.projects.any(Project.id == project_id))
 
         if status:
             query = query.filter(Task.status == status)
@@ -140,53 +228,64 @@ def get_tasks():
         if priority:
             query = query.filter(Task.priority == priority)
 
-        # Apply sorting
-        if sort_by == 'due_date':
-            order_by = Task.due_date.desc() if sort_order == 'desc' else Task.due_date.asc()
-        elif sort_by == 'priority':
-            # Custom priority ordering: high, medium, low
-            priority_order = {'high': 3, 'medium': 2, 'low': 1}
-            if sort_order == 'desc':
-                order_by = Task.priority.desc()
-            else:
-                order_by = Task.priority.asc()
-        elif sort_by == 'title':
-            order_by = Task.title.desc() if sort_order == 'desc' else Task.title.asc()
-        else:  # default to created_at
-            order_by = Task.created_at.desc() if sort_order == 'desc' else Task.created_at.asc()
+        if category_id:
+            query = query.filter(Task.category_id == category_id)
+
+        # Apply sorting with Task.id as a stable tiebreak
+        sort_expr, sort_value = TASK_SORT_KEYS[sort_by]
+        descending = sort_order == 'desc'
 
-        tasks = query.order_by(order_by).all()
+        if cursor:
+            try:
+                after_value, after_id = decode_cursor(cursor, sort_by, sort_order)
+            except InvalidCursor as e:
+                return jsonify({'success': False, 'message': str(e)}), 400
+            query = query.filter(keyset_filter(sort_expr, Task.id, descending, after_value, after_id))
+
+        # Only load the columns the requested fields need
+        columns = {Task.id}
+        for field in fields:
+            columns.update(TASK_FIELDS[field][0])
+        columns.update(TASK_SORT_COLUMNS[sort_by])
+        query = query.options(load_only(*columns))
+
+        # Fetch one extra row to know whether another page exists
+        tasks = query.order_by(*keyset_order(sort_expr, Task.id, descending)).limit(limit + 1).all()
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+
+        # Resolve every task's project in one query instead of one per row
+        projects_by_task = {}
+        if fields & {'project_id', 'project_name'}:
+            projects_by_task = get_project_loader().load_for_tasks(t.id for t in tasks)
 
         # Format task data with project information
         task_data = []
         for task in tasks:
-            project = Project.query.get(task.project_id) if task.project_id else None
-
-            task_data.append({
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'priority': task.priority,
-                'status': task.status,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'estimated_duration': task.estimated_duration,
-                'project_id': task.project_id,
-                'project_name': project.name if project else None,
-                'created_at': task.created_at.isoformat() if hasattr(task, 'created_at') and task.created_at else None,
-                'is_overdue': task.due_date < datetime.now() if task.due_date and task.status != 'completed' else False
-            })
+            project = projects_by_task.get(task.id)
+            task_data.append({field: TASK_FIELDS[field][1](task, project) for field in fields})
+
+        next_cursor = None
+        if has_more:
+            last = tasks[-1]
+            next_cursor = encode_cursor(sort_by, sort_order, sort_value(last), last.id)
 
         return jsonify({
             'success': True, 
             'data': {
                 'tasks': task_data,
                 'count': len(task_data),
+                'next_cursor': next_cursor,
+                'has_more': has_more,
                 'filters_applied': {
                     'project_id': project_id,
                     'status': status,
                     'priority': priority,
+                    'category_id': category_id,
                     'sort_by': sort_by,
-                    'sort_order': sort_order
+                    'sort_order': sort_order,
+                    'limit': limit,
+                    'fields': sorted(fields)
                 }
             }
         }), 200
@@ -197,6 +296,7 @@ def get_tasks():
 
 @bp.route('/<int:task_id>', methods=['PUT'])
 @jwt_required()
+@invalidates_user_cache
 def update_task(task_id):
     """Update an existing task with enhanced validation."""
     try:
@@ -255,19 +355,23 @@ def update_task(task_id):
             else:
                 task.estimated_duration = None
 
+        loader = get_project_loader()
         if 'project_id' in data:
             if data['project_id']:
                 project = Project.query.filter_by(id=data['project_id'], user_id=user_id).first()
                 if not project:
                     return jsonify({'success': False, 'message': 'Project not found or access denied.'}), 404
-                task.project_id = data['project_id']
+                task.projects = [project]
             else:
-                task.project_id = None
+                project = None
+                task.projects = []
+            # The project is already in hand, so the response needs no extra lookup
+            loader.prime_task(task.id, project)
 
         db.session.commit()
 
         # Get updated task data with project info
-        project = Project.query.get(task.project_id) if task.project_id else None
+        project = loader.load_for_tasks([task.id]).get(task.id)
 
         return jsonify({
             'success': True, 
@@ -281,7 +385,7 @@ def update_task(task_id):
                     'status': task.status,
                     'due_date': task.due_date.isoformat() if task.due_date else None,
                     'estimated_duration': task.estimated_duration,
-                    'project_id': task.project_id,
+                    'project_id': project.id if project else None,
                     'project_name': project.name if project else None,
                     'created_at': task.created_at.isoformat() if hasattr(task, 'created_at') and task.created_at else None
                 }
@@ -295,6 +399,7 @@ def update_task(task_id):
 
 @bp.route('/<int:task_id>', methods=['DELETE'])
 @jwt_required()
+@invalidates_user_cache
 def delete_task(task_id):
     """Delete a task with proper validation."""
     try:
@@ -306,7 +411,7 @@ def delete_task(task_id):
 
         task_title = task.title  # Store for response message
 
-        db.session.delete(task)
+        soft_delete_task(task)
         db.session.commit()
 
         return jsonify({
@@ -319,10 +424,125 @@ def delete_task(task_id):
         logging.error(f"Task deletion failed for user {user_id}, task {task_id}. Error: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
 
+@bp.route('/<int:task_id>/move', methods=['POST'])
+@jwt_required()
+@invalidates_user_cache
+def move_task(task_id):
+    """
+    Move a task between two neighbours of a board column.
+
+    Only the moved task's rank (and category, when it changes column) is
+    written. `before_id` is the task that should end up directly above it and
+    `after_id` the one directly below; either may be omitted.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+
+        if not task:
+            return jsonify({'success': False, 'message': 'Task not found or access denied.'}), 404
+
+        data = request.get_json() or {}
+        before_id = data.get('before_id')
+        after_id = data.get('after_id')
+        category_id = data.get('category_id', task.category_id)
+
+        if category_id and not Category.query.filter_by(id=category_id, user_id=user_id).first():
+            return jsonify({'success': False, 'message': 'Category not found or access denied.'}), 404
+        if task_id in (before_id, after_id):
+            return jsonify({'success': False, 'message': 'A task cannot be its own neighbour'}), 400
+
+        column = ranking.column_query(user_id, category_id).filter(Task.id != task_id)
+
+        def neighbour_ranks():
+            neighbours = {}
+            wanted = [i for i in (before_id, after_id) if i]
+            if wanted:
+                neighbours = dict(column.filter(Task.id.in_(wanted)).with_entities(Task.id, Task.rank).all())
+            if any(i not in neighbours for i in wanted):
+                return None
+
+            before = neighbours.get(before_id)
+            after = neighbours.get(after_id)
+            # With a single neighbour, the other side is its direct successor/predecessor
+            if before_id and not after_id:
+                row = column.filter(Task.rank > before).with_entities(Task.rank).order_by(Task.rank.asc()).first() \
+                    if before is not None else None
+                after = row[0] if row else None
+            elif after_id and not before_id:
+                row = column.filter(Task.rank < after).with_entities(Task.rank).order_by(Task.rank.desc()).first() \
+                    if after is not None else None
+                before = row[0] if row else None
+            elif not before_id and not after_id:
+                row = column.filter(Task.rank.isnot(None)).with_entities(Task.rank).order_by(Task.rank.asc()).first()
+                after = row[0] if row else None
+            return before, after, [n for n in (before_id, after_id) if n and neighbours.get(n) is None]
+
+        ranks = neighbour_ranks()
+        if ranks is None:
+            return jsonify({'success': False, 'message': 'Neighbour task not found in this column'}), 404
+
+        before, after, unranked = ranks
+        if unranked:
+            # Columns created before ranks existed get keys on their first move
+            ranking.rebalance_column(user_id, category_id)
+            before, after, _ = neighbour_ranks()
+
+        try:
+            new_rank = key_between(before, after)
+            if len(new_rank) > ranking.MAX_LENGTH:
+                ranking.rebalance_column(user_id, category_id)
+                before, after, _ = neighbour_ranks()
+                new_rank = key_between(before, after)
+        except ValueError:
+            return jsonify({'success': False, 'message': 'before_id must come before after_id'}), 400
+
+        task.rank = new_rank
+        task.category_id = category_id
+        db.session.commit()
+
+        if len(new_rank) > ranking.REBALANCE_LENGTH:
+            ranking.rebalance_in_background(user_id, category_id)
+
+        return jsonify({
+            'success': True,
+            'message': 'Task moved successfully',
+            'data': {'task': {'id': task_id, 'rank': new_rank, 'category_id': category_id}}
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Task move failed for user {user_id}, task {task_id}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
+
+
+def _bulk_update_by_id(mappings):
+    """
+    Write a list of {'id': ..., column: value} dicts as executemany UPDATEs,
+    one per distinct set of columns, instead of one statement per row.
+    """
+    groups = defaultdict(list)
+    for mapping in mappings:
+        groups[tuple(sorted(key for key in mapping if key != 'id'))].append(mapping)
+
+    table = Task.__table__
+    for columns, rows in groups.items():
+        stmt = table.update().where(table.c.id == bindparam('b_id')).values(
+            {column: bindparam(f'b_{column}') for column in columns})
+        db.session.execute(stmt, [{f'b_{key}': value for key, value in row.items()} for row in rows])
+
+
 @bp.route('/bulk', methods=['PUT'])
 @jwt_required()
+@invalidates_user_cache
 def bulk_update_tasks():
-    """Bulk update multiple tasks (useful for drag-and-drop reordering or mass status changes)."""
+    """
+    Bulk update multiple tasks (useful for drag-and-drop reordering or mass status changes).
+
+    All target tasks and referenced projects are fetched with one IN query
+    each, and the changes are written with a single bulk UPDATE, so the number
+    of statements does not grow with the number of entries.
+    """
     try:
         user_id = int(get_jwt_identity())
         data = request.get_json()
@@ -331,40 +551,92 @@ def bulk_update_tasks():
             return jsonify({'success': False, 'message': 'Tasks data required'}), 400
 
         task_updates = data['tasks']
-        updated_count = 0
+        if not isinstance(task_updates, list):
+            return jsonify({'success': False, 'message': 'Tasks must be a list'}), 400
+
+        task_ids = {u.get('id') for u in task_updates if isinstance(u, dict) and u.get('id')}
+        project_ids = {u.get('project_id') for u in task_updates if isinstance(u, dict) and u.get('project_id')}
+
+        # Two round trips total: one for the tasks, one for the projects
+        tasks = {}
+        if task_ids:
+            tasks = {t.id: t for t in Task.query.options(
+                load_only(Task.id, Task.user_id, Task.status, Task.category_id)
+            ).filter(Task.id.in_(task_ids), Task.user_id == user_id)}
+        projects = {}
+        if project_ids:
+            projects = {p.id: p for p in Project.query.options(load_only(Project.id)).filter(
+                Project.id.in_(project_ids), Project.user_id == user_id)}
+
+        now = datetime.utcnow()
+        mappings = {}
+        project_links = {}
+        counter_deltas = TaskCounterDeltas()
+        results = []
 
         for task_update in task_updates:
-            task_id = task_update.get('id')
+            task_id = task_update.get('id') if isinstance(task_update, dict) else None
             if not task_id:
+                results.append({'id': None, 'success': False, 'message': 'Task id is required'})
                 continue
 
-            task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+            task = tasks.get(task_id)
             if not task:
+                results.append({'id': task_id, 'success': False, 'message': 'Task not found or access denied'})
+                continue
+
+            if task_update.get('project_id') and task_update['project_id'] not in projects:
+                results.append({'id': task_id, 'success': False, 'message': 'Project not found or access denied'})
                 continue
 
+            changes = {}
+            if 'position' in task_update:
+                try:
+                    changes['position'] = int(task_update['position'])
+                except (ValueError, TypeError):
+                    results.append({'id': task_id, 'success': False, 'message': 'Invalid position'})
+                    continue
+
             # Apply allowed updates
             if 'status' in task_update and task_update['status'] in ['todo', 'in-progress', 'completed']:
-                task.status = task_update['status']
+                changes['status'] = task_update['status']
+                if task_update['status'] == 'completed':
+                    changes['completed_at'] = now
 
             if 'priority' in task_update and task_update['priority'] in ['low', 'medium', 'high']:
-                task.priority = task_update['priority']
+                changes['priority'] = task_update['priority']
 
             if 'project_id' in task_update:
-                if task_update['project_id']:
-                    project = Project.query.filter_by(id=task_update['project_id'], user_id=user_id).first()
-                    if project:
-                        task.project_id = task_update['project_id']
-                else:
-                    task.project_id = None
+                project_links[task_id] = task_update['project_id'] or None
+
+            if 'status' in changes:
+                previous = mappings.get(task_id, {}).get('status', task.status)
+                counter_deltas.change(user_id, task.category_id, previous, task.category_id, changes['status'])
 
-            updated_count += 1
+            if changes:
+                mappings.setdefault(task_id, {'id': task_id}).update(changes, updated_at=now)
+            results.append({'id': task_id, 'success': True})
 
+        if mappings:
+            _bulk_update_by_id(list(mappings.values()))
+
+        if project_links:
+            link_table = project_task_association
+            db.session.execute(link_table.delete().where(link_table.c.task_id.in_(project_links)))
+            new_links = [{'task_id': tid, 'project_id': pid} for tid, pid in project_links.items() if pid]
+            if new_links:
+                db.session.execute(link_table.insert(), new_links)
+
+        # Bulk statements skip the flush listener, so adjust the counters here
+        counter_deltas.apply(db.session.connection())
         db.session.commit()
 
+        updated_count = sum(1 for r in results if r['success'])
         return jsonify({
             'success': True,
             'message': f'Successfully updated {updated_count} tasks',
-            'updated_count': updated_count
+            'updated_count': updated_count,
+            'results': results
         }), 200
 
     except Exception as e:
@@ -372,35 +644,47 @@ def bulk_update_tasks():
         logging.error(f"Bulk task update failed for user {user_id}. Error: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
 
-@bp.route('/stats', methods=['GET'])
+@bp.route('/tree', methods=['GET'])
 @jwt_required()
-def get_task_stats():
-    """Get comprehensive task statistics for the user."""
+def get_task_tree():
+    """
+    Get tasks as a nested subtask tree, loaded with a single recursive query.
+    `root_id` limits the tree to one task; `max_depth` limits how deep it goes.
+    """
     try:
         user_id = int(get_jwt_identity())
+        root_id = request.args.get('root_id', type=int)
+        max_depth = request.args.get('max_depth', DEFAULT_MAX_DEPTH, type=int)
 
-        tasks = Task.query.filter_by(user_id=user_id).all()
+        roots = load_task_tree(user_id, root_ids=[root_id] if root_id else None, max_depth=max_depth)
+        if root_id and not roots:
+            return jsonify({'success': False, 'message': 'Task not found or access denied.'}), 404
 
-        # Calculate various statistics
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == 'completed'])
-        in_progress_tasks = len([t for t in tasks if t.status == 'in-progress'])
-        todo_tasks = total_tasks - completed_tasks - in_progress_tasks
+        max_depth = max(0, min(max_depth, MAX_DEPTH_LIMIT))
+        return jsonify({
+            'success': True,
+            'data': {
+                'tasks': [root.to_dict(max_depth) for root in roots],
+                'max_depth': max_depth
+            }
+        }), 200
 
-        # Priority breakdown
-        high_priority = len([t for t in tasks if t.priority == 'high'])
-        medium_priority = len([t for t in tasks if t.priority == 'medium'])
-        low_priority = len([t for t in tasks if t.priority == 'low'])
+    except Exception as e:
+        logging.error(f"Failed to get task tree for user {user_id}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
 
-        # Overdue tasks
-        overdue_tasks = len([t for t in tasks if t.due_date and t.due_date < datetime.now() and t.status != 'completed'])
 
-        # Due today and this week
-        today = datetime.now().date()
-        week_from_now = today + timedelta(days=7)
+@bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_task_stats():
+    """Get comprehensive task statistics for the user."""
+    try:
+        user_id = int(get_jwt_identity())
 
-        due_today = len([t for t in tasks if t.due_date and t.due_date.date() == today])
-        due_this_week = len([t for t in tasks if t.due_date and today <= t.due_date.date() <= week_from_now])
+        # All counters come from one aggregate query
+        counts = compute_task_stats(user_id)
+        total_tasks = counts['total']
+        completed_tasks = counts['completed']
 
         # Completion rate
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
@@ -408,14 +692,15 @@ def get_task_stats():
         stats = {
             'total_tasks': total_tasks,
             'completed_tasks': completed_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'todo_tasks': todo_tasks,
-            'high_priority': high_priority,
-            'medium_priority': medium_priority,
-            'low_priority': low_priority,
-            'overdue_tasks': overdue_tasks,
-            'due_today': due_today,
-            'due_this_week': due_this_week,
+            'in_progress_tasks': counts['in_progress'],
+            'todo_tasks': counts['todo'],
+            'cancelled_tasks': counts['cancelled'],
+            'high_priority': counts['high_priority'],
+            'medium_priority': counts['medium_priority'],
+            'low_priority': counts['low_priority'],
+            'overdue_tasks': counts['overdue'],
+            'due_today': counts['due_today'],
+            'due_this_week': counts['due_this_week'],
             'completion_rate': round(completion_rate, 1)
         }
 
@@ -424,3 +709,29 @@ def get_task_stats():
     except Exception as e:
         logging.error(f"Failed to get task stats for user {user_id}. Error: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
+
+
+@bp.route('/estimation-accuracy', methods=['GET'])
+@jwt_required()
+def get_estimation_accuracy():
+    """
+    How estimated durations compare with tracked focus time: the
+    distribution of estimate/actual ratios over ?days= (default all time),
+    optionally for one ?status=.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        try:
+            days, status = parse_estimation_args(request.args)
+        except ValueError as ve:
+            return jsonify({'success': False, 'message': f'Invalid estimation request: {ve}'}), 400
+
+        def build():
+            return {'success': True, 'data': compute_estimation_accuracy(user_id, days, status)}, 200
+
+        return cached_json_response(f'tasks:estimation:{days}:{status}', user_id, build)
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Failed to compute estimation accuracy for user {get_jwt_identity()}. Error: {e}", exc_info=True)
+        return jsonify({'success': False, 'message': 'An internal server error occurred.'}), 500
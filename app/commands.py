@@ -0,0 +1,119 @@
+# app/commands.py
+import click
+from datetime import timedelta
+from flask import current_app
+from flask.cli import AppGroup
+from .extensions import db
+from .services.counters import rebuild_task_counters
+from .services.focus_sessions import reap_orphaned_sessions
+from .services.query_plans import PLAN_ROWS, check_query_plans
+from .services.ranking import rebalance_column
+from .services.tombstones import purge_tombstones
+
+counters_cli = AppGroup('counters', help='Maintain the materialized task counters.')
+indexes_cli = AppGroup('indexes', help='Inspect how the API queries use indexes.')
+ranks_cli = AppGroup('ranks', help='Maintain task ordering keys.')
+jobs_cli = AppGroup('jobs', help='Run background jobs.')
+purge_cli = AppGroup('purge', help='Remove soft-deleted rows.')
+timers_cli = AppGroup('timers', help='Maintain running focus-session timers.')
+
+
+@counters_cli.command('reconcile')
+@click.option('--dry-run', is_flag=True, help='Only report drift, do not fix it.')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help='Limit to these users.')
+def reconcile_counters(dry_run, user_ids):
+    """Rebuild task counters from the tasks table and report any drift."""
+    report = rebuild_task_counters(user_ids=user_ids or None, dry_run=dry_run)
+
+    for scope, label in (('users', 'user'), ('categories', 'category')):
+        for row in report[scope]:
+            click.echo(f"{label} {row['id']}: stored={row['stored']} actual={row['actual']}")
+
+    drifted = len(report['users']) + len(report['categories'])
+    action = 'found' if dry_run else 'fixed'
+    click.echo(f"{drifted} drifted counter row(s) {action}.")
+
+
+@indexes_cli.command('explain')
+@click.option('--database-url', default='sqlite://',
+              help='Empty scratch database to seed and explain against (default: in-memory SQLite).')
+@click.option('--rows', type=int, default=PLAN_ROWS, help='Tasks, notes and focus sessions seeded per user.')
+@click.option('--verbose', is_flag=True, help='Print the SQL and plan of every statement.')
+def explain_indexes(database_url, rows, verbose):
+    """
+    Seed a scratch database, call each endpoint, EXPLAIN the SQL it sent and
+    fail if any statement reads a whole table. The tables are dropped
+    afterwards, so never point this at a database holding real data.
+    """
+    from . import create_app  # app/__init__.py imports this module
+    app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': database_url})
+    try:
+        results = check_query_plans(app, rows=rows)
+    finally:
+        with app.app_context():
+            db.drop_all()
+
+    failures = 0
+    for name, statement, full_scans, plan in results:
+        click.echo(f"[{'FULL SCAN of ' + ', '.join(full_scans) if full_scans else 'ok'}] {name}")
+        if verbose or full_scans:
+            click.echo('    ' + statement.replace('\n', '\n    '))
+            click.echo('    ' + plan.replace('\n', '\n    '))
+        failures += bool(full_scans)
+
+    if failures:
+        raise click.ClickException(f"{failures} statement(s) read a whole table.")
+
+
+@ranks_cli.command('rebalance')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help='Limit to these users.')
+def rebalance_ranks(user_ids):
+    """Rewrite task ranks with evenly spaced keys, column by column."""
+    from .models.task import Task
+
+    columns = Task.query.with_entities(Task.user_id, Task.category_id).distinct()
+    if user_ids:
+        columns = columns.filter(Task.user_id.in_(user_ids))
+
+    total = 0
+    for user_id, category_id in columns.all():
+        total += rebalance_column(user_id, category_id)
+    click.echo(f"Rebalanced {total} task(s).")
+
+
+@jobs_cli.command('work')
+@click.option('--once', is_flag=True, help='Wait for at most one job, then exit.')
+def work_jobs(once):
+    """Run jobs from the Redis queue (JOB_QUEUE_BACKEND=redis)."""
+    from .extensions import jobs
+
+    if jobs.redis is None:
+        raise click.ClickException('Set JOB_QUEUE_BACKEND=redis and REDIS_URL to use a separate worker.')
+    click.echo('Waiting for jobs...')
+    jobs.work(once=once)
+
+
+@purge_cli.command('run')
+@click.option('--older-than-hours', type=float, help='Only purge rows deleted at least this long ago.')
+@click.option('--batch-size', type=int, help='Rows deleted per transaction.')
+@click.option('--sleep', type=float, help='Seconds to pause between batches.')
+@click.option('--max-batches', type=int, help='Stop after this many batches.')
+def purge_deleted(older_than_hours, batch_size, sleep, max_batches):
+    """Physically delete soft-deleted tasks, notes and projects in batches (run off-peak)."""
+    config = current_app.config
+    report = purge_tombstones(
+        older_than=timedelta(hours=older_than_hours if older_than_hours is not None
+                             else config.get('PURGE_AFTER_HOURS', 24)),
+        batch_size=batch_size or config.get('PURGE_BATCH_SIZE', 500),
+        sleep=sleep if sleep is not None else config.get('PURGE_SLEEP', 0.5),
+        max_batches=max_batches
+    )
+    removed = ', '.join(f"{count} {name}" for name, count in report['removed'].items())
+    click.echo(f"Purged {removed} in {report['batches']} batch(es).")
+
+
+@timers_cli.command('reap')
+def reap_timers():
+    """Close focus sessions whose timer has not sent a heartbeat within FOCUS_TIMER_TIMEOUT."""
+    closed = reap_orphaned_sessions(force=True)
+    click.echo(f"Closed {closed} orphaned focus session(s).")
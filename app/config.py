@@ -35,6 +35,42 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 
+    # Response cache (falls back to an in-process LRU without Redis)
+    REDIS_URL = os.environ.get('REDIS_URL')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_LRU_SIZE = int(os.environ.get('RESPONSE_CACHE_LRU_SIZE', 1024))
+
+    # LLM client: 'gemini' or 'fake' (deterministic, offline)
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini')
+    LLM_MODEL = os.environ.get('LLM_MODEL', 'gemini-1.5-flash')
+    GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
+
+    # Background jobs: 'thread' (in-process) or 'redis' (run by `flask jobs work`)
+    JOB_QUEUE_BACKEND = os.environ.get('JOB_QUEUE_BACKEND', 'thread')
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_TTL = int(os.environ.get('JOB_TTL', 86400))
+
+    # Cache of parsed AI plans, keyed on the normalized goal (Redis when REDIS_URL is set)
+    PLAN_CACHE_TTL = int(os.environ.get('PLAN_CACHE_TTL', 7 * 86400))
+    PLAN_CACHE_LRU_SIZE = int(os.environ.get('PLAN_CACHE_LRU_SIZE', 512))
+
+    # Per-user project names for the chat agent, dropped on project create/rename/delete
+    PROJECT_INDEX_TTL = int(os.environ.get('PROJECT_INDEX_TTL', 300))
+    PROJECT_INDEX_LRU_SIZE = int(os.environ.get('PROJECT_INDEX_LRU_SIZE', 1024))
+
+    # Worker processes serving the app (gunicorn reads the same variable for --workers).
+    # More than one requires REDIS_URL, since focus timers must be shared between them
+    WEB_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+    # Focus timers without a heartbeat for this many seconds are closed as abandoned
+    FOCUS_TIMER_TIMEOUT = int(os.environ.get('FOCUS_TIMER_TIMEOUT', 300))
+    FOCUS_TIMER_REAP_INTERVAL = int(os.environ.get('FOCUS_TIMER_REAP_INTERVAL', 60))
+
+    # `flask purge run`: physically delete rows soft-deleted this long ago, in batches
+    PURGE_AFTER_HOURS = float(os.environ.get('PURGE_AFTER_HOURS', 24))
+    PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', 500))
+    PURGE_SLEEP = float(os.environ.get('PURGE_SLEEP', 0.5))
+
     # OAuth Credentials
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
@@ -57,8 +93,20 @@ class ProductionConfig(Config):
     DEBUG = False
 
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    RATELIMIT_ENABLED = False
+    REDIS_URL = None
+    WEB_WORKERS = 1
+    LLM_BACKEND = 'fake'
+    JWT_SECRET_KEY = 'test-jwt-secret-key-of-at-least-32-bytes'
+
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
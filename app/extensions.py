@@ -6,12 +6,22 @@ from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from authlib.integrations.flask_client import OAuth
+from .services.cache import ResponseCache
+from .services.jobs import JobQueue
+from .services.plan_cache import PlanCache
+from .services.project_index import ProjectIndexStore
+from .services.focus_timers import FocusTimerRegistry
 
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 oauth = OAuth()
+cache = ResponseCache()
+jobs = JobQueue()
+plan_cache = PlanCache()
+project_index = ProjectIndexStore()
+focus_timers = FocusTimerRegistry()
 
 
 # Enhanced CORS configuration
@@ -3,5 +3,7 @@ from .task import Task
 from .category import Category
 from .focus_session import FocusSession
 from .project import Project
+from .task_counter import UserTaskCounter, CategoryTaskCounter
+from .task_time import TaskTimeRollup
 
-__all__ = ['User', 'Task', 'Category', 'FocusSession', 'Project']
+__all__ = ['User', 'Task', 'Category', 'FocusSession', 'Project', 'UserTaskCounter', 'CategoryTaskCounter', 'TaskTimeRollup']
@@ -23,13 +23,20 @@ class Category(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     tasks = db.relationship('Task', backref='category', lazy='dynamic')
 
+    def _counter(self):
+        """Materialized counters row for this category (None if it has no tasks)"""
+        from .task_counter import CategoryTaskCounter
+        return db.session.get(CategoryTaskCounter, self.id)
+
     def get_task_count(self):
         """Get number of tasks in this category"""
-        return self.tasks.count()
+        counter = self._counter()
+        return counter.total if counter else 0
 
     def get_completed_task_count(self):
         """Get number of completed tasks in this category"""
-        return self.tasks.filter_by(status='completed').count()
+        counter = self._counter()
+        return counter.completed if counter else 0
 
     def get_completion_rate(self):
         """Get completion rate for this category"""
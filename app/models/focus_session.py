@@ -4,6 +4,13 @@ from ..extensions import db
 
 class FocusSession(db.Model):
     __tablename__ = 'focus_sessions'
+    __table_args__ = (
+        db.Index('ix_focus_sessions_user_id_started_at', 'user_id', 'started_at'),
+        db.Index('ix_focus_sessions_task_id', 'task_id'),
+        # Open sessions only, for the reaper (app/services/focus_sessions.py)
+        db.Index('ix_focus_sessions_open', 'started_at', postgresql_where=db.text('ended_at IS NULL'),
+                 sqlite_where=db.text('ended_at IS NULL')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -22,7 +29,7 @@ class FocusSession(db.Model):
 
     # Relationships
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'))
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='CASCADE'))
 
     def to_dict(self):
         """Convert focus session to dictionary"""
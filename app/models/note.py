@@ -1,14 +1,26 @@
 from datetime import datetime
 from ..extensions import db
+from .soft_delete import SoftDeleteMixin, live_index, tombstone_index
 
 
-class Note(db.Model):
+class Note(SoftDeleteMixin, db.Model):
     __tablename__ = 'notes'
+    __table_args__ = (
+        live_index('ix_notes_user_id_updated_at', 'user_id', 'updated_at'),
+        # Full index: deletes from projects cascade through it
+        db.Index('ix_notes_project_id', 'project_id'),
+        tombstone_index('ix_notes_deleted_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200))
     content = db.Column(db.Text, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     project_id = db.Column(db.Integer, db.ForeignKey(
-        'projects.id'), nullable=False)
+        'projects.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # On PostgreSQL the table also has a generated `search_vector` tsvector
+    # column (see migration 9f4b7a2d61e3). It is left unmapped so the model
+    # still works on SQLite; app/services/note_search.py queries it directly.
@@ -1,18 +1,25 @@
 from datetime import datetime
 from ..extensions import db
+from .soft_delete import SoftDeleteMixin, live_index, tombstone_index
 
 # Association Table for the many-to-many relationship between Project and Task
 project_task_association = db.Table(
     'project_task_association',
     db.Column('project_id', db.Integer, db.ForeignKey(
-        'projects.id'), primary_key=True),
+        'projects.id', ondelete='CASCADE'), primary_key=True),
     db.Column('task_id', db.Integer, db.ForeignKey(
-        'tasks.id'), primary_key=True)
+        'tasks.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key covers project -> tasks; this covers task -> projects
+    db.Index('ix_project_task_association_task_id', 'task_id')
 )
 
 
-class Project(db.Model):
+class Project(SoftDeleteMixin, db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        live_index('ix_projects_user_id_status_created_at', 'user_id', 'status', 'created_at'),
+        tombstone_index('ix_projects_deleted_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
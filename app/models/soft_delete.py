@@ -0,0 +1,48 @@
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session, with_loader_criteria
+from ..extensions import db
+
+# Predicate of the partial indexes that cover only live rows
+LIVE_ROWS = 'deleted_at IS NULL'
+
+
+def live_index(name, *columns, **kwargs):
+    """An index over live rows only; queries get the matching predicate automatically."""
+    return db.Index(name, *columns, postgresql_where=db.text(LIVE_ROWS),
+                    sqlite_where=db.text(LIVE_ROWS), **kwargs)
+
+
+def tombstone_index(name):
+    """A small index over deleted rows, for the purger to find them."""
+    return db.Index(name, 'deleted_at', postgresql_where=db.text('deleted_at IS NOT NULL'),
+                    sqlite_where=db.text('deleted_at IS NOT NULL'))
+
+
+class SoftDeleteMixin:
+    """
+    Deleting a row sets `deleted_at`; the row stays until `flask purge run`
+    removes it. ORM queries never see deleted rows unless executed with
+    execution_options(include_deleted=True).
+    """
+
+    deleted_at = db.Column(db.DateTime)
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    def soft_delete(self, when=None):
+        self.deleted_at = when or datetime.utcnow()
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _hide_deleted_rows(execute_state):
+    """Add `deleted_at IS NULL` for every soft-deletable entity in an ORM SELECT."""
+    if (execute_state.is_select
+            and not execute_state.is_column_load
+            and not execute_state.is_relationship_load
+            and not execute_state.execution_options.get('include_deleted', False)):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
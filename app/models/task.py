@@ -1,10 +1,19 @@
 from datetime import datetime
 from ..extensions import db
+from .soft_delete import SoftDeleteMixin, live_index, tombstone_index
 from sqlalchemy import event
 
 
-class Task(db.Model):
+class Task(SoftDeleteMixin, db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        live_index('ix_tasks_user_id_status', 'user_id', 'status'),
+        live_index('ix_tasks_user_id_due_date', 'user_id', 'due_date'),
+        live_index('ix_tasks_user_id_created_at', 'user_id', 'created_at'),
+        live_index('ix_tasks_user_id_category_id_rank', 'user_id', 'category_id', 'rank'),
+        db.Index('ix_tasks_parent_task_id', 'parent_task_id'),
+        tombstone_index('ix_tasks_deleted_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -26,12 +35,13 @@ class Task(db.Model):
 
     # Task organization
     position = db.Column(db.Integer, default=0)
-    tags = db.Column(db.Text)  # JSON string of tags
+    rank = db.Column(db.String(255))  # Fractional ordering key, see app/services/ranking.py
+    tags = db.Column(db.Text)  # JSON string of tags; AI plan tasks keep their group and resources here
 
     # Relationships
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
-    parent_task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'))
+    parent_task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='SET NULL'))
 
     # Self-referential relationship for subtasks
     subtasks = db.relationship('Task', backref=db.backref('parent_task', remote_side=[id]))
@@ -61,8 +71,11 @@ class Task(db.Model):
         completed_subtasks = sum(1 for subtask in self.subtasks if subtask.is_completed)
         return (completed_subtasks / len(self.subtasks)) * 100
 
-    def to_dict(self, include_subtasks=False):
-        """Convert task to dictionary"""
+    def to_dict(self, include_subtasks=False, progress=None):
+        """
+        Convert task to dictionary. Pass a precomputed `progress` (see
+        app/services/task_tree.py) to avoid loading the subtasks relationship.
+        """
         data = {
             'id': self.id,
             'title': self.title,
@@ -76,16 +89,24 @@ class Task(db.Model):
             'estimated_duration': self.estimated_duration,
             'actual_duration': self.actual_duration,
             'position': self.position,
+            'rank': self.rank,
             'tags': self.tags,
             'user_id': self.user_id,
             'category_id': self.category_id,
             'parent_task_id': self.parent_task_id,
             'is_overdue': self.is_overdue,
-            'progress_percentage': self.get_progress_percentage()
+            'progress_percentage': progress if progress is not None else self.get_progress_percentage()
         }
 
         if include_subtasks:
-            data['subtasks'] = [subtask.to_dict() for subtask in self.subtasks]
+            # Load the whole subtree with one recursive query instead of per-node lazy loads
+            from ..services.task_tree import load_task_tree
+            roots = load_task_tree(self.user_id, root_ids=[self.id])
+            if roots:
+                data['subtasks'] = roots[0].to_dict()['subtasks']
+                data['progress_percentage'] = roots[0].progress
+            else:
+                data['subtasks'] = []
 
         return data
 
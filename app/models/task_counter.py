@@ -0,0 +1,172 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from ..extensions import db
+from .task import Task
+from .user import User
+from .category import Category
+
+# Statuses counted as "pending" (both spellings are in use across the app)
+PENDING_STATUSES = ('todo', 'in_progress', 'in-progress')
+# Closed without being done: counted in `total`, but neither completed nor pending
+CANCELLED_STATUSES = ('cancelled',)
+
+
+class UserTaskCounter(db.Model):
+    """Per-user task counters, kept up to date on every flush that touches a Task."""
+    __tablename__ = 'user_task_counters'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_stats(self):
+        """Return the counters in the shape of User.get_task_stats()"""
+        return {
+            'total': self.total,
+            'completed': self.completed,
+            'pending': self.pending,
+            'completion_rate': (self.completed / self.total * 100) if self.total > 0 else 0
+        }
+
+    def __repr__(self):
+        return f'<UserTaskCounter user={self.user_id} total={self.total}>'
+
+
+class CategoryTaskCounter(db.Model):
+    """Per-category task counters, maintained alongside UserTaskCounter."""
+    __tablename__ = 'category_task_counters'
+
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CategoryTaskCounter category={self.category_id} total={self.total}>'
+
+
+def _status_deltas(status, sign):
+    # CANCELLED_STATUSES only move `total`
+    return {
+        'total': sign,
+        'completed': sign if status == 'completed' else 0,
+        'pending': sign if status in PENDING_STATUSES else 0,
+    }
+
+
+def _old_value(state, key):
+    """Value of an attribute as it was before the pending change."""
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.obj(), key)
+
+
+def upsert_counter(connection, table, key, deltas):
+    """
+    Add `deltas` to one counter row, creating it if it does not exist yet.
+    `key` maps the primary-key column(s) to the row's values.
+    """
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    dialect = connection.dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values({**key, 'updated_at': now, **deltas})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={**{name: table.c[name] + stmt.excluded[name] for name in deltas}, 'updated_at': now}
+        )
+        connection.execute(stmt)
+        return
+
+    result = connection.execute(
+        table.update().where(*(table.c[column] == value for column, value in key.items())).values(
+            {**{name: table.c[name] + value for name, value in deltas.items()}, 'updated_at': now})
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values({**key, 'updated_at': now, **deltas}))
+
+
+class TaskCounterDeltas:
+    """Accumulates counter changes so each user/category row is written once."""
+
+    def __init__(self):
+        self.users = defaultdict(lambda: defaultdict(int))
+        self.categories = defaultdict(lambda: defaultdict(int))
+
+    def add(self, user_id, category_id, status, sign):
+        for name, value in _status_deltas(status, sign).items():
+            self.users[user_id][name] += value
+            if category_id and name != 'pending':
+                self.categories[category_id][name] += value
+
+    def change(self, user_id, old_category_id, old_status, new_category_id, new_status):
+        """Record a task moving from one status/category to another."""
+        self.add(user_id, old_category_id, old_status, -1)
+        self.add(user_id, new_category_id, new_status, 1)
+
+    def apply(self, connection, skip_users=(), skip_categories=()):
+        for user_id, deltas in self.users.items():
+            if user_id is not None and user_id not in skip_users:
+                upsert_counter(connection, UserTaskCounter.__table__, {'user_id': user_id}, deltas)
+        for category_id, deltas in self.categories.items():
+            if category_id not in skip_categories:
+                upsert_counter(connection, CategoryTaskCounter.__table__, {'category_id': category_id}, deltas)
+
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_task_counters(session, flush_context):
+    """
+    Fold every Task insert, delete, soft delete and status/category change of
+    this flush into one counter update per affected user and category.
+    Soft-deleted tasks are not counted.
+    Bulk statements bypass the unit of work and apply TaskCounterDeltas themselves.
+    """
+    deltas = TaskCounterDeltas()
+
+    for obj in session.new:
+        if isinstance(obj, Task) and obj.deleted_at is None:
+            deltas.add(obj.user_id, obj.category_id, obj.status, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            state = inspect(obj)
+            if _old_value(state, 'deleted_at') is None:
+                deltas.add(_old_value(state, 'user_id'), _old_value(state, 'category_id'),
+                           _old_value(state, 'status'), -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Task) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[key].history.has_changes()
+                   for key in ('status', 'category_id', 'user_id', 'deleted_at')):
+            continue
+        if _old_value(state, 'deleted_at') is None:
+            deltas.add(_old_value(state, 'user_id'), _old_value(state, 'category_id'),
+                       _old_value(state, 'status'), -1)
+        if obj.deleted_at is None:
+            deltas.add(obj.user_id, obj.category_id, obj.status, 1)
+
+    if not deltas.users and not deltas.categories:
+        return
+
+    # Rows of users/categories deleted in this flush are removed by ON DELETE CASCADE
+    deltas.apply(
+        session.connection(),
+        skip_users={obj.id for obj in session.deleted if isinstance(obj, User)},
+        skip_categories={obj.id for obj in session.deleted if isinstance(obj, Category)}
+    )
@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import func, update
+from ..extensions import db
+from .task import Task
+from .task_counter import upsert_counter
+
+
+class TaskTimeRollup(db.Model):
+    """
+    Focus minutes per task and UTC day, fed as each session ends. Reports
+    over actual time read these rows instead of the raw focus sessions.
+    """
+    __tablename__ = 'task_time_rollups'
+
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    minutes = db.Column(db.Integer, nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<TaskTimeRollup task={self.task_id} day={self.day} minutes={self.minutes}>'
+
+
+def record_task_time(session, task_id, day, minutes):
+    """
+    Credit `minutes` of focus on `day` to a task: one upsert of its rollup
+    row and one increment of Task.actual_duration. The caller commits.
+    """
+    upsert_counter(session.connection(), TaskTimeRollup.__table__,
+                   {'task_id': task_id, 'day': day}, {'minutes': minutes, 'sessions': 1})
+    session.execute(
+        update(Task).where(Task.id == task_id)
+        .values(actual_duration=func.coalesce(Task.actual_duration, 0) + minutes)
+    )
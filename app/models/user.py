@@ -94,19 +94,14 @@ class User(db.Model):
         return self.username
 
     def get_task_stats(self):
-        """Calculates and returns key statistics about the user's tasks."""
-        total_tasks = self.tasks.count()
-        completed_tasks = self.tasks.filter_by(status='completed').count()
-        pending_tasks = self.tasks.filter(
-            db.text("status IN ('todo', 'in_progress')")).count()
-
-        return {
-            'total': total_tasks,
-            'completed': completed_tasks,
-            'pending': pending_tasks,
-            # FIXED: Replaced &gt; with >
-            'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        }
+        """Returns key task statistics from the materialized counters row."""
+        from .task_counter import UserTaskCounter
+
+        counter = db.session.get(UserTaskCounter, self.id)
+        if counter is None:
+            # No row yet means the user has never had a task
+            return {'total': 0, 'completed': 0, 'pending': 0, 'completion_rate': 0}
+        return counter.to_stats()
 
     def to_dict(self, include_sensitive=False):
         data = {
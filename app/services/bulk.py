@@ -0,0 +1,19 @@
+from sqlalchemy import insert
+from ..extensions import db
+from ..models.task import Task
+
+
+def insert_tasks(task_rows):
+    """
+    Insert task rows with one multi-row INSERT ... RETURNING and return their
+    ids in input order. Each row needs a rank that is unique in the batch:
+    ids are matched back by rank, because asking the database to keep
+    parameter order (sort_by_parameter_order) makes SQLite insert one row
+    per statement.
+    """
+    if not task_rows:
+        return []
+    table = Task.__table__
+    returned = db.session.execute(insert(table).returning(table.c.id, table.c.rank), task_rows)
+    id_by_rank = {rank: task_id for task_id, rank in returned}
+    return [id_by_rank[row['rank']] for row in task_rows]
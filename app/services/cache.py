@@ -0,0 +1,229 @@
+# app/services/cache.py
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+
+
+class LRUStore:
+    """Thread-safe, size-bounded in-process store with per-key expiry."""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._counters = {}  # never evicted, so version numbers cannot reset
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class ResponseCache:
+    """
+    Per-user cache of serialized API payloads.
+
+    Entries are keyed on a per-user version number; bumping the version on any
+    write makes every cached payload of that user unreachable at once, with no
+    key scanning. Uses Redis when REDIS_URL is configured and falls back to an
+    in-process LRU otherwise (in which case each worker invalidates on its own
+    and entries can lag by up to the TTL on other workers).
+    """
+
+    KEY_PREFIX = 'planora:cache:'
+
+    def __init__(self, app=None):
+        self.redis = None
+        self.local = LRUStore()
+        self.ttl = 60
+        self.enabled = True
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        self.local = LRUStore(app.config.get('RESPONSE_CACHE_LRU_SIZE', 1024))
+
+        redis_url = app.config.get('REDIS_URL')
+        if redis_url:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+                self.redis.ping()
+            except Exception as e:
+                logging.warning(f"Redis unavailable at {redis_url}, using in-process cache. Error: {e}")
+                self.redis = None
+        app.extensions['response_cache'] = self
+
+    # --- low-level store access (Redis first, LRU on failure) ---
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+        if self.redis is not None:
+            try:
+                self.redis.hincrby(self.KEY_PREFIX + 'stats', name, 1)
+            except Exception:
+                pass
+
+    def _get(self, key):
+        if self.redis is not None:
+            try:
+                return self.redis.get(self.KEY_PREFIX + key)
+            except Exception as e:
+                self._count('errors')
+                logging.warning(f"Redis GET failed for {key}. Error: {e}")
+        return self.local.get(key)
+
+    def _set(self, key, value, ttl=None):
+        if self.redis is not None:
+            try:
+                self.redis.set(self.KEY_PREFIX + key, value, ex=ttl)
+                return
+            except Exception as e:
+                self._count('errors')
+                logging.warning(f"Redis SET failed for {key}. Error: {e}")
+        self.local.set(key, value, ttl)
+
+    def _incr(self, key):
+        if self.redis is not None:
+            try:
+                return int(self.redis.incr(self.KEY_PREFIX + key))
+            except Exception as e:
+                self._count('errors')
+                logging.warning(f"Redis INCR failed for {key}. Error: {e}")
+        return self.local.incr(key)
+
+    # --- public API ---
+    def user_version(self, user_id):
+        value = self._get(f'version:{user_id}')
+        return int(value) if value else 0
+
+    def invalidate_user(self, user_id):
+        """Make every cached payload of this user stale."""
+        self._incr(f'version:{user_id}')
+        self._count('invalidations')
+
+    def get(self, user_id, name):
+        """
+        Return (version, cached): the user's current cache version and
+        (body, etag) for the payload cached under it, or None. On a miss,
+        store the rebuilt payload under this same version, so that a write
+        committed while it was being built leaves it unreachable.
+        """
+        version = self.user_version(user_id)
+        body = self._get(f'{name}:{user_id}:{version}')
+        if body is None:
+            self._count('misses')
+            return version, None
+        self._count('hits')
+        return version, (body, _etag(body))
+
+    def set(self, user_id, name, body, version, ttl=None):
+        self._set(f'{name}:{user_id}:{version}', body, ttl or self.ttl)
+        return _etag(body)
+
+    def get_stats(self):
+        """Counters of this worker and, with Redis, across all workers."""
+        with self._stats_lock:
+            local = dict(self.stats)
+        total = local['hits'] + local['misses']
+        data = {
+            'backend': 'redis' if self.redis is not None else 'memory',
+            'worker': {**local, 'hit_rate': round(local['hits'] / total, 4) if total else 0},
+        }
+        if self.redis is not None:
+            try:
+                shared = {k.decode(): int(v) for k, v in self.redis.hgetall(self.KEY_PREFIX + 'stats').items()}
+                shared_total = shared.get('hits', 0) + shared.get('misses', 0)
+                data['global'] = {**shared,
+                                  'hit_rate': round(shared.get('hits', 0) / shared_total, 4) if shared_total else 0}
+            except Exception:
+                pass
+        return data
+
+
+def _etag(body):
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.md5(body).hexdigest()
+
+
+def _cache():
+    return current_app.extensions['response_cache']
+
+
+def cached_json_response(name, user_id, build, ttl=None):
+    """
+    Serve a JSON payload from the per-user cache, building it on a miss.
+    `build` returns (payload_dict, status); only 200 responses are cached.
+    Responses carry an ETag, and a matching If-None-Match gets a 304.
+    """
+    cache = _cache()
+    # The version is read before build() runs, never after
+    version, cached = cache.get(user_id, name) if cache.enabled else (None, None)
+
+    if cached is not None:
+        body, etag = cached
+    else:
+        payload, status = build()
+        body = current_app.json.dumps(payload)
+        if status != 200:
+            return current_app.response_class(body, status=status, mimetype='application/json')
+        etag = cache.set(user_id, name, body, version, ttl) if cache.enabled else _etag(body)
+
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['X-Cache'] = 'HIT' if cached is not None else 'MISS'
+    return response.make_conditional(request)
+
+
+def invalidates_user_cache(view):
+    """
+    Bump the caller's cache version after a successful write.
+    Apply below @jwt_required() so the identity is available.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = view(*args, **kwargs)
+        status = response[1] if isinstance(response, tuple) else getattr(response, 'status_code', 200)
+        if status < 400:
+            try:
+                _cache().invalidate_user(int(get_jwt_identity()))
+            except Exception as e:
+                logging.error(f"Cache invalidation failed. Error: {e}", exc_info=True)
+        return response
+    return wrapper
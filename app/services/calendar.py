@@ -0,0 +1,175 @@
+from datetime import datetime, date, time, timedelta, timezone
+from sqlalchemy import select
+from ..extensions import db
+from ..models.task import Task
+from ..models.focus_session import FocusSession
+
+# Longest window a single events request may ask for
+MAX_WINDOW_DAYS = 366
+
+# Rows fetched per round trip when streaming the iCalendar feed
+ICS_BATCH_SIZE = 500
+
+TASK_COLOR = '#00d4ff'
+COMPLETED_TASK_COLOR = '#2ea043'
+FOCUS_SESSION_COLOR = '#a371f7'
+
+
+def parse_bound(value):
+    """Parse a window bound (date or ISO datetime) into a naive UTC datetime."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_window(args):
+    """
+    Read ?start=&end= as a half-open window. Without them the window covers
+    the six-week month grid around today, which is what a calendar shows first.
+    Raises ValueError on unparseable or oversized windows.
+    """
+    start_str, end_str = args.get('start'), args.get('end')
+    if start_str:
+        start = parse_bound(start_str)
+    else:
+        first_of_month = date.today().replace(day=1)
+        start = datetime.combine(first_of_month - timedelta(days=first_of_month.weekday()), time.min)
+    end = parse_bound(end_str) if end_str else start + timedelta(weeks=6)
+
+    if end <= start:
+        raise ValueError('end must be after start')
+    if end - start > timedelta(days=MAX_WINDOW_DAYS):
+        raise ValueError(f'window may span at most {MAX_WINDOW_DAYS} days')
+    return start, end
+
+
+def _task_rows(user_id, start=None, end=None):
+    # Range scan on ix_tasks_user_id_due_date; only the columns an event needs
+    stmt = select(
+        Task.id, Task.title, Task.description, Task.status, Task.due_date
+    ).where(Task.user_id == user_id, Task.due_date.isnot(None))
+    if start is not None:
+        stmt = stmt.where(Task.due_date >= start)
+    if end is not None:
+        stmt = stmt.where(Task.due_date < end)
+    return stmt.order_by(Task.due_date.asc(), Task.id.asc())
+
+
+def _focus_session_rows(user_id, start=None, end=None):
+    # Range scan on ix_focus_sessions_user_id_started_at
+    stmt = select(
+        FocusSession.id, FocusSession.session_type, FocusSession.duration,
+        FocusSession.started_at, FocusSession.ended_at, FocusSession.task_id
+    ).where(FocusSession.user_id == user_id, FocusSession.started_at.isnot(None))
+    if start is not None:
+        stmt = stmt.where(FocusSession.started_at >= start)
+    if end is not None:
+        stmt = stmt.where(FocusSession.started_at < end)
+    return stmt.order_by(FocusSession.started_at.asc(), FocusSession.id.asc())
+
+
+def _session_end(row):
+    if row.ended_at:
+        return row.ended_at
+    return row.started_at + timedelta(minutes=row.duration or 0)
+
+
+def task_events(user_id, start, end):
+    """FullCalendar events for tasks due inside [start, end)."""
+    events = []
+    for row in db.session.execute(_task_rows(user_id, start, end)):
+        color = TASK_COLOR if row.status != 'completed' else COMPLETED_TASK_COLOR
+        events.append({
+            'id': f'task_{row.id}',
+            'title': row.title,
+            'start': row.due_date.isoformat(),
+            'backgroundColor': color,
+            'borderColor': color
+        })
+    return events
+
+
+def focus_session_events(user_id, start, end):
+    """FullCalendar events for focus sessions started inside [start, end)."""
+    events = []
+    for row in db.session.execute(_focus_session_rows(user_id, start, end)):
+        events.append({
+            'id': f'focus_{row.id}',
+            'title': f"Focus: {row.session_type or 'session'}",
+            'start': row.started_at.isoformat(),
+            'end': _session_end(row).isoformat(),
+            'task_id': row.task_id,
+            'backgroundColor': FOCUS_SESSION_COLOR,
+            'borderColor': FOCUS_SESSION_COLOR
+        })
+    return events
+
+
+def _ics_escape(text):
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+
+def _ics_datetime(value):
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ics_fold(line):
+    """Fold a content line at 75 octets as RFC 5545 requires."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    # Continuation lines start with a space, leaving 74 octets of content
+    while len(encoded) > (75 if not parts else 74):
+        cut = 75 if not parts else 74
+        # Never split inside a multi-byte character
+        while cut and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _ics_event(uid, stamp, summary, start, end=None, description=None, status=None):
+    lines = ['BEGIN:VEVENT', f'UID:{uid}', f'DTSTAMP:{stamp}', f'DTSTART:{_ics_datetime(start)}']
+    if end is not None:
+        lines.append(f'DTEND:{_ics_datetime(end)}')
+    lines.append(f'SUMMARY:{_ics_escape(summary)}')
+    if description:
+        lines.append(f'DESCRIPTION:{_ics_escape(description)}')
+    if status:
+        lines.append(f'STATUS:{status}')
+    lines.append('END:VEVENT')
+    return ''.join(_ics_fold(line) for line in lines)
+
+
+def iter_ics(user_id, start=None, end=None, host='planora'):
+    """
+    Yield an iCalendar feed one event at a time. Rows come through
+    yield_per, which streams them from a server-side cursor on PostgreSQL,
+    so memory stays flat however long the history is.
+    """
+    stamp = _ics_datetime(datetime.utcnow())
+    yield ''.join(_ics_fold(line) for line in (
+        'BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Planora//Calendar//EN',
+        'CALSCALE:GREGORIAN', 'X-WR-CALNAME:Planora'
+    ))
+
+    tasks = db.session.execute(_task_rows(user_id, start, end).execution_options(yield_per=ICS_BATCH_SIZE))
+    for row in tasks:
+        yield _ics_event(
+            f'task-{row.id}@{host}', stamp, row.title, row.due_date,
+            description=row.description,
+            status='CANCELLED' if row.status == 'cancelled' else 'CONFIRMED'
+        )
+
+    sessions = db.session.execute(_focus_session_rows(user_id, start, end).execution_options(yield_per=ICS_BATCH_SIZE))
+    for row in sessions:
+        yield _ics_event(
+            f'focus-{row.id}@{host}', stamp, f"Focus: {row.session_type or 'session'}",
+            row.started_at, _session_end(row)
+        )
+
+    yield _ics_fold('END:VCALENDAR')
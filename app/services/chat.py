@@ -0,0 +1,176 @@
+import json
+import re
+from datetime import datetime
+from ..extensions import db, project_index
+from ..models.project import Project
+from ..models.task import Task
+from .ranking import key_between, last_rank
+
+CHAT_PROMPT = """You are 'Planora Agent', an AI assistant that helps users plan their work.
+
+    **USER'S PROJECTS:**
+    {project_list}
+
+    **USER'S REQUEST:** "{user_message}"
+
+    **YOUR TASK:**
+    Analyze the user's request and choose an action. Respond ONLY with a single, clean JSON object.
+
+    1.  **If the user wants to add a task:**
+        - Identify the task title, the project it belongs to, and estimate a duration in minutes.
+        - Create a brief, one-sentence description for the task.
+        - Format your response like this:
+        {{"action": "add_task", "task": {{"title": "Task Title", "description": "A brief description.", "estimated_duration": 60, "project_name": "Project Name"}}}}
+
+    2.  **If the user wants to create a new project:**
+        - Format your response like this:
+        {{"action": "create_project", "goal": "The user's goal for the new project."}}
+
+    3.  **For any other request (questions, greetings, etc.):**
+        - Provide a helpful, conversational answer.
+        - Format your response like this:
+        {{"action": "answer", "response": "Your conversational reply."}}
+    """
+
+
+def build_chat_prompt(user_id, user_message):
+    project_list = project_index.get(user_id).prompt_list()
+    return CHAT_PROMPT.format(project_list=project_list, user_message=user_message)
+
+
+def parse_action(text):
+    cleaned_response = text.strip().replace('```json', '').replace('```', '')
+    return json.loads(cleaned_response)
+
+
+def find_project(user_id, project_name):
+    """
+    Resolve the model's project_name against the user's project index.
+    Returns (project, candidates); project is None when no name is close
+    enough or several are equally close.
+    """
+    project_id, candidates = project_index.get(user_id).match(project_name)
+    if project_id is None:
+        return None, candidates
+    project = db.session.get(Project, project_id)
+    if project is None or project.user_id != user_id:
+        # Deleted since the index was built
+        project_index.invalidate(user_id)
+        return None, []
+    return project, candidates
+
+
+def perform_action(user_id, action_plan):
+    """
+    Carry out the action the model chose and build the reply payload.
+    Commits when the action writes anything.
+    """
+    action = action_plan.get('action')
+
+    if action == 'add_task':
+        task_details = action_plan.get('task') or {}
+        project_name = task_details.get('project_name')
+        project, candidates = find_project(user_id, project_name)
+
+        if not project:
+            if len(candidates) > 1:
+                names = ", ".join(f"'{name}'" for name in candidates[:-1]) + f" or '{candidates[-1]}'"
+                reply = f"I'm not sure which project you mean by '{project_name}'. Did you mean {names}?"
+            else:
+                reply = f"I couldn't find a project named '{project_name}'."
+            return {'success': True, 'reply': reply, 'action_taken': 'none'}
+
+        new_task = Task(
+            title=task_details.get('title'),
+            description=task_details.get('description'),
+            estimated_duration=task_details.get('estimated_duration'),
+            user_id=user_id,
+            due_date=datetime.utcnow(),
+            # New tasks go to the end of their column
+            rank=key_between(last_rank(user_id, None), None)
+        )
+        project.tasks.append(new_task)
+        db.session.commit()
+
+        return {
+            'success': True,
+            'reply': f"OK, I've added '{new_task.title}' to the '{project.name}' project for you.",
+            'action_taken': 'task_added',
+            'new_task': new_task.to_dict(progress=0)
+        }
+
+    if action == 'create_project':
+        goal = action_plan.get('goal', 'Untitled Project')
+        new_project = Project(name=goal, user_id=user_id,
+                              description="Generated by Planora AI.")
+        db.session.add(new_project)
+        db.session.commit()
+        return {
+            'success': True,
+            'reply': f"Great! I've created a new project for you: '{new_project.name}'.",
+            'action_taken': 'reload'  # Tells frontend to refresh data
+        }
+
+    # Answer
+    return {'success': True, 'reply': action_plan.get('response'), 'action_taken': 'none'}
+
+
+_ACTION = re.compile(r'"action"\s*:\s*"([^"\\]*)"')
+_RESPONSE_START = re.compile(r'"response"\s*:\s*"')
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class AnswerStreamer:
+    """
+    Incrementally scans a streamed JSON reply. Once the action is known to
+    be "answer", feed() returns the decoded text of the "response" string as
+    it arrives; for other actions it returns nothing and the caller acts on
+    the complete text at the end.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.action = None
+        self._position = None   # index in buffer of the next undecoded response char
+        self._closed = False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        if self.action is None:
+            match = _ACTION.search(self.buffer)
+            if match:
+                self.action = match.group(1)
+        if self._position is None:
+            match = _RESPONSE_START.search(self.buffer)
+            if match:
+                self._position = match.end()
+        if self.action != 'answer' or self._position is None or self._closed:
+            return ''
+        return self._decode()
+
+    def _decode(self):
+        out = []
+        i, text = self._position, self.buffer
+        while i < len(text):
+            char = text[i]
+            if char == '"':
+                self._closed = True
+                break
+            if char != '\\':
+                out.append(char)
+                i += 1
+                continue
+            # Wait for the rest of an escape sequence that was split across chunks
+            if i + 1 >= len(text):
+                break
+            code = text[i + 1]
+            if code == 'u':
+                if i + 6 > len(text):
+                    break
+                out.append(chr(int(text[i + 2:i + 6], 16)))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                i += 2
+        self._position = i
+        return ''.join(out)
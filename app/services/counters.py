@@ -0,0 +1,74 @@
+# app/services/counters.py
+from sqlalchemy import case, func
+from ..extensions import db
+from ..models.task import Task
+from ..models.task_counter import UserTaskCounter, CategoryTaskCounter, PENDING_STATUSES
+
+
+def _reconcile(model, key_attr, actual, scope, fields, dry_run):
+    """Bring stored counter rows in line with `actual` and return the drifted keys."""
+    query = model.query
+    if scope is not None:
+        query = query.filter(getattr(model, key_attr).in_(scope))
+    stored = {getattr(row, key_attr): row for row in query.all()}
+
+    drift = []
+    for key in set(stored) | set(actual):
+        expected = actual.get(key, dict.fromkeys(fields, 0))
+        row = stored.get(key)
+        current = {f: getattr(row, f) for f in fields} if row else dict.fromkeys(fields, 0)
+        if row is not None and current == expected:
+            continue
+        if row is None and not any(expected.values()):
+            continue
+
+        drift.append({'id': key, 'stored': current if row else None, 'actual': expected})
+        if not dry_run:
+            if row is None:
+                row = model(**{key_attr: key})
+                db.session.add(row)
+            for f in fields:
+                setattr(row, f, expected[f])
+    return drift
+
+
+def rebuild_task_counters(user_ids=None, dry_run=False):
+    """
+    Recompute user and category task counters from the tasks table.
+    Returns the rows that had drifted; they are corrected unless dry_run is set.
+    Bulk writes that bypass the ORM (query.delete(), core inserts) call this
+    for the users they touched.
+    """
+    completed = func.sum(case((Task.status == 'completed', 1), else_=0))
+    pending = func.sum(case((Task.status.in_(PENDING_STATUSES), 1), else_=0))
+
+    user_query = db.session.query(Task.user_id, func.count(Task.id), completed, pending)
+    category_query = db.session.query(Task.category_id, func.count(Task.id), completed).filter(
+        Task.category_id.isnot(None))
+    category_scope = None
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        user_query = user_query.filter(Task.user_id.in_(user_ids))
+        category_query = category_query.filter(Task.user_id.in_(user_ids))
+        from ..models.category import Category
+        category_scope = [c.id for c in Category.query.with_entities(Category.id).filter(
+            Category.user_id.in_(user_ids))]
+
+    actual_users = {
+        uid: {'total': total, 'completed': int(done or 0), 'pending': int(todo or 0)}
+        for uid, total, done, todo in user_query.group_by(Task.user_id)
+    }
+    actual_categories = {
+        cid: {'total': total, 'completed': int(done or 0)}
+        for cid, total, done in category_query.group_by(Task.category_id)
+    }
+
+    report = {
+        'users': _reconcile(UserTaskCounter, 'user_id', actual_users, user_ids,
+                            ('total', 'completed', 'pending'), dry_run),
+        'categories': _reconcile(CategoryTaskCounter, 'category_id', actual_categories, category_scope,
+                                 ('total', 'completed'), dry_run),
+    }
+    if not dry_run:
+        db.session.commit()
+    return report
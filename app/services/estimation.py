@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import func, select
+from ..extensions import db
+from ..models.task import Task
+from ..models.task_time import TaskTimeRollup
+
+MAX_DAYS = 3660
+WORST_TASKS = 10
+
+# Ratio (estimate / actual) buckets; 0.8-1.25 counts as accurate
+RATIO_EDGES = [0.5, 0.8, 1.25, 2.0]
+RATIO_BUCKETS = ['<0.5', '0.5-0.8', '0.8-1.25', '1.25-2', '>=2']
+ACCURATE = (0.8, 1.25)
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def parse_estimation_args(args):
+    """
+    Read ?days= (1..MAX_DAYS; all time when absent) and ?status= (limit to
+    tasks with this status, e.g. completed). Raises ValueError on bad input.
+    """
+    days = args.get('days')
+    if days is not None:
+        try:
+            days = int(days)
+        except ValueError:
+            raise ValueError('days must be an integer')
+        if not 1 <= days <= MAX_DAYS:
+            raise ValueError(f'days must be between 1 and {MAX_DAYS}')
+    return days, args.get('status') or None
+
+
+def compute_estimation_accuracy(user_id, days=None, status=None, now=None):
+    """
+    Distribution of estimate/actual ratios over the user's estimated tasks
+    with tracked focus time. Actual minutes are summed from the per-day
+    rollup (optionally over the last `days` days only), so the cost follows
+    the number of task-days rather than the number of sessions.
+    A ratio above 1 means the task took less time than estimated.
+    """
+    actual = func.sum(TaskTimeRollup.minutes)
+    stmt = (
+        select(Task.id, Task.title, Task.estimated_duration, actual)
+        .join(TaskTimeRollup, TaskTimeRollup.task_id == Task.id)
+        .where(Task.user_id == user_id, Task.estimated_duration > 0)
+        .group_by(Task.id, Task.title, Task.estimated_duration)
+        .having(actual > 0)
+    )
+    if days is not None:
+        now = now or datetime.utcnow()
+        stmt = stmt.where(TaskTimeRollup.day > (now - timedelta(days=days)).date())
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    rows = db.session.execute(stmt).all()
+
+    task_ids, titles, estimated, actual_minutes = zip(*rows) if rows else ((),) * 4
+    estimated = np.array(estimated, dtype=float)
+    actual_minutes = np.array(actual_minutes, dtype=float)
+    ratio = estimated / actual_minutes if rows else np.array([])
+
+    buckets = np.bincount(np.searchsorted(RATIO_EDGES, ratio, side='right'), minlength=len(RATIO_BUCKETS))
+    accurate = (ratio >= ACCURATE[0]) & (ratio < ACCURATE[1])
+    # Furthest from 1 on a log scale, so 2x over and 2x under rank the same
+    worst = np.argsort(-np.abs(np.log(ratio)), kind='stable')[:WORST_TASKS]
+
+    summary = {
+        'tasks': len(rows),
+        'estimated_minutes': int(estimated.sum()),
+        'actual_minutes': int(actual_minutes.sum()),
+        'accurate': int(accurate.sum()),
+        'overestimated': int((ratio >= ACCURATE[1]).sum()),
+        'underestimated': int((ratio < ACCURATE[0]).sum()),
+    }
+    if rows:
+        summary.update({
+            'median_ratio': round(float(np.median(ratio)), 3),
+            'geometric_mean_ratio': round(float(np.exp(np.log(ratio).mean())), 3),
+            'percentiles': {f'p{p}': round(float(value), 3)
+                            for p, value in zip(PERCENTILES, np.percentile(ratio, PERCENTILES))},
+        })
+    else:
+        summary.update({'median_ratio': None, 'geometric_mean_ratio': None, 'percentiles': None})
+
+    return {
+        'range': {'days': days, 'status': status},
+        'summary': summary,
+        'histogram': [
+            {'bucket': label, 'tasks': int(count)} for label, count in zip(RATIO_BUCKETS, buckets)
+        ],
+        'tasks': [
+            {
+                'task_id': task_ids[index],
+                'title': titles[index],
+                'estimated_minutes': int(estimated[index]),
+                'actual_minutes': int(actual_minutes[index]),
+                'ratio': round(float(ratio[index]), 3),
+            }
+            for index in worst.tolist()
+        ],
+    }
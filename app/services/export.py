@@ -0,0 +1,252 @@
+import csv
+import io
+import json
+import logging
+import zipfile
+from datetime import datetime, date
+from sqlalchemy import select, Boolean, Date, DateTime, Float, Integer, Numeric
+from ..extensions import db
+from ..models.user import User
+from ..models.project import Project, project_task_association
+from ..models.category import Category
+from ..models.task import Task
+from ..models.note import Note
+from ..models.focus_session import FocusSession
+
+# Tables in export order; parents come before the rows that reference them
+EXPORT_TABLES = ('users', 'projects', 'categories', 'tasks', 'project_tasks', 'notes', 'focus_sessions')
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'parquet')
+
+# Rows fetched per round trip; also the Parquet row group size
+EXPORT_BATCH_SIZE = 1000
+
+# Columns that never leave the server
+EXCLUDED_COLUMNS = {
+    'users': {'password_hash'},
+}
+
+
+class ExportUnavailable(Exception):
+    """The requested format needs an optional dependency that is not installed."""
+
+
+def parse_tables(raw):
+    """Parse ?tables=a,b into known table names in export order; None when invalid."""
+    if not raw:
+        return EXPORT_TABLES
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    if not requested or requested - set(EXPORT_TABLES):
+        return None
+    return tuple(name for name in EXPORT_TABLES if name in requested)
+
+
+def _columns(name, table):
+    excluded = EXCLUDED_COLUMNS.get(name, set())
+    return [column for column in table.c if column.name not in excluded]
+
+
+def _export_select(name, user_id):
+    """The Core statement that reads one table's rows for a user."""
+    if name == 'users':
+        table = User.__table__
+        return select(*_columns(name, table)).where(table.c.id == user_id)
+    if name == 'project_tasks':
+        # Only mapped through the association table, so scope it by project owner
+        return select(*project_task_association.c).join(
+            Project, Project.id == project_task_association.c.project_id
+        ).join(
+            Task, Task.id == project_task_association.c.task_id
+        ).where(
+            Project.user_id == user_id, Project.deleted_at.is_(None), Task.deleted_at.is_(None)
+        ).order_by(
+            project_task_association.c.project_id, project_task_association.c.task_id
+        )
+
+    model = {
+        'projects': Project,
+        'categories': Category,
+        'tasks': Task,
+        'notes': Note,
+        'focus_sessions': FocusSession,
+    }[name]
+    table = model.__table__
+    statement = select(*_columns(name, table)).where(table.c.user_id == user_id).order_by(table.c.id)
+    if 'deleted_at' in table.c:
+        # Core statements are not filtered by SoftDeleteMixin
+        statement = statement.where(table.c.deleted_at.is_(None))
+    return statement
+
+
+def _stream_rows(name, user_id):
+    """
+    Yield lists of row mappings, EXPORT_BATCH_SIZE at a time. yield_per keeps a
+    server-side cursor open on PostgreSQL, so only one batch is ever in memory.
+    """
+    stmt = _export_select(name, user_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    result = db.session.execute(stmt)
+    for partition in result.mappings().partitions():
+        yield partition
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only sink that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class _CountingWriter:
+    """Gives a zip entry handle the tell() that Parquet writers need."""
+
+    def __init__(self, handle):
+        self._handle = handle
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._handle.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def iter_ndjson(user_id, tables=EXPORT_TABLES):
+    """Yield one JSON line per row: {"table": ..., "data": {...}}."""
+    for name in tables:
+        for batch in _stream_rows(name, user_id):
+            yield ''.join(
+                json.dumps({'table': name, 'data': dict(row)}, default=_json_default) + '\n'
+                for row in batch
+            )
+
+
+def _iter_zip(user_id, tables, extension, write_table):
+    """
+    Yield a zip archive with one `<table>.<extension>` entry per table. The
+    archive is written without seeking (sizes go in data descriptors), so
+    each batch can be sent as soon as it is compressed.
+    """
+    sink = _StreamBuffer()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name in tables:
+            info = zipfile.ZipInfo(f'{name}.{extension}', date_time=datetime.utcnow().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, 'w', force_zip64=True) as entry:
+                for _ in write_table(name, entry):
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _write_csv_table(user_id):
+    def write_table(name, entry):
+        text = io.TextIOWrapper(entry, encoding='utf-8', newline='', write_through=True)
+        writer = csv.writer(text)
+        writer.writerow([column.name for column in _export_select(name, user_id).selected_columns])
+        yield
+        for batch in _stream_rows(name, user_id):
+            writer.writerows([_csv_value(value) for value in row.values()] for row in batch)
+            yield
+        text.detach()
+    return write_table
+
+
+def _arrow_schema(pa, stmt):
+    def arrow_type(column):
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, (Float, Numeric)):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp('us')
+        if isinstance(column.type, Date):
+            return pa.date32()
+        return pa.string()
+    # Fixed from the column types, so an all-NULL first batch cannot change it
+    return pa.schema([(column.name, arrow_type(column)) for column in stmt.selected_columns])
+
+
+def _write_parquet_table(user_id):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ExportUnavailable('Parquet export requires pyarrow to be installed.') from e
+
+    def write_table(name, entry):
+        schema = _arrow_schema(pa, _export_select(name, user_id))
+        with pq.ParquetWriter(_CountingWriter(entry), schema) as writer:
+            for batch in _stream_rows(name, user_id):
+                writer.write_table(pa.Table.from_pylist([dict(row) for row in batch], schema=schema))
+                yield
+        yield
+    return write_table
+
+
+def iter_export(user_id, export_format, tables=EXPORT_TABLES):
+    """
+    Return (chunks, mimetype, filename) for a streaming export.
+    Raises ExportUnavailable before anything is streamed if the format cannot run.
+    """
+    if export_format == 'ndjson':
+        return _logged(iter_ndjson(user_id, tables), user_id), 'application/x-ndjson', 'planora-export.ndjson'
+    if export_format == 'csv':
+        chunks = _iter_zip(user_id, tables, 'csv', _write_csv_table(user_id))
+        return _logged(chunks, user_id), 'application/zip', 'planora-export-csv.zip'
+    if export_format == 'parquet':
+        chunks = _iter_zip(user_id, tables, 'parquet', _write_parquet_table(user_id))
+        return _logged(chunks, user_id), 'application/zip', 'planora-export-parquet.zip'
+    raise ValueError(f'Unknown export format: {export_format}')
+
+
+def _logged(chunks, user_id):
+    # Errors after the first byte cannot become a 500 any more; log them at least
+    try:
+        yield from chunks
+    except Exception as e:
+        logging.error(f"Export for user {user_id} failed mid-stream. Error: {e}", exc_info=True)
+        raise
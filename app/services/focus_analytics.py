@@ -0,0 +1,208 @@
+from datetime import datetime, time, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from ..extensions import db
+from ..models.focus_session import FocusSession
+from ..models.task import Task
+
+DEFAULT_DAYS = 365
+MAX_DAYS = 366
+TOP_TASKS = 10
+
+# Session types that are not focused work
+BREAK_TYPES = ('break',)
+
+# Weekly productivity slopes smaller than this (points per week) count as flat
+FLAT_TREND = 0.05
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def parse_analytics_args(args):
+    """
+    Read ?days= (1..MAX_DAYS, default DEFAULT_DAYS) and ?tz= (IANA name,
+    default UTC). Raises ValueError on bad input.
+    """
+    try:
+        days = int(args.get('days', DEFAULT_DAYS))
+    except ValueError:
+        raise ValueError('days must be an integer')
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f'days must be between 1 and {MAX_DAYS}')
+
+    tz_name = args.get('tz') or 'UTC'
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f'unknown time zone {tz_name!r}')
+    return days, tz_name, tz
+
+
+def _load_sessions(user_id, start, end):
+    """
+    Every finished session in [start, end) as NumPy columns, from one range
+    scan on ix_focus_sessions_user_id_started_at. Runs on the Core connection:
+    FocusSession has no ORM criteria, and skipping the ORM row layer roughly
+    halves the load time.
+    """
+    rows = db.session.connection().execute(
+        select(FocusSession.started_at, FocusSession.duration, FocusSession.session_type,
+               FocusSession.productivity_score, FocusSession.task_id)
+        .where(FocusSession.user_id == user_id,
+               FocusSession.started_at >= start,
+               FocusSession.started_at < end,
+               FocusSession.ended_at.isnot(None))
+    ).all()
+    started, duration, session_type, score, task_id = zip(*rows) if rows else ((),) * 5
+    return {
+        'started_at': np.array(started, dtype='datetime64[us]'),
+        'duration': np.array([value or 0 for value in duration], dtype=np.int64),
+        'session_type': np.array([value or '' for value in session_type], dtype=object),
+        'productivity_score': np.array(score, dtype=float),
+        'task_id': np.array(task_id, dtype=float),
+    }
+
+
+def _streaks(active, day_labels):
+    """Current and longest run of consecutive active days, from a boolean array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return {'current': 0, 'longest': 0, 'longest_start': None, 'longest_end': None}
+
+    lengths = ends - starts
+    best = int(np.argmax(lengths))
+    # A streak is still current if it reaches today, or yesterday when today has nothing yet
+    current = int(lengths[-1]) if ends[-1] >= len(active) - (0 if active[-1] else 1) else 0
+    return {
+        'current': current,
+        'longest': int(lengths[best]),
+        'longest_start': day_labels[starts[best]],
+        'longest_end': day_labels[ends[best] - 1],
+    }
+
+
+def _productivity(week, score, week_labels):
+    """Average self-rating per week and the slope of a least-squares line through it."""
+    rated = ~np.isnan(score)
+    counts = np.bincount(week[rated], minlength=len(week_labels))
+    totals = np.bincount(week[rated], weights=score[rated], minlength=len(week_labels))
+    weeks = np.flatnonzero(counts)
+    means = totals[weeks] / counts[weeks]
+
+    slope = float(np.polyfit(weeks.astype(float), means, 1)[0]) if len(weeks) >= 2 else None
+    if slope is None:
+        direction = None
+    elif abs(slope) < FLAT_TREND:
+        direction = 'flat'
+    else:
+        direction = 'up' if slope > 0 else 'down'
+    return {
+        'weekly': [
+            {'week_start': week_labels[index], 'avg_score': round(float(mean), 2), 'sessions': int(counts[index])}
+            for index, mean in zip(weeks, means)
+        ],
+        'slope_per_week': round(slope, 4) if slope is not None else None,
+        'direction': direction,
+    }
+
+
+def compute_focus_analytics(user_id, days=DEFAULT_DAYS, tz_name='UTC', tz=None, now=None):
+    """
+    Focus analytics over the last `days` local days (today included):
+    totals, daily and weekly minutes, streaks, a weekday x hour heatmap,
+    minutes per task and the productivity trend. One query loads the
+    sessions as columns; pandas converts them to local time and every
+    aggregate is a NumPy bincount over day, week, hour or task offsets.
+    Minutes are credited to the day and hour a session started in.
+    """
+    tz = tz or ZoneInfo(tz_name)
+    now = now or datetime.utcnow()
+    today = pd.Timestamp(now, tz='UTC').tz_convert(tz).date()
+    first_day = np.datetime64(today, 'D') - (days - 1)
+    # Local midnights back to naive UTC for the index range scan
+    start, end = (
+        datetime.combine(day.astype(object), time.min, tz).astimezone(timezone.utc).replace(tzinfo=None)
+        for day in (first_day, first_day + days)
+    )
+
+    columns = _load_sessions(user_id, start, end)
+    local = (pd.DatetimeIndex(columns['started_at']).tz_localize('UTC')
+             .tz_convert(tz).tz_localize(None).to_numpy())
+    local_day = local.astype('datetime64[D]')
+    day = (local_day - first_day).astype(np.int64)
+    hour = ((local - local_day) // np.timedelta64(1, 'h')).astype(np.int64)
+    weekday = (local_day.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0
+
+    # Weeks start on Monday
+    first_weekday = int((first_day.astype(np.int64) + 3) % 7)
+    week = (day + first_weekday) // 7
+    week_count = (days - 1 + first_weekday) // 7 + 1
+    day_labels = np.datetime_as_string(first_day + np.arange(days)).tolist()
+    week_labels = np.datetime_as_string(first_day - first_weekday + 7 * np.arange(week_count)).tolist()
+
+    duration = columns['duration']
+    is_focus = ~np.isin(columns['session_type'], BREAK_TYPES)
+    focus_minutes = np.where(is_focus, duration, 0)
+    focus_count = is_focus.astype(np.int64)
+
+    daily_minutes = np.bincount(day, weights=focus_minutes, minlength=days).astype(np.int64)
+    daily_sessions = np.bincount(day, weights=focus_count, minlength=days).astype(np.int64)
+    weekly_minutes = np.bincount(week, weights=focus_minutes, minlength=week_count).astype(np.int64)
+    weekly_sessions = np.bincount(week, weights=focus_count, minlength=week_count).astype(np.int64)
+    heatmap = np.bincount(weekday * 24 + hour, weights=focus_minutes, minlength=7 * 24).astype(np.int64)
+
+    has_task = is_focus & ~np.isnan(columns['task_id'])
+    task_ids, task_index = np.unique(columns['task_id'][has_task].astype(np.int64), return_inverse=True)
+    task_minutes = np.bincount(task_index, weights=duration[has_task], minlength=len(task_ids)).astype(np.int64)
+    task_sessions = np.bincount(task_index, minlength=len(task_ids))
+    top = np.argsort(-task_minutes, kind='stable')[:TOP_TASKS]
+    top_ids = task_ids[top].tolist()
+    titles = dict(db.session.execute(
+        select(Task.id, Task.title).where(Task.id.in_(top_ids), Task.user_id == user_id)
+    ).all()) if top_ids else {}
+
+    session_types, type_index = np.unique(columns['session_type'].astype(str), return_inverse=True)
+    type_minutes = np.bincount(type_index, weights=duration, minlength=len(session_types)).astype(np.int64)
+
+    sessions = int(focus_count.sum())
+    minutes = int(daily_minutes.sum())
+    active_days = int(np.count_nonzero(daily_minutes))
+
+    return {
+        'range': {
+            'start': day_labels[0],
+            'end': day_labels[-1],
+            'days': days,
+            'tz': tz_name,
+        },
+        'totals': {
+            'sessions': sessions,
+            'minutes': minutes,
+            'active_days': active_days,
+            'avg_session_minutes': round(minutes / sessions, 1) if sessions else 0,
+            'avg_minutes_per_active_day': round(minutes / active_days, 1) if active_days else 0,
+            'by_session_type': dict(zip(session_types.tolist(), type_minutes.tolist())),
+        },
+        'daily': [
+            {'date': label, 'minutes': total, 'sessions': count}
+            for label, total, count in zip(day_labels, daily_minutes.tolist(), daily_sessions.tolist())
+        ],
+        'weekly': [
+            {'week_start': label, 'minutes': total, 'sessions': count}
+            for label, total, count in zip(week_labels, weekly_minutes.tolist(), weekly_sessions.tolist())
+        ],
+        'streaks': _streaks(daily_minutes > 0, day_labels),
+        'heatmap': {
+            'weekdays': WEEKDAYS,
+            'hours': list(range(24)),
+            'minutes': heatmap.reshape(7, 24).tolist(),
+        },
+        'tasks': [
+            {'task_id': task_id, 'title': titles.get(task_id), 'minutes': total, 'sessions': count}
+            for task_id, total, count in zip(top_ids, task_minutes[top].tolist(), task_sessions[top].tolist())
+        ],
+        'productivity': _productivity(week[is_focus], columns['productivity_score'][is_focus], week_labels),
+    }
@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timedelta
+from ..extensions import db, cache, focus_timers
+from ..models.focus_session import FocusSession
+from ..models.task_time import record_task_time
+from .focus_analytics import BREAK_TYPES
+from .focus_timers import focused_seconds
+
+# Open sessions without a timer closed per reaper run
+REAP_BATCH_SIZE = 500
+
+
+def finish_session(session, focus_seconds, ended_at, completed=True):
+    """
+    Write the final state of a focus session and credit its minutes to the
+    task it was spent on; the caller commits.
+    """
+    session.ended_at = ended_at
+    session.duration = int(focus_seconds // 60)
+    session.was_completed = completed
+    if session.task_id and session.duration > 0 and session.session_type not in BREAK_TYPES:
+        record_task_time(db.session, session.task_id, session.started_at.date(), session.duration)
+
+
+def close_untracked_session(session):
+    """
+    Close a session that has no timer, e.g. one lost with the worker that
+    held it. Its run segments and pauses went with the timer, so nothing is
+    known about them: it ends at its start, with no focus time, and is marked
+    not completed. The caller commits.
+    """
+    finish_session(session, 0, session.started_at, completed=False)
+
+
+def reap_orphaned_sessions(force=False):
+    """
+    Close sessions whose timer stopped sending heartbeats. They end at the
+    last heartbeat, count the focus time up to it, and are marked not
+    completed. Open sessions older than the timeout that have no timer at
+    all are closed with close_untracked_session().
+    Returns the number of sessions closed.
+    """
+    timers = focus_timers.reap(force=force)
+    if timers is None:
+        return 0
+    timers = {timer['session_id']: timer for timer in timers}
+
+    sessions = FocusSession.query.filter(
+        FocusSession.id.in_(list(timers)), FocusSession.ended_at.is_(None)).all() if timers else []
+    for session in sessions:
+        timer = timers[session.id]
+        finish_session(session, focused_seconds(timer, timer['heartbeat_at']),
+                       datetime.utcfromtimestamp(timer['heartbeat_at']), completed=False)
+
+    # Served by the partial index over open sessions
+    cutoff = datetime.utcnow() - timedelta(seconds=focus_timers.timeout)
+    stale = FocusSession.query.filter(
+        FocusSession.ended_at.is_(None), FocusSession.started_at < cutoff
+    ).order_by(FocusSession.started_at).limit(REAP_BATCH_SIZE).all()
+    active = focus_timers.active_ids(session.id for session in stale)
+    untracked = [session for session in stale if session.id not in active]
+    for session in untracked:
+        close_untracked_session(session)
+
+    closed = sessions + untracked
+    if not closed:
+        return 0
+    db.session.commit()
+
+    for user_id in {session.user_id for session in closed}:
+        cache.invalidate_user(user_id)
+    logging.info(f"Closed {len(sessions)} orphaned and {len(untracked)} untracked focus session(s).")
+    return len(closed)
@@ -0,0 +1,257 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+
+
+class TimerStateError(Exception):
+    """A pause/resume that does not fit the timer's current state."""
+
+
+def focused_seconds(timer, now):
+    """Seconds of focus so far: completed run segments plus the current one."""
+    running = now - timer['resumed_at'] if timer['state'] == 'running' else 0
+    return timer['focused'] + max(running, 0)
+
+
+def _iso(epoch):
+    return datetime.utcfromtimestamp(epoch).isoformat() if epoch is not None else None
+
+
+def to_public(timer, timeout, now=None):
+    now = now or time.time()
+    return {
+        'session_id': timer['session_id'],
+        'task_id': timer['task_id'],
+        'state': timer['state'],
+        'started_at': _iso(timer['started_at']),
+        'focused_seconds': int(focused_seconds(timer, now)),
+        'elapsed_seconds': int(now - timer['started_at']),
+        'heartbeat_at': _iso(timer['heartbeat_at']),
+        'expires_at': _iso(timer['heartbeat_at'] + timeout),
+    }
+
+
+def _pause(timer, now):
+    if timer['state'] != 'running':
+        raise TimerStateError('The timer is already paused.')
+    timer['focused'] = focused_seconds(timer, now)
+    timer['state'] = 'paused'
+    timer['resumed_at'] = None
+    return timer
+
+
+def _resume(timer, now):
+    if timer['state'] != 'paused':
+        raise TimerStateError('The timer is already running.')
+    timer['state'] = 'running'
+    timer['resumed_at'] = now
+    return timer
+
+
+def _heartbeat(timer, now):
+    return timer
+
+
+class FocusTimerRegistry:
+    """
+    State of running focus sessions: run segments, pauses and the last
+    heartbeat. Only starting and stopping a session touch the database.
+    Timers live in Redis when REDIS_URL is set, where every transition is a
+    WATCH/MULTI transaction so concurrent requests from several workers
+    cannot lose an update; otherwise in a process-local dict, which other
+    workers cannot see. init_app refuses the process-local dict when
+    WEB_WORKERS says more than one worker is running.
+
+    A timer whose heartbeat is older than FOCUS_TIMER_TIMEOUT seconds is
+    orphaned; reap() hands it back for the session to be closed.
+    """
+
+    KEY_PREFIX = 'planora:timer:'
+    HEARTBEATS_KEY = 'planora:timers:heartbeats'   # sorted set: session id -> last heartbeat
+    REAPER_LOCK_KEY = 'planora:timers:reaper'
+
+    def __init__(self, app=None):
+        self.redis = None
+        self.timeout = 300
+        self.reap_interval = 60
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._last_reap = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.timeout = app.config.get('FOCUS_TIMER_TIMEOUT', 300)
+        self.reap_interval = app.config.get('FOCUS_TIMER_REAP_INTERVAL', 60)
+        workers = app.config.get('WEB_WORKERS', 1)
+        redis_url = app.config.get('REDIS_URL')
+        if redis_url:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+                self.redis.ping()
+            except Exception as e:
+                if workers > 1:
+                    raise RuntimeError(f"Focus timers need Redis with {workers} workers, "
+                                       f"but {redis_url} is unavailable: {e}") from e
+                logging.warning(f"Redis unavailable at {redis_url}, keeping focus timers in-process. Error: {e}")
+                self.redis = None
+        elif workers > 1:
+            raise RuntimeError(f"Focus timers need REDIS_URL with {workers} workers: "
+                               "a timer kept in one worker is invisible to the others.")
+        app.extensions['focus_timers'] = self
+
+    def _key(self, session_id):
+        return f'{self.KEY_PREFIX}{session_id}'
+
+    def _user_key(self, user_id):
+        return f'{self.KEY_PREFIX}user:{user_id}'
+
+    # --- storage ---
+    def start(self, session_id, user_id, task_id, now=None):
+        now = now or time.time()
+        timer = {
+            'session_id': session_id,
+            'user_id': user_id,
+            'task_id': task_id,
+            'state': 'running',
+            'started_at': now,
+            'resumed_at': now,
+            'focused': 0.0,
+            'heartbeat_at': now,
+        }
+        if self.redis is not None:
+            pipe = self.redis.pipeline()
+            pipe.set(self._key(session_id), json.dumps(timer))
+            pipe.zadd(self.HEARTBEATS_KEY, {session_id: now})
+            pipe.sadd(self._user_key(user_id), session_id)
+            pipe.execute()
+        else:
+            with self._lock:
+                self._timers[session_id] = dict(timer)
+        return timer
+
+    def get(self, session_id):
+        if self.redis is not None:
+            raw = self.redis.get(self._key(session_id))
+            return json.loads(raw) if raw else None
+        with self._lock:
+            timer = self._timers.get(session_id)
+            return dict(timer) if timer else None
+
+    def active_ids(self, session_ids):
+        """The subset of `session_ids` that still have a timer."""
+        session_ids = list(session_ids)
+        if not session_ids:
+            return set()
+        if self.redis is not None:
+            raws = self.redis.mget([self._key(session_id) for session_id in session_ids])
+            return {session_id for session_id, raw in zip(session_ids, raws) if raw}
+        with self._lock:
+            return {session_id for session_id in session_ids if session_id in self._timers}
+
+    def for_user(self, user_id):
+        if self.redis is not None:
+            ids = sorted(int(session_id) for session_id in self.redis.smembers(self._user_key(user_id)))
+            raws = self.redis.mget([self._key(session_id) for session_id in ids]) if ids else []
+            return [json.loads(raw) for raw in raws if raw]
+        with self._lock:
+            return [dict(timer) for _, timer in sorted(self._timers.items()) if timer['user_id'] == user_id]
+
+    def _update(self, session_id, change, now):
+        """Apply `change(timer, now)` atomically and record a heartbeat; None if there is no timer."""
+        if self.redis is not None:
+            key = self._key(session_id)
+
+            def apply(pipe):
+                raw = pipe.get(key)
+                if raw is None:
+                    return None
+                timer = change(json.loads(raw), now)
+                timer['heartbeat_at'] = now
+                pipe.multi()
+                pipe.set(key, json.dumps(timer))
+                pipe.zadd(self.HEARTBEATS_KEY, {session_id: now})
+                return timer
+
+            return self.redis.transaction(apply, key, value_from_callable=True)
+
+        with self._lock:
+            timer = self._timers.get(session_id)
+            if timer is None:
+                return None
+            timer = change(dict(timer), now)
+            timer['heartbeat_at'] = now
+            self._timers[session_id] = timer
+            return dict(timer)
+
+    def _pop(self, session_id, only_if=None):
+        """Remove and return the timer atomically, if it exists and passes `only_if`."""
+        if self.redis is not None:
+            key = self._key(session_id)
+
+            def apply(pipe):
+                raw = pipe.get(key)
+                if raw is None:
+                    return None
+                timer = json.loads(raw)
+                if only_if is not None and not only_if(timer):
+                    return None
+                pipe.multi()
+                pipe.delete(key)
+                pipe.zrem(self.HEARTBEATS_KEY, session_id)
+                pipe.srem(self._user_key(timer['user_id']), session_id)
+                return timer
+
+            timer = self.redis.transaction(apply, key, value_from_callable=True)
+            if timer is None:
+                self.redis.zrem(self.HEARTBEATS_KEY, session_id)
+            return timer
+
+        with self._lock:
+            timer = self._timers.get(session_id)
+            if timer is None or (only_if is not None and not only_if(timer)):
+                return None
+            return self._timers.pop(session_id)
+
+    # --- transitions ---
+    def pause(self, session_id, now=None):
+        return self._update(session_id, _pause, now or time.time())
+
+    def resume(self, session_id, now=None):
+        return self._update(session_id, _resume, now or time.time())
+
+    def heartbeat(self, session_id, now=None):
+        return self._update(session_id, _heartbeat, now or time.time())
+
+    def stop(self, session_id):
+        return self._pop(session_id)
+
+    def reap(self, now=None, force=False):
+        """
+        Remove and return timers without a heartbeat for `timeout` seconds.
+        Unless forced, runs at most once per FOCUS_TIMER_REAP_INTERVAL in
+        this process and, with Redis, in the whole deployment; returns None
+        when it skipped its turn.
+        """
+        now = now or time.time()
+        if not force:
+            if now - self._last_reap < self.reap_interval:
+                return None
+            self._last_reap = now
+            if self.redis is not None and not self.redis.set(
+                    self.REAPER_LOCK_KEY, 1, nx=True, ex=max(int(self.reap_interval), 1)):
+                return None
+
+        cutoff = now - self.timeout
+        if self.redis is not None:
+            stale = [int(session_id) for session_id in self.redis.zrangebyscore(self.HEARTBEATS_KEY, 0, cutoff)]
+        else:
+            with self._lock:
+                stale = [session_id for session_id, timer in self._timers.items() if timer['heartbeat_at'] <= cutoff]
+
+        # Re-checked inside the pop, in case a heartbeat arrived meanwhile
+        reaped = (self._pop(session_id, only_if=lambda timer: timer['heartbeat_at'] <= cutoff) for session_id in stale)
+        return [timer for timer in reaped if timer is not None]
@@ -0,0 +1,386 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from sqlalchemy import func, insert, select, text
+from ..extensions import db
+from ..models.task import Task
+from ..models.project import Project, project_task_association
+from ..models.task_counter import TaskCounterDeltas
+from .bulk import insert_tasks
+from .project_index import invalidate_on_commit
+from .ranking import key_between, last_rank
+
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+
+# Rows validated and written per round trip
+IMPORT_BATCH_SIZE = 1000
+
+# Per-row errors returned in the response; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+STATUS_ALIASES = {
+    'todo': 'todo', 'to do': 'todo', 'open': 'todo', 'pending': 'todo',
+    'in-progress': 'in-progress', 'in_progress': 'in-progress', 'in progress': 'in-progress', 'doing': 'in-progress',
+    'completed': 'completed', 'complete': 'completed', 'done': 'completed',
+    'cancelled': 'cancelled', 'canceled': 'cancelled', 'closed': 'cancelled', 'archived': 'cancelled',
+}
+VALID_PRIORITIES = ('low', 'medium', 'high')
+# Todoist's API numbers priorities backwards: 4 is the red "p1"
+TODOIST_PRIORITIES = {4: 'high', 3: 'high', 2: 'medium', 1: 'low'}
+
+TITLE_MAX_LENGTH = Task.__table__.c.title.type.length
+PROJECT_NAME_MAX_LENGTH = Project.__table__.c.name.type.length
+
+
+class ImportFormatError(Exception):
+    """The upload as a whole cannot be read in the requested format."""
+
+
+def detect_format(filename, explicit=None):
+    if explicit:
+        return explicit.lower()
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension in ('jsonl', 'ndjson'):
+        return 'ndjson'
+    return extension if extension in IMPORT_FORMATS else None
+
+
+# --- readers: yield (row_number, record, error) ---
+
+def _read_csv(stream):
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    if not reader.fieldnames:
+        return
+    for record in reader:
+        yield reader.line_num, {key.strip().lower(): value for key, value in record.items() if key}, None
+
+
+def _read_ndjson(stream):
+    for number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield number, None, 'Each line must be a JSON object'
+            continue
+        yield number, record, None
+
+
+def _todoist_records(document):
+    project_names = {project.get('id'): project.get('name') for project in document.get('projects') or []}
+    for item in document.get('items') or []:
+        due = item.get('due') or {}
+        yield {
+            'title': item.get('content'),
+            'description': item.get('description'),
+            'priority': TODOIST_PRIORITIES.get(item.get('priority')),
+            'status': 'completed' if item.get('checked') else 'todo',
+            'due_date': (due.get('datetime') or due.get('date')) if isinstance(due, dict) else due,
+            'project': project_names.get(item.get('project_id')),
+        }
+
+
+def _trello_records(document):
+    board = document.get('name')
+    list_names = {trello_list.get('id'): trello_list.get('name') for trello_list in document.get('lists') or []}
+    for card in document.get('cards') or []:
+        if card.get('closed'):
+            status = 'cancelled'
+        elif card.get('dueComplete'):
+            status = 'completed'
+        else:
+            status = 'todo'
+        yield {
+            'title': card.get('name'),
+            'description': card.get('desc'),
+            'status': status,
+            'due_date': card.get('due'),
+            # A board becomes a project; its lists are not modelled, so keep the name
+            'project': board or list_names.get(card.get('idList')),
+        }
+
+
+def _read_json(stream):
+    try:
+        document = json.load(io.TextIOWrapper(stream, encoding='utf-8-sig'))
+    except ValueError as e:
+        raise ImportFormatError(f'Invalid JSON: {e}')
+
+    if isinstance(document, list):
+        records = document
+    elif isinstance(document, dict) and 'items' in document:
+        records = _todoist_records(document)
+    elif isinstance(document, dict) and 'cards' in document:
+        records = _trello_records(document)
+    elif isinstance(document, dict) and isinstance(document.get('tasks'), list):
+        records = document['tasks']
+    else:
+        raise ImportFormatError('JSON must be a list of tasks, {"tasks": [...]}, a Todoist export or a Trello board')
+
+    for number, record in enumerate(records, start=1):
+        if not isinstance(record, dict):
+            yield number, None, 'Each task must be a JSON object'
+        else:
+            yield number, record, None
+
+
+READERS = {'csv': _read_csv, 'ndjson': _read_ndjson, 'json': _read_json}
+
+
+# --- validation ---
+
+def _first(record, *keys):
+    for key in keys:
+        value = record.get(key)
+        if value is not None and value != '':
+            return value
+    return None
+
+
+def _parse_due_date(value):
+    value = str(value).strip()
+    if 'T' not in value and ' ' not in value:
+        # A bare date means the end of that day, as in create_task
+        value += 'T23:59:59'
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def validate_record(record):
+    """Normalise one input record into task column values; returns (row, errors)."""
+    errors = []
+
+    title = _first(record, 'title', 'name', 'content')
+    title = str(title).strip() if title is not None else ''
+    if not title:
+        errors.append('title is required')
+    elif len(title) > TITLE_MAX_LENGTH:
+        errors.append(f'title must be at most {TITLE_MAX_LENGTH} characters')
+
+    description = _first(record, 'description', 'desc', 'notes')
+
+    status = str(_first(record, 'status') or 'todo').strip().lower()
+    if status not in STATUS_ALIASES:
+        errors.append(f'unknown status {status!r}')
+    status = STATUS_ALIASES.get(status)
+
+    priority = str(_first(record, 'priority') or 'medium').strip().lower()
+    if priority not in VALID_PRIORITIES:
+        errors.append(f"priority must be one of: {', '.join(VALID_PRIORITIES)}")
+
+    due_date = _first(record, 'due_date', 'due')
+    if due_date is not None:
+        try:
+            due_date = _parse_due_date(due_date)
+        except (ValueError, TypeError):
+            errors.append('due_date must be an ISO 8601 date or datetime')
+
+    estimated_duration = _first(record, 'estimated_duration')
+    if estimated_duration is not None:
+        try:
+            estimated_duration = int(estimated_duration)
+            if estimated_duration < 1:
+                errors.append('estimated_duration must be at least 1 minute')
+        except (ValueError, TypeError):
+            errors.append('estimated_duration must be a valid number')
+
+    project = _first(record, 'project', 'project_name')
+    project = str(project).strip() if project is not None else None
+    if project and len(project) > PROJECT_NAME_MAX_LENGTH:
+        errors.append(f'project must be at most {PROJECT_NAME_MAX_LENGTH} characters')
+
+    if errors:
+        return None, errors
+    return {
+        'title': title,
+        'description': str(description) if description is not None else None,
+        'status': status,
+        'priority': priority,
+        'due_date': due_date,
+        'estimated_duration': estimated_duration,
+        'project': project or None,
+    }, []
+
+
+# --- writing ---
+
+def _uses_copy():
+    """COPY needs PostgreSQL through psycopg2's copy_expert."""
+    return db.engine.dialect.name == 'postgresql' and db.engine.dialect.driver == 'psycopg2'
+
+
+def _copy_rows(table, columns, rows):
+    """Load rows with COPY ... FROM STDIN, the fastest bulk path on PostgreSQL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['' if row[column] is None else row[column] for column in columns])
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+class TaskImporter:
+    """
+    Writes validated rows for one user in batches: one lookup and at most one
+    insert for the projects named in a batch, then one bulk insert for its
+    tasks and one for their project links. Counters are applied once at the end.
+    """
+
+    def __init__(self, user_id, use_copy=None):
+        self.user_id = user_id
+        self.use_copy = _uses_copy() if use_copy is None else use_copy
+        self.project_ids = {}
+        self.projects_created = 0
+        self.imported = 0
+        self.rank = last_rank(user_id, None)
+        self.counter_deltas = TaskCounterDeltas()
+
+    def _resolve_projects(self, names):
+        """Map project names (case-insensitive) to ids, creating the missing ones."""
+        missing = {name.lower(): name for name in names if name.lower() not in self.project_ids}
+        if not missing:
+            return
+
+        existing = db.session.execute(
+            select(Project.id, Project.name).where(
+                Project.user_id == self.user_id,
+                func.lower(Project.name).in_(list(missing))
+            ).order_by(Project.id)
+        )
+        for project_id, name in existing:
+            self.project_ids.setdefault(name.lower(), project_id)
+            missing.pop(name.lower(), None)
+
+        if missing:
+            now = datetime.utcnow()
+            created = db.session.execute(
+                insert(Project).returning(Project.id, Project.name, sort_by_parameter_order=True),
+                [{'name': name, 'user_id': self.user_id, 'status': 'active', 'created_at': now}
+                 for name in missing.values()]
+            )
+            for project_id, name in created:
+                self.project_ids[name.lower()] = project_id
+            self.projects_created += len(missing)
+            invalidate_on_commit(db.session, self.user_id)
+
+    def add_batch(self, rows):
+        if not rows:
+            return
+        self._resolve_projects({row['project'] for row in rows if row['project']})
+
+        now = datetime.utcnow()
+        task_rows = []
+        for row in rows:
+            # New tasks go to the end of the uncategorised column, in file order
+            self.rank = key_between(self.rank, None)
+            task_rows.append({
+                'title': row['title'],
+                'description': row['description'],
+                'status': row['status'],
+                'priority': row['priority'],
+                'due_date': row['due_date'],
+                'estimated_duration': row['estimated_duration'],
+                'completed_at': now if row['status'] == 'completed' else None,
+                'user_id': self.user_id,
+                'position': 0,
+                'rank': self.rank,
+                'created_at': now,
+                'updated_at': now,
+            })
+            self.counter_deltas.add(self.user_id, None, row['status'], 1)
+
+        table = Task.__table__
+        if self.use_copy:
+            # Take the ids from the sequence up front so the links can be copied too
+            ids = db.session.execute(
+                text("SELECT nextval(pg_get_serial_sequence('tasks', 'id')) FROM generate_series(1, :n)"),
+                {'n': len(task_rows)}
+            ).scalars().all()
+            for task_id, task_row in zip(ids, task_rows):
+                task_row['id'] = task_id
+            _copy_rows(table, list(task_rows[0]), task_rows)
+        else:
+            ids = insert_tasks(task_rows)
+
+        links = [
+            {'project_id': self.project_ids[row['project'].lower()], 'task_id': task_id}
+            for row, task_id in zip(rows, ids) if row['project']
+        ]
+        if links:
+            if self.use_copy:
+                _copy_rows(project_task_association, ['project_id', 'task_id'], links)
+            else:
+                db.session.execute(insert(project_task_association), links)
+
+        self.imported += len(task_rows)
+
+    def finish(self):
+        # Core inserts bypass the ORM listener that maintains the counters
+        self.counter_deltas.apply(db.session.connection())
+
+
+def import_tasks(user_id, stream, import_format, dry_run=False):
+    """
+    Validate and insert every task in `stream`, IMPORT_BATCH_SIZE rows at a
+    time. Invalid rows are skipped and reported; the caller commits.
+    Raises ImportFormatError if the upload cannot be read at all.
+    """
+    started = time.perf_counter()
+    importer = None if dry_run else TaskImporter(user_id)
+    records = READERS[import_format](stream)
+
+    total = valid = 0
+    errors = []
+    error_count = 0
+    while True:
+        chunk = list(islice(records, IMPORT_BATCH_SIZE))
+        if not chunk:
+            break
+
+        rows = []
+        for number, record, error in chunk:
+            total += 1
+            row, row_errors = (None, [error]) if error else validate_record(record)
+            if row_errors:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'row': number, 'errors': row_errors})
+            else:
+                rows.append(row)
+
+        valid += len(rows)
+        if importer is not None:
+            importer.add_batch(rows)
+
+    if importer is not None:
+        importer.finish()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'format': import_format,
+        'dry_run': dry_run,
+        'rows': total,
+        'valid': valid,
+        'imported': importer.imported if importer else 0,
+        'projects_created': importer.projects_created if importer else 0,
+        'error_count': error_count,
+        'errors': errors,
+        'errors_truncated': error_count > len(errors),
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'rows_per_second': round(total / elapsed) if elapsed > 0 else None,
+    }
@@ -0,0 +1,154 @@
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+class JobQueue:
+    """
+    Background jobs for work that should not hold a request worker, such as
+    LLM calls. Job state lives in Redis when REDIS_URL is set and
+    JOB_QUEUE_BACKEND is 'redis'; a separate `flask jobs work` process then
+    runs the jobs. Otherwise jobs run on an in-process thread pool, and their
+    status is only visible to the process that queued them.
+    """
+
+    KEY_PREFIX = 'planora:job:'
+    QUEUE_KEY = 'planora:jobs:queue'
+
+    def __init__(self, app=None):
+        self.handlers = {}
+        self.redis = None
+        self.executor = None
+        self.ttl = 86400
+        self._jobs = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.ttl = app.config.get('JOB_TTL', 86400)
+        redis_url = app.config.get('REDIS_URL')
+        if app.config.get('JOB_QUEUE_BACKEND') == 'redis' and redis_url:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(redis_url)
+                self.redis.ping()
+            except Exception as e:
+                logging.warning(f"Redis unavailable at {redis_url}, running jobs in-process. Error: {e}")
+                self.redis = None
+        if self.redis is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=app.config.get('JOB_WORKERS', 2), thread_name_prefix='planora-job')
+        app.extensions['job_queue'] = self
+
+    def handler(self, kind):
+        """Register `fn(payload, report)` as the runner for jobs of `kind`."""
+        def register(fn):
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    # --- job state ---
+    def _save(self, job):
+        if self.redis is not None:
+            self.redis.set(self.KEY_PREFIX + job['id'], json.dumps(job), ex=self.ttl)
+            return
+        with self._lock:
+            self._jobs[job['id']] = job
+
+    def get(self, job_id):
+        if self.redis is not None:
+            raw = self.redis.get(self.KEY_PREFIX + job_id)
+            return json.loads(raw) if raw else None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, **fields):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        self._save(job)
+        return job
+
+    def _prune(self):
+        """Forget finished in-process jobs older than JOB_TTL."""
+        cutoff = (datetime.utcnow() - timedelta(seconds=self.ttl)).isoformat()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['finished_at'] and job['finished_at'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    # --- running ---
+    def enqueue(self, kind, user_id, payload):
+        if kind not in self.handlers:
+            raise ValueError(f'No handler registered for job kind {kind!r}')
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'kind': kind,
+            'user_id': user_id,
+            'payload': payload,
+            'status': 'queued',
+            'progress': 0,
+            'stage': 'queued',
+            'result': None,
+            'error': None,
+            'created_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+        }
+        self._save(job)
+
+        if self.redis is not None:
+            self.redis.rpush(self.QUEUE_KEY, job['id'])
+        else:
+            self._prune()
+            self.executor.submit(self.run, job['id'])
+        return job
+
+    def run(self, job_id):
+        """Run one job inside its own app context and record the outcome."""
+        with self.app.app_context():
+            job = self.update(job_id, status='running', stage='started',
+                              started_at=datetime.utcnow().isoformat())
+            if job is None:
+                return
+
+            def report(progress, stage):
+                self.update(job_id, progress=progress, stage=stage)
+
+            try:
+                result = self.handlers[job['kind']](dict(job['payload'], user_id=job['user_id']), report)
+                self.update(job_id, status='succeeded', progress=100, stage='done', result=result,
+                            finished_at=datetime.utcnow().isoformat())
+            except Exception as e:
+                from ..extensions import db
+                db.session.rollback()
+                logging.error(f"Job {job_id} ({job['kind']}) failed. Error: {e}", exc_info=True)
+                self.update(job_id, status='failed', stage='failed', error=getattr(e, 'public_message', 'The job failed.'),
+                            finished_at=datetime.utcnow().isoformat())
+
+    def work(self, timeout=5, once=False):
+        """Run queued jobs from Redis until interrupted (used by `flask jobs work`)."""
+        if self.redis is None:
+            raise RuntimeError('The Redis job backend is not configured.')
+        while True:
+            item = self.redis.blpop(self.QUEUE_KEY, timeout=timeout)
+            if item is not None:
+                self.run(item[1].decode())
+            if once:
+                return
+
+
+def to_public(job):
+    """The fields of a job that its owner may see."""
+    return {key: job[key] for key in (
+        'id', 'kind', 'status', 'progress', 'stage', 'result', 'error',
+        'created_at', 'started_at', 'finished_at')}
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import re
+import time
+from flask import current_app
+
+DEFAULT_MODEL = 'gemini-1.5-flash'
+
+
+class GeminiClient:
+    """Calls Google Gemini; the SDK is only imported when this client is built."""
+
+    def __init__(self, model_name=DEFAULT_MODEL, api_key=None):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt):
+        return self._model.generate_content(prompt).text
+
+    def stream(self, prompt):
+        """Yield the reply text in chunks as Gemini produces them."""
+        for chunk in self._model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+class FakeLLMClient:
+    """
+    Deterministic local stand-in for tests and benchmarks. `response` is a
+    string or a callable taking the prompt; by default project prompts get a
+    plan derived from the goal and everything else gets an "answer" action.
+    `latency` seconds are slept per call to mimic a real round trip, and
+    stream() additionally sleeps `token_delay` seconds between tokens.
+    """
+
+    def __init__(self, response=None, latency=0.0, token_delay=0.0, model_name='fake'):
+        self.response = response if response is not None else fake_response
+        self.latency = latency
+        self.token_delay = token_delay
+        self.model_name = model_name
+        self.calls = 0
+
+    def _reply(self, prompt):
+        self.calls += 1
+        return self.response(prompt) if callable(self.response) else self.response
+
+    def generate(self, prompt):
+        reply = self._reply(prompt)
+        if self.latency:
+            time.sleep(self.latency)
+        return reply
+
+    def stream(self, prompt):
+        """Yield the reply a few characters at a time, like a tokenizer would."""
+        reply = self._reply(prompt)
+        if self.latency:
+            time.sleep(self.latency)
+        for token in re.findall(r'\s*\S{1,4}', reply):
+            yield token
+            if self.token_delay:
+                time.sleep(self.token_delay)
+
+
+def fake_plan(goal, mini_projects=2, major_projects=1, tasks_per_project=3):
+    """A well-formed project plan whose shape depends only on the goal."""
+    seed = int(hashlib.sha256(goal.encode('utf-8')).hexdigest()[:8], 16)
+
+    def tasks(prefix, first_day):
+        return [{
+            'title': f'{prefix} task {n + 1}',
+            'description': f'Work on {goal}: step {n + 1} of {prefix.lower()}.',
+            'day': first_day + n,
+            'estimated_duration_minutes': 30 + (seed + n) % 6 * 15,
+            'resources': [{'name': 'Reference', 'link': f'https://example.com/{seed % 1000}/{n}'}]
+        } for n in range(tasks_per_project)]
+
+    return {
+        'project_name': f'Roadmap: {goal}'[:255],
+        'project_description': f'A structured plan to {goal}.',
+        'mini_projects': [{
+            'title': f'Mini project {m + 1}',
+            'description': f'Practice for {goal}.',
+            'tasks': tasks(f'Mini project {m + 1}', 1 + m * tasks_per_project)
+        } for m in range(mini_projects)],
+        'major_projects': [{
+            'title': f'Major project {m + 1}',
+            'description': f'Capstone for {goal}.',
+            'tasks': tasks(f'Major project {m + 1}', 1 + (mini_projects + m) * tasks_per_project)
+        } for m in range(major_projects)],
+    }
+
+
+def fake_response(prompt):
+    goal = re.search(r'The user\'s goal is: "(.*)"', prompt)
+    if goal:
+        return json.dumps(fake_plan(goal.group(1)))
+    return json.dumps({'action': 'answer', 'response': 'This is a reply from the local fake model.'})
+
+
+LLM_BACKENDS = {
+    'gemini': lambda config: GeminiClient(config.get('LLM_MODEL', DEFAULT_MODEL), config.get('GEMINI_API_KEY')),
+    'fake': lambda config: FakeLLMClient(latency=config.get('FAKE_LLM_LATENCY', 0.0),
+                                         token_delay=config.get('FAKE_LLM_TOKEN_DELAY', 0.0)),
+}
+
+
+def get_llm_client():
+    """
+    The app's LLM client, built from LLM_BACKEND on first use. Tests and
+    benchmarks can swap it by assigning app.extensions['llm_client'].
+    """
+    client = current_app.extensions.get('llm_client')
+    if client is None:
+        client = LLM_BACKENDS[current_app.config.get('LLM_BACKEND', 'gemini')](current_app.config)
+        current_app.extensions['llm_client'] = client
+    return client
@@ -0,0 +1,70 @@
+# app/services/loaders.py
+from flask import g
+from ..extensions import db
+from ..models.project import Project, project_task_association
+
+
+class ProjectLoader:
+    """
+    Request-scoped batch loader for projects.
+    Resolves every project a listing needs in a single query instead of
+    one Project lookup per row.
+    """
+
+    def __init__(self):
+        self._by_id = {}
+        self._by_task = {}
+
+    def load_many(self, project_ids):
+        """Return a {project_id: Project} dict, fetching missing ids with one IN query."""
+        project_ids = {pid for pid in project_ids if pid}
+        missing = project_ids - self._by_id.keys()
+        if missing:
+            for project in Project.query.filter(Project.id.in_(missing)).all():
+                self._by_id[project.id] = project
+            for pid in missing:
+                self._by_id.setdefault(pid, None)
+        return {pid: self._by_id[pid] for pid in project_ids}
+
+    def load(self, project_id):
+        """Return a single project (or None) through the same cache."""
+        if not project_id:
+            return None
+        return self.load_many([project_id]).get(project_id)
+
+    def load_for_tasks(self, task_ids):
+        """
+        Return a {task_id: Project} dict for the given tasks using one query
+        joined through project_task_association.
+        """
+        task_ids = set(task_ids)
+        missing = task_ids - self._by_task.keys()
+        if missing:
+            rows = db.session.query(project_task_association.c.task_id, Project).join(
+                Project, Project.id == project_task_association.c.project_id
+            ).filter(project_task_association.c.task_id.in_(missing)).all()
+
+            for task_id, project in rows:
+                self._by_id[project.id] = project
+                # A task may belong to several projects; keep the first one seen
+                self._by_task.setdefault(task_id, project)
+            for task_id in missing:
+                self._by_task.setdefault(task_id, None)
+        return {task_id: self._by_task[task_id] for task_id in task_ids}
+
+    def prime(self, project):
+        """Seed the cache with a project that has already been loaded."""
+        if project is not None:
+            self._by_id[project.id] = project
+
+    def prime_task(self, task_id, project):
+        """Record the project a task now belongs to (e.g. after an update)."""
+        self._by_task[task_id] = project
+        self.prime(project)
+
+
+def get_project_loader():
+    """Return the ProjectLoader bound to the current request."""
+    if 'project_loader' not in g:
+        g.project_loader = ProjectLoader()
+    return g.project_loader
@@ -0,0 +1,56 @@
+import threading
+from collections import deque
+
+
+class LatencyMetric:
+    """
+    Count, mean and percentiles of a latency in milliseconds. Percentiles
+    come from the most recent `window` samples. Values are per process.
+    """
+
+    def __init__(self, window=1000):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms):
+        with self._lock:
+            self.count += 1
+            self.total += value_ms
+            self.samples.append(value_ms)
+
+    def _percentile(self, ordered, fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+    def snapshot(self):
+        with self._lock:
+            ordered = sorted(self.samples)
+            count, total = self.count, self.total
+        if not ordered:
+            return {'count': 0}
+        return {
+            'count': count,
+            'mean_ms': round(total / count, 1),
+            'p50_ms': self._percentile(ordered, 0.50),
+            'p95_ms': self._percentile(ordered, 0.95),
+            'max_ms': round(ordered[-1], 1),
+        }
+
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def latency(name):
+    """The process-wide LatencyMetric called `name`, created on first use."""
+    with _metrics_lock:
+        if name not in _metrics:
+            _metrics[name] = LatencyMetric()
+        return _metrics[name]
+
+
+def snapshot(prefix=''):
+    with _metrics_lock:
+        names = sorted(name for name in _metrics if name.startswith(prefix))
+    return {name: _metrics[name].snapshot() for name in names}
@@ -0,0 +1,126 @@
+# app/services/note_search.py
+import re
+from datetime import datetime
+from sqlalchemy import func, literal_column, select
+from ..extensions import db
+from ..models.note import Note
+
+SEARCH_CONFIG = 'english'
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+TITLE_HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, HighlightAll=true'
+PREVIEW_LENGTH = 200
+
+search_vector = literal_column('notes.search_vector')
+
+
+def uses_full_text():
+    """Full-text search needs the PostgreSQL tsvector column; everything else falls back."""
+    return db.engine.dialect.name == 'postgresql'
+
+
+def note_search_filter(text):
+    """WHERE clause matching notes against a search string."""
+    if uses_full_text():
+        return search_vector.op('@@')(func.websearch_to_tsquery(SEARCH_CONFIG, text))
+    term = f"%{text}%"
+    return db.or_(Note.title.ilike(term), Note.content.ilike(term))
+
+
+def search_notes(base_query, text, page=1, per_page=20):
+    """
+    Run a ranked search over `base_query` (already scoped to the user and any
+    filters) and return (rows, has_more). Each row is a dict with the note,
+    its rank and highlighted title/content snippets.
+    """
+    offset = (page - 1) * per_page
+    if uses_full_text():
+        rows = _search_postgres(base_query, text, offset, per_page + 1)
+    else:
+        rows = _search_python(base_query, text, offset, per_page + 1)
+    return rows[:per_page], len(rows) > per_page
+
+
+def _search_postgres(base_query, text, offset, limit):
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+    rank = func.ts_rank(search_vector, tsquery)
+
+    # Rank and paginate on ids first so ts_headline only runs for the page
+    page = base_query.filter(search_vector.op('@@')(tsquery)).with_entities(
+        Note.id.label('id'), rank.label('rank'), Note.updated_at.label('updated_at')
+    ).order_by(rank.desc(), Note.updated_at.desc(), Note.id.desc()).offset(offset).limit(limit).subquery()
+
+    query = db.session.query(
+        Note,
+        page.c.rank,
+        func.ts_headline(SEARCH_CONFIG, func.coalesce(Note.title, ''), tsquery, TITLE_HEADLINE_OPTIONS),
+        func.ts_headline(SEARCH_CONFIG, Note.content, tsquery, HEADLINE_OPTIONS),
+    ).join(page, page.c.id == Note.id).order_by(page.c.rank.desc(), page.c.updated_at.desc(), Note.id.desc())
+
+    return [
+        {'note': note, 'rank': float(rank_value), 'highlighted_title': title, 'content_preview': preview}
+        for note, rank_value, title, preview in query.all()
+    ]
+
+
+def _parse_terms(text):
+    """Split a websearch-style query into (phrases/words to match, words to exclude)."""
+    include, exclude = [], []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', text):
+        term = (phrase or word).strip()
+        if not term or term.lower() == 'or':
+            continue
+        if word and term.startswith('-') and len(term) > 1:
+            exclude.append(term[1:].lower())
+        else:
+            include.append(term.lower())
+    return include, exclude
+
+
+def _highlight(value, pattern):
+    return pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", value) if pattern else value
+
+
+def _search_python(base_query, text, offset, limit):
+    """
+    Pure-Python fallback for databases without tsvector (SQLite in tests).
+    Title hits weigh more than content hits, mirroring the A/B weights used
+    by the PostgreSQL index.
+    """
+    include, exclude = _parse_terms(text)
+    if not include:
+        return []
+    pattern = re.compile('|'.join(re.escape(term) for term in include), re.IGNORECASE)
+
+    # Narrow in SQL on the first term before scoring in Python
+    candidates = base_query.filter(note_search_filter(include[0])).all()
+
+    scored = []
+    for note in candidates:
+        title = (note.title or '').lower()
+        content = (note.content or '').lower()
+        if any(term in title or term in content for term in exclude):
+            continue
+        if not all(term in title or term in content for term in include):
+            continue
+        score = sum(title.count(term) * 1.0 + content.count(term) * 0.4 for term in include)
+        scored.append((score, note))
+
+    scored.sort(key=lambda item: (item[0], item[1].updated_at or datetime.min, item[1].id), reverse=True)
+
+    rows = []
+    for score, note in scored[offset:offset + limit]:
+        content = note.content or ''
+        match = pattern.search(content)
+        start = max(0, match.start() - PREVIEW_LENGTH // 4) if match else 0
+        preview = content[start:start + PREVIEW_LENGTH]
+        if start > 0:
+            preview = "..." + preview
+        if start + PREVIEW_LENGTH < len(content):
+            preview += "..."
+        rows.append({
+            'note': note,
+            'rank': round(score, 4),
+            'highlighted_title': _highlight(note.title or '', pattern),
+            'content_preview': _highlight(preview, pattern),
+        })
+    return rows
@@ -0,0 +1,74 @@
+# app/services/pagination.py
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(sort_by, sort_order, value, row_id):
+    """Pack the last row's sort key into an opaque, URL-safe token."""
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps({'s': sort_by, 'o': sort_order, 'v': value, 'id': row_id},
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort_by, sort_order):
+    """Unpack a cursor and return (value, row_id) for the given sort mode."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload['v']
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+        row_id = int(payload['id'])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Invalid cursor')
+
+    # A cursor is only meaningful for the ordering that produced it
+    if payload.get('s') != sort_by or payload.get('o') != sort_order:
+        raise InvalidCursor('Cursor does not match the requested sort order')
+    return value, row_id
+
+
+def parse_limit(raw_limit):
+    """Clamp the requested page size to [1, MAX_PAGE_SIZE]."""
+    try:
+        limit = int(raw_limit) if raw_limit is not None else DEFAULT_PAGE_SIZE
+    except (ValueError, TypeError):
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_order(sort_expr, id_column, descending):
+    """
+    ORDER BY clause for keyset pagination. NULL sort keys always go last so
+    that the ordering is identical on PostgreSQL and SQLite.
+    """
+    direction = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+    return [sort_expr.is_(None).asc(), direction(sort_expr), direction(id_column)]
+
+
+def keyset_filter(sort_expr, id_column, descending, value, row_id):
+    """WHERE clause selecting the rows strictly after (value, row_id) in keyset_order."""
+    beyond_id = id_column < row_id if descending else id_column > row_id
+
+    if value is None:
+        # Already in the trailing NULL block: only the id tiebreak is left
+        return and_(sort_expr.is_(None), beyond_id)
+
+    beyond_value = sort_expr < value if descending else sort_expr > value
+
+    return or_(
+        and_(sort_expr.isnot(None),
+             or_(beyond_value, and_(sort_expr == value, beyond_id))),
+        sort_expr.is_(None)
+    )
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from .cache import LRUStore
+
+
+# Sentence punctuation dropped from the end of a goal; symbols inside tokens
+# ("c++", "c#", "node.js") are part of the goal and always kept
+TRAILING_PUNCTUATION = re.compile(r'[\s.,;:!?…。、！？]+$')
+
+# Part of every key, so entries stored under an older normalization are never read
+KEY_SCHEME = 'v2'
+
+
+def normalize_goal(goal):
+    """Fold case, width and whitespace and drop trailing punctuation."""
+    text = unicodedata.normalize('NFKC', goal).casefold()
+    return ' '.join(TRAILING_PUNCTUATION.sub('', text).split())
+
+
+class PlanCache:
+    """
+    Content-addressed cache of parsed AI plans, keyed on the normalized goal,
+    the model name and the prompt version, so changing either one misses.
+    Uses Redis when REDIS_URL is configured, otherwise an in-process LRU.
+    Tracks hits, misses and the LLM time that hits avoided.
+    """
+
+    KEY_PREFIX = 'planora:plan:'
+
+    def __init__(self, app=None):
+        self.redis = None
+        self.local = LRUStore()
+        self.ttl = 7 * 86400
+        self.enabled = True
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'errors': 0, 'llm_ms_saved': 0.0}
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('PLAN_CACHE_TTL', 7 * 86400)
+        self.enabled = app.config.get('PLAN_CACHE_ENABLED', True)
+        self.local = LRUStore(app.config.get('PLAN_CACHE_LRU_SIZE', 512))
+        redis_url = app.config.get('REDIS_URL')
+        if redis_url:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+                self.redis.ping()
+            except Exception as e:
+                logging.warning(f"Redis unavailable at {redis_url}, using in-process plan cache. Error: {e}")
+                self.redis = None
+        app.extensions['plan_cache'] = self
+
+    @staticmethod
+    def key(goal, model_name, prompt_version):
+        raw = f'{KEY_SCHEME}\0{prompt_version}\0{model_name}\0{normalize_goal(goal)}'
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+        if self.redis is not None:
+            try:
+                self.redis.hincrbyfloat(self.KEY_PREFIX + 'stats', name, amount)
+            except Exception:
+                pass
+
+    def get(self, goal, model_name, prompt_version):
+        """Return the cached plan for this goal, or None."""
+        if not self.enabled:
+            return None
+        key = self.key(goal, model_name, prompt_version)
+        raw = None
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self.KEY_PREFIX + key)
+            except Exception as e:
+                self._count('errors')
+                logging.warning(f"Redis GET failed for plan {key}. Error: {e}")
+                raw = self.local.get(key)
+        else:
+            raw = self.local.get(key)
+
+        if raw is None:
+            self._count('misses')
+            return None
+        entry = json.loads(raw)
+        self._count('hits')
+        self._count('llm_ms_saved', entry.get('llm_ms') or 0)
+        return entry['plan']
+
+    def set(self, goal, model_name, prompt_version, plan, llm_ms=None):
+        if not self.enabled:
+            return
+        key = self.key(goal, model_name, prompt_version)
+        raw = json.dumps({
+            'plan': plan,
+            'llm_ms': llm_ms,
+            'model': model_name,
+            'prompt_version': prompt_version,
+            'cached_at': datetime.utcnow().isoformat(),
+        })
+        if self.redis is not None:
+            try:
+                self.redis.set(self.KEY_PREFIX + key, raw, ex=self.ttl)
+                self._count('stores')
+                return
+            except Exception as e:
+                self._count('errors')
+                logging.warning(f"Redis SET failed for plan {key}. Error: {e}")
+        self.local.set(key, raw, self.ttl)
+        self._count('stores')
+
+    def get_stats(self):
+        """Counters of this worker and, with Redis, across all workers."""
+        def summarize(counters):
+            lookups = counters.get('hits', 0) + counters.get('misses', 0)
+            return {**counters,
+                    'llm_ms_saved': round(counters.get('llm_ms_saved', 0), 1),
+                    'hit_rate': round(counters.get('hits', 0) / lookups, 4) if lookups else 0}
+
+        with self._stats_lock:
+            local = dict(self.stats)
+        data = {'backend': 'redis' if self.redis is not None else 'memory', 'worker': summarize(local)}
+        if self.redis is not None:
+            try:
+                shared = {k.decode(): float(v) for k, v in self.redis.hgetall(self.KEY_PREFIX + 'stats').items()}
+                data['global'] = summarize(shared)
+            except Exception:
+                pass
+        return data
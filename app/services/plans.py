@@ -0,0 +1,225 @@
+import json
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from ..extensions import db, cache, jobs, plan_cache
+from ..models.project import Project, project_task_association
+from ..models.task_counter import TaskCounterDeltas
+from .bulk import insert_tasks
+from .llm import get_llm_client
+from .ranking import key_between, last_rank
+
+# Bump whenever PROJECT_PROMPT changes, so cached plans from the old prompt miss
+PROMPT_VERSION = 1
+
+PROJECT_PROMPT = """You are an expert mentor and project planner. Your job is to create a structured project roadmap for the user's goal.
+
+The roadmap should be actionable, realistic, and designed to guide the user step by step like a mentor would.
+
+The user's goal is: "{goal}"
+
+Please return the response strictly in clean JSON format. Do not include any extra text outside the JSON block.
+
+The JSON must follow this structure:
+
+{{
+  "project_name": "A concise and professional name for the project",
+  "project_description": "A brief, one-paragraph summary of the project and its significance",
+  "mini_projects": [
+    {{
+      "title": "A well-thought-out mini project name",
+      "description": "A short description of what this mini project covers and why it's important",
+      "tasks": [
+        {{
+          "title": "A clear, actionable task title",
+          "description": "A detailed description of what needs to be done",
+          "day": 1,
+          "estimated_duration_minutes": 90,
+          "resources": [
+            {{
+              "name": "Resource name",
+              "link": "https://..."
+            }}
+          ]
+        }}
+      ]
+    }}
+  ],
+  "major_projects": [
+    {{
+      "title": "A professional major project name",
+      "description": "One-paragraph explanation of what this project involves and what it demonstrates",
+      "tasks": [
+        {{
+          "title": "A clear, mentor-style task title",
+          "description": "A detailed explanation of the task with actionable steps",
+          "day": 20,
+          "estimated_duration_minutes": 180,
+          "resources": [
+            {{
+              "name": "Documentation or guide",
+              "link": "https://..."
+            }},
+            {{
+              "name": "Video tutorial",
+              "link": "https://..."
+            }}
+          ]
+        }}
+      ]
+    }}
+  ]
+}}
+
+Guidelines:
+- Break the roadmap into **mini-projects** (stepping stones for practice) and **major projects** (capstone-style projects).
+- Provide **realistic daily tasks** with estimated time in minutes.
+- Always include at least one **relevant resource link** (documentation, GitHub repo, or video) for each task.
+- Ensure that the roadmap feels like **professional mentorship** — logical progression, building from basics to advanced.
+"""
+
+
+class PlanError(Exception):
+    """The model's reply could not be turned into a project plan."""
+    public_message = 'The AI response could not be turned into a project.'
+
+
+def build_project_prompt(goal):
+    return PROJECT_PROMPT.format(goal=goal)
+
+
+def parse_plan(text):
+    """Parse the model's reply into a plan dict, tolerating ```json fences."""
+    cleaned = text.strip().replace('```json', '').replace('```', '')
+    try:
+        plan = json.loads(cleaned)
+    except ValueError as e:
+        raise PlanError(f'Reply is not valid JSON: {e}')
+    if not isinstance(plan, dict) or not plan.get('project_name'):
+        raise PlanError('Reply has no project_name')
+    return plan
+
+
+# Plan groups and the tag each task of that group carries
+PLAN_GROUPS = (('mini_projects', 'mini_project'), ('major_projects', 'major_project'))
+
+
+def plan_tasks(plan):
+    """Every task of a plan, mini projects first."""
+    all_tasks = []
+    for group, _ in PLAN_GROUPS:
+        for sub_project in plan.get(group) or []:
+            all_tasks.extend(sub_project.get('tasks', []))
+    return all_tasks
+
+
+def _plan_rows(plan):
+    """Yield (task_data, tags) for every task, tagged with where it came from."""
+    for group, kind in PLAN_GROUPS:
+        for sub_project in plan.get(group) or []:
+            for task_data in sub_project.get('tasks', []):
+                yield task_data, {
+                    'source': 'ai_plan',
+                    'group': kind,
+                    'sub_project': sub_project.get('title'),
+                    'day': task_data.get('day', 1),
+                    'resources': task_data.get('resources') or [],
+                }
+
+
+def materialize_plan(user_id, plan):
+    """
+    Create the project and its tasks from a parsed plan; the caller commits.
+    Tasks go in with one multi-row INSERT ... RETURNING id and their project
+    links with one more INSERT, instead of one round trip per row. The
+    mini/major grouping, plan day and resource links are kept in Task.tags.
+    """
+    new_project = Project(
+        name=plan['project_name'],
+        description=plan.get('project_description'),
+        user_id=user_id
+    )
+    db.session.add(new_project)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    today = now.date()
+    rank = last_rank(user_id, None)
+    counter_deltas = TaskCounterDeltas()
+    task_rows = []
+    for task_data, tags in _plan_rows(plan):
+        due_date = today + timedelta(days=task_data.get('day', 1) - 1)
+        # New tasks go to the end of the uncategorised column, in plan order
+        rank = key_between(rank, None)
+        task_rows.append({
+            'title': task_data.get('title'),
+            'description': task_data.get('description', ''),
+            'user_id': user_id,
+            'due_date': datetime.combine(due_date, datetime.min.time()),
+            'status': 'todo',
+            'priority': 'medium',
+            'estimated_duration': task_data.get('estimated_duration_minutes'),
+            'tags': json.dumps(tags),
+            'position': 0,
+            'rank': rank,
+            'created_at': now,
+            'updated_at': now,
+        })
+        counter_deltas.add(user_id, None, 'todo', 1)
+
+    if task_rows:
+        task_ids = insert_tasks(task_rows)
+        db.session.execute(insert(project_task_association), [
+            {'project_id': new_project.id, 'task_id': task_id} for task_id in task_ids
+        ])
+        # Core inserts bypass the ORM listener that maintains the counters
+        counter_deltas.apply(db.session.connection())
+
+    return new_project
+
+
+def _save_plan(user_id, plan, cached):
+    project = materialize_plan(user_id, plan)
+    db.session.commit()
+    cache.invalidate_user(user_id)
+    return {
+        'project_id': project.id,
+        'project_name': project.name,
+        'task_count': len(plan_tasks(plan)),
+        'cached': cached
+    }
+
+
+@jobs.handler('generate_project')
+def generate_project_job(payload, report):
+    """Background job: ask the LLM for a plan and store it as a project."""
+    user_id, goal = payload['user_id'], payload['goal']
+    client = get_llm_client()
+
+    report(10, 'generating')
+    started = time.perf_counter()
+    reply = client.generate(build_project_prompt(goal))
+    llm_ms = (time.perf_counter() - started) * 1000
+
+    report(60, 'parsing')
+    plan = parse_plan(reply)
+    plan_cache.set(goal, client.model_name, PROMPT_VERSION, plan, llm_ms=round(llm_ms, 1))
+
+    report(80, 'saving')
+    return _save_plan(user_id, plan, cached=False)
+
+
+def generate_from_cache(user_id, goal):
+    """
+    Create the project straight from a cached plan for this goal, skipping
+    the LLM. Returns the result, or None when the plan is not cached.
+    """
+    plan = plan_cache.get(goal, get_llm_client().model_name, PROMPT_VERSION)
+    if plan is None:
+        return None
+    return _save_plan(user_id, plan, cached=True)
+
+
+def start_project_generation(user_id, goal):
+    """Queue a generate_project job and return it without waiting for the LLM."""
+    return jobs.enqueue('generate_project', user_id, {'goal': goal})
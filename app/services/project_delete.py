@@ -0,0 +1,58 @@
+from sqlalchemy import delete, update
+from ..extensions import db
+from ..models.focus_session import FocusSession
+from ..models.note import Note
+from ..models.project import Project, project_task_association
+from ..models.task import Task
+from ..models.task_time import TaskTimeRollup
+
+
+def detach_subtasks(parent_ids, keep_ids=None):
+    """Subtasks of deleted tasks become top-level tasks, as with ON DELETE SET NULL."""
+    condition = Task.parent_task_id.in_(parent_ids)
+    if keep_ids is not None:
+        condition = condition & Task.id.not_in(keep_ids)
+    db.session.execute(
+        update(Task).where(condition).values(parent_task_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_tasks(task_ids):
+    """
+    Remove the tasks in `task_ids` (a SELECT or a list of ids) with their
+    focus sessions, time rollups and project links, in a fixed number of
+    set-based statements. Task counters are left to the caller.
+    Returns the number of rows removed per table.
+    """
+    # Explicit where the foreign keys do not cascade (SQLite)
+    detach_subtasks(task_ids)
+    sessions = db.session.execute(
+        delete(FocusSession).where(FocusSession.task_id.in_(task_ids))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    rollups = db.session.execute(
+        delete(TaskTimeRollup).where(TaskTimeRollup.task_id.in_(task_ids))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    tasks = db.session.execute(
+        delete(Task).where(Task.id.in_(task_ids)).execution_options(synchronize_session=False)
+    ).rowcount
+    # Last, as the links may be what selects `task_ids`; ON DELETE CASCADE
+    # has already removed them where the foreign keys enforce it
+    db.session.execute(
+        delete(project_task_association).where(project_task_association.c.task_id.in_(task_ids)))
+    return {'tasks': tasks, 'focus_sessions': sessions, 'task_time_rollups': rollups}
+
+
+def delete_projects(project_ids):
+    """Remove the projects in `project_ids` with their notes and task links."""
+    db.session.execute(
+        delete(project_task_association).where(project_task_association.c.project_id.in_(project_ids)))
+    notes = db.session.execute(
+        delete(Note).where(Note.project_id.in_(project_ids)).execution_options(synchronize_session=False)
+    ).rowcount
+    projects = db.session.execute(
+        delete(Project).where(Project.id.in_(project_ids)).execution_options(synchronize_session=False)
+    ).rowcount
+    return {'notes': notes, 'projects': projects}
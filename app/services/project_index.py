@@ -0,0 +1,193 @@
+import json
+import logging
+import re
+import unicodedata
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from .cache import LRUStore
+
+# Below this similarity a project name is not considered a match
+MIN_SIMILARITY = 0.3
+# The best match must beat the runner-up by this much, unless it is exact
+MIN_MARGIN = 0.1
+
+
+def _normalize(text):
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+
+def _trigrams(text):
+    """Trigrams of each word padded like pg_trgm does ("  w", " wo", ..., "rd ")."""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(query, name):
+    """
+    Similarity in [0, 1] of two project names: the better of trigram overlap
+    (tolerates typos and partial words) and token overlap (tolerates word order).
+    """
+    query, name = _normalize(query), _normalize(name)
+    if not query or not name:
+        return 0.0
+    if query == name:
+        return 1.0
+    query_grams, name_grams = _trigrams(query), _trigrams(name)
+    trigram = len(query_grams & name_grams) / len(query_grams | name_grams)
+    query_tokens, name_tokens = set(query.split()), set(name.split())
+    token = len(query_tokens & name_tokens) / len(query_tokens | name_tokens)
+    return max(trigram, token)
+
+
+class ProjectNameIndex:
+    """A user's project ids and names, as used by the chat agent."""
+
+    def __init__(self, entries):
+        self.entries = entries  # [(id, name), ...] ordered by name
+
+    def prompt_list(self):
+        if not self.entries:
+            return "No projects yet."
+        return "\n".join(f"- {name} (ID: {project_id})" for project_id, name in self.entries)
+
+    def match(self, project_name):
+        """
+        Return (project_id, candidates). project_id is the single best match,
+        or None when nothing is similar enough or the top names are too close
+        to call; candidates then lists the closest names.
+        """
+        scored = sorted(
+            ((similarity(project_name or '', name), project_id, name) for project_id, name in self.entries),
+            reverse=True
+        )
+        scored = [item for item in scored if item[0] >= MIN_SIMILARITY]
+        if not scored:
+            return None, []
+        best = scored[0]
+        if best[0] == 1.0 or len(scored) == 1 or best[0] - scored[1][0] >= MIN_MARGIN:
+            return best[1], [best[2]]
+        return None, [name for _, _, name in scored[:3]]
+
+
+class ProjectIndexStore:
+    """
+    Per-user ProjectNameIndex, built with one query and kept until a project
+    of that user is created, renamed or deleted. Lives in Redis when
+    REDIS_URL is set so every worker sees an invalidation; otherwise in an
+    in-process LRU, where PROJECT_INDEX_TTL bounds how stale another
+    worker's copy can get.
+    """
+
+    KEY_PREFIX = 'planora:project_index:'
+
+    def __init__(self, app=None):
+        self.redis = None
+        self.local = LRUStore()
+        self.ttl = 300
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('PROJECT_INDEX_TTL', 300)
+        self.local = LRUStore(app.config.get('PROJECT_INDEX_LRU_SIZE', 1024))
+        redis_url = app.config.get('REDIS_URL')
+        if redis_url:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+                self.redis.ping()
+            except Exception as e:
+                logging.warning(f"Redis unavailable at {redis_url}, using in-process project index. Error: {e}")
+                self.redis = None
+        app.extensions['project_index'] = self
+
+    def _load(self, user_id):
+        from ..extensions import db
+        from ..models.project import Project
+        rows = db.session.execute(
+            select(Project.id, Project.name).where(Project.user_id == user_id).order_by(Project.name)
+        ).all()
+        return [(project_id, name) for project_id, name in rows]
+
+    def get(self, user_id):
+        key = f'{user_id}'
+        raw = None
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self.KEY_PREFIX + key)
+            except Exception as e:
+                logging.warning(f"Redis GET failed for project index {key}. Error: {e}")
+        else:
+            raw = self.local.get(key)
+        if raw is not None:
+            return ProjectNameIndex([tuple(entry) for entry in json.loads(raw)])
+
+        entries = self._load(user_id)
+        raw = json.dumps(entries)
+        if self.redis is not None:
+            try:
+                self.redis.set(self.KEY_PREFIX + key, raw, ex=self.ttl)
+            except Exception as e:
+                logging.warning(f"Redis SET failed for project index {key}. Error: {e}")
+        else:
+            self.local.set(key, raw, self.ttl)
+        return ProjectNameIndex(entries)
+
+    def invalidate(self, user_id):
+        key = f'{user_id}'
+        if self.redis is not None:
+            try:
+                self.redis.delete(self.KEY_PREFIX + key)
+            except Exception as e:
+                logging.warning(f"Redis DEL failed for project index {key}. Error: {e}")
+        self.local.delete(key)
+
+
+def _store():
+    from flask import current_app
+    return current_app.extensions.get('project_index')
+
+
+def invalidate_project_index(user_id):
+    store = _store()
+    if store is not None:
+        store.invalidate(user_id)
+
+
+def invalidate_on_commit(session, user_id):
+    """
+    Drop the user's project index once `session` commits. ORM changes to
+    projects are picked up automatically; bulk Core writes call this.
+    """
+    session.info.setdefault('project_index_users', set()).add(user_id)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_project_changes(session, flush_context):
+    """Remember whose project list changed; the index is dropped after commit."""
+    from ..models.project import Project
+    changed = session.info.setdefault('project_index_users', set())
+    for obj in session.new:
+        if isinstance(obj, Project):
+            changed.add(obj.user_id)
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            changed.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, Project) and session.is_modified(obj, include_collections=False):
+            changed.add(obj.user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_project_indexes(session):
+    for user_id in session.info.pop('project_index_users', ()):
+        invalidate_project_index(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_project_changes(session):
+    session.info.pop('project_index_users', None)
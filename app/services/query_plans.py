@@ -0,0 +1,179 @@
+# app/services/query_plans.py
+import re
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, insert
+from ..extensions import db
+from ..models.user import User
+from ..models.category import Category
+from ..models.task import Task
+from ..models.note import Note
+from ..models.project import Project, project_task_association
+from ..models.focus_session import FocusSession
+from ..models.task_time import TaskTimeRollup
+from .counters import rebuild_task_counters
+from .focus_sessions import reap_orphaned_sessions
+from .tombstones import purge_tombstones
+
+# Seed size: every user gets this many tasks, notes and focus sessions, so that
+# per-user filters are selective enough for the planner to prefer an index
+PLAN_USERS = 20
+PLAN_ROWS = 500
+
+# Endpoints whose SQL is checked; {category_id} and {project_id} come from the seed
+ENDPOINTS = [
+    ('GET /api/tasks', '/api/tasks'),
+    ('GET /api/tasks?status=', '/api/tasks?status=todo'),
+    ('GET /api/tasks?sort_by=due_date', '/api/tasks?sort_by=due_date&sort_order=asc'),
+    ('GET /api/tasks?sort_by=rank', '/api/tasks?sort_by=rank&sort_order=asc&category_id={category_id}'),
+    ('GET /api/tasks/estimation-accuracy', '/api/tasks/estimation-accuracy?days=30'),
+    ('GET /api/notes', '/api/notes'),
+    ('GET /api/notes?project_id=', '/api/notes?project_id={project_id}'),
+    ('GET /api/dashboard/data', '/api/dashboard/data'),
+    ('GET /api/focus_sessions/analytics', '/api/focus_sessions/analytics?days=30'),
+]
+
+# A plan line that reads a whole table
+FULL_SCANS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)$', re.MULTILINE),  # "SCAN tasks USING INDEX ..." is fine
+}
+
+
+def seed_plan_data(users=PLAN_USERS, rows=PLAN_ROWS):
+    """
+    Fill an empty database with `users` users of `rows` tasks, notes and
+    focus sessions each, inserted with Core for speed. A tenth of the tasks
+    are soft-deleted. Returns the ids the endpoints are called with.
+    """
+    now = datetime.utcnow()
+    connection = db.session.connection()
+    user_ids = connection.execute(insert(User).returning(User.id), [
+        {'username': f'plan{u}', 'email': f'plan{u}@example.com'} for u in range(users)
+    ]).scalars().all()
+    category_ids = connection.execute(insert(Category).returning(Category.id), [
+        {'name': f'Category {c}', 'user_id': user_id} for user_id in user_ids for c in range(5)
+    ]).scalars().all()
+    project_ids = connection.execute(insert(Project).returning(Project.id), [
+        {'name': f'Project {p}', 'user_id': user_id, 'status': 'active' if p % 2 else 'completed',
+         'created_at': now - timedelta(days=p)}
+        for user_id in user_ids for p in range(10)
+    ]).scalars().all()
+
+    task_rows = []
+    for u, user_id in enumerate(user_ids):
+        for t in range(rows):
+            task_rows.append({
+                'title': f'Task {t}',
+                'user_id': user_id,
+                'category_id': category_ids[u * 5 + t % 5],
+                'status': ('todo', 'in_progress', 'completed')[t % 3],
+                'rank': f'a{t:06d}',
+                'created_at': now - timedelta(hours=t),
+                'due_date': now + timedelta(days=t % 60 - 30),
+                'estimated_duration': 30 + t % 90,
+                'deleted_at': now - timedelta(days=2) if t % 10 == 9 else None,
+            })
+    task_ids = connection.execute(insert(Task).returning(Task.id), task_rows).scalars().all()
+
+    connection.execute(insert(project_task_association), [
+        {'project_id': project_ids[(i // rows) * 10 + i % 10], 'task_id': task_id}
+        for i, task_id in enumerate(task_ids)
+    ])
+    connection.execute(insert(Note), [
+        {'title': f'Note {n}', 'content': f'note {n} body', 'user_id': user_id,
+         'project_id': project_ids[u * 10 + n % 10], 'updated_at': now - timedelta(hours=n)}
+        for u, user_id in enumerate(user_ids) for n in range(rows)
+    ])
+    connection.execute(insert(FocusSession), [
+        {'user_id': user_ids[i // rows], 'task_id': task_id, 'duration': 25, 'session_type': 'pomodoro',
+         'started_at': now - timedelta(hours=7 * (i % rows)),
+         'ended_at': now - timedelta(hours=7 * (i % rows)) + timedelta(minutes=25)}
+        for i, task_id in enumerate(task_ids)
+    ])
+    connection.execute(insert(TaskTimeRollup), [
+        {'task_id': task_id, 'day': (now - timedelta(hours=7 * (i % rows))).date(), 'minutes': 25, 'sessions': 1}
+        for i, task_id in enumerate(task_ids)
+    ])
+    db.session.commit()
+    rebuild_task_counters()
+
+    # Fresh statistics, as autovacuum would have gathered on a live database
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    return {'user_id': user_ids[0], 'category_id': category_ids[0], 'project_id': project_ids[0]}
+
+
+class _Recorder:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+
+def capture_endpoint_sql(app, ids):
+    """
+    Call every endpoint through the test client and return
+    {name: [(sql, params), ...]} with each distinct SELECT it sent.
+    The purger and the session reaper run last, to capture their queries too.
+    """
+    with app.app_context():
+        engine = db.engine
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(ids['user_id']))}"}
+    client = app.test_client()
+
+    captured = {}
+    calls = [(name, lambda path=path: client.get(path.format(**ids), headers=headers)) for name, path in ENDPOINTS]
+    calls.append(('flask purge run', lambda: purge_tombstones(older_than=timedelta(hours=1), sleep=0, max_batches=1)))
+    calls.append(('flask timers reap', lambda: reap_orphaned_sessions(force=True)))
+    for name, call in calls:
+        recorder = _Recorder()
+        event.listen(engine, 'before_cursor_execute', recorder)
+        try:
+            with app.app_context():
+                response = call()
+        finally:
+            event.remove(engine, 'before_cursor_execute', recorder)
+        if getattr(response, 'status_code', 200) != 200:
+            raise RuntimeError(f'{name} returned {response.status_code}: {response.get_data(as_text=True)}')
+
+        selects = {}
+        for statement, params in recorder.statements:
+            if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+                selects.setdefault(statement, params)
+        captured[name] = list(selects.items())
+    return captured
+
+
+def explain(connection, statement, params):
+    """Return the plan of a captured statement as a single string."""
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = connection.exec_driver_sql(prefix + statement, params).fetchall()
+    return '\n'.join(' '.join(str(col) for col in row) for row in rows)
+
+
+def check_query_plans(app, users=PLAN_USERS, rows=PLAN_ROWS):
+    """
+    Seed the app's (empty, throwaway) database, capture the SQL the
+    endpoints emit, and EXPLAIN every statement with the planner's own
+    choices. Returns a list of (endpoint, sql, full_scans, plan), where
+    full_scans names the tables read without an index.
+    """
+    with app.app_context():
+        db.create_all()
+        ids = seed_plan_data(users, rows)
+
+    captured = capture_endpoint_sql(app, ids)
+
+    results = []
+    with app.app_context():
+        with db.engine.connect() as connection:
+            pattern = FULL_SCANS.get(connection.dialect.name, FULL_SCANS['postgresql'])
+            tables = set(db.metadata.tables)
+            for name, statements in captured.items():
+                for statement, params in statements:
+                    plan = explain(connection, statement, params)
+                    full_scans = sorted({table for table in pattern.findall(plan) if table in tables})
+                    results.append((name, statement, full_scans, plan))
+    return results
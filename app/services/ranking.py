@@ -0,0 +1,168 @@
+# app/services/ranking.py
+"""
+Fractional ordering keys for tasks.
+
+A rank is a base-36 fraction written without the leading "0." (so "h" sits
+between "" and "z", and "h8" between "h" and "i"). Keys compare correctly as
+plain strings, so a task can always be moved between two neighbours by
+writing one new key on that task alone. Only lowercase letters and digits
+are used, so the order is the same under any database collation.
+"""
+import logging
+import threading
+from flask import current_app
+from sqlalchemy import bindparam
+from ..extensions import db
+from ..models.task import Task
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Digits used when stepping past the first/last key of a column
+STEP_LENGTH = 3
+# Keys longer than this trigger a background rebalance of their column
+REBALANCE_LENGTH = 24
+# Column size; a key that would not fit forces an immediate rebalance
+MAX_LENGTH = 255
+
+
+def _midpoint(low, high):
+    """Key strictly between `low` ('' = start) and `high` (None = end)."""
+    if high is not None:
+        # Skip the common prefix and recurse on what is left
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else '0') == high[n]:
+            n += 1
+        if n > 0:
+            return high[:n] + _midpoint(low[n:], high[n:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def _to_int(key, length):
+    value = 0
+    for char in key.ljust(length, '0'):
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def _from_int(value, length):
+    digits = []
+    for _ in range(length):
+        value, remainder = divmod(value, BASE)
+        digits.append(DIGITS[remainder])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def _increment(key):
+    """
+    Small step after `key`, counting at STEP_LENGTH digits so that repeated
+    appends keep keys short instead of creeping towards "zzz...".
+    """
+    length = max(len(key), STEP_LENGTH)
+    value = _to_int(key, length) + 1
+    if value >= BASE ** length:
+        return key + '1'
+    return _from_int(value, length)
+
+
+def _decrement(key):
+    """
+    Small step before `key`; the mirror image of _increment. Near the start
+    of the key space there is no room for a step, so halve the distance to
+    the start instead, adding a digit every few moves.
+    """
+    length = max(len(key), STEP_LENGTH)
+    value = _to_int(key, length) - 1
+    if value < 1:
+        return _midpoint('', key)
+    return _from_int(value, length)
+
+
+def key_between(before, after):
+    """
+    Return a rank that sorts after `before` and before `after`.
+    Either side may be None to mean the start/end of the list.
+    """
+    for key in (before, after):
+        if key is not None and (not key or key.endswith('0') or key.strip(DIGITS)):
+            raise ValueError(f'Invalid rank {key!r}')
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f'Rank {before!r} is not before {after!r}')
+
+    if before is None and after is None:
+        return 'i'
+    if after is None:
+        return _increment(before)
+    if before is None:
+        return _decrement(after)
+    return _midpoint(before, after)
+
+
+def evenly_spaced_keys(count):
+    """`count` ascending keys spread evenly over the key space."""
+    length = 1
+    while BASE ** length <= count:
+        length += 1
+    length += 1  # leave room between neighbours for future moves
+
+    span = BASE ** length
+    return [_from_int(i * span // (count + 1), length) for i in range(1, count + 1)]
+
+
+def column_query(user_id, category_id):
+    """Tasks of one board column, in rank order."""
+    query = Task.query.filter(Task.user_id == user_id)
+    if category_id is None:
+        query = query.filter(Task.category_id.is_(None))
+    else:
+        query = query.filter(Task.category_id == category_id)
+    return query
+
+
+def last_rank(user_id, category_id):
+    """Highest rank in a column (served by the (user_id, category_id, rank) index)."""
+    row = column_query(user_id, category_id).filter(Task.rank.isnot(None)).with_entities(
+        Task.rank).order_by(Task.rank.desc()).first()
+    return row[0] if row else None
+
+
+def rebalance_column(user_id, category_id):
+    """
+    Rewrite every rank in a column with evenly spaced keys, keeping the
+    current order. Tasks without a rank go last, ordered by position and age.
+    """
+    rows = column_query(user_id, category_id).with_entities(Task.id).order_by(
+        Task.rank.is_(None), Task.rank, Task.position, Task.created_at, Task.id).all()
+    if not rows:
+        return 0
+
+    table = Task.__table__
+    db.session.execute(
+        table.update().where(table.c.id == bindparam('b_id')).values(rank=bindparam('b_rank')),
+        [{'b_id': row.id, 'b_rank': key} for row, key in zip(rows, evenly_spaced_keys(len(rows)))]
+    )
+    db.session.commit()
+    return len(rows)
+
+
+def rebalance_in_background(user_id, category_id):
+    """Rebalance a column off the request thread."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                rebalance_column(user_id, category_id)
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"Rank rebalance failed for user {user_id}, category {category_id}. Error: {e}",
+                              exc_info=True)
+
+    threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,81 @@
+# app/services/stats.py
+from datetime import datetime, timedelta
+from sqlalchemy import case, func
+from ..extensions import db
+from ..models.task import Task
+from ..models.task_counter import CANCELLED_STATUSES
+from ..models.project import project_task_association
+
+
+def _count_where(condition):
+    """
+    Conditional COUNT: `COUNT(*) FILTER (WHERE ...)` on PostgreSQL, and the
+    portable `SUM(CASE WHEN ... THEN 1 ELSE 0 END)` everywhere else.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return func.count().filter(condition)
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def compute_task_stats(user_id, now=None):
+    """
+    Compute every task counter used by the stats and dashboard endpoints with
+    a single aggregate query, so the Python cost does not grow with the number
+    of tasks a user has.
+    """
+    now = now or datetime.now()
+    today_start = datetime.combine(now.date(), datetime.min.time())
+    tomorrow_start = today_start + timedelta(days=1)
+    week_end = today_start + timedelta(days=8)  # due_date.date() <= today + 7 days
+    # Cancelled tasks are closed too: never overdue, and not left to do
+    still_open = Task.status.not_in(('completed',) + CANCELLED_STATUSES)
+
+    counters = {
+        'total': func.count(Task.id),
+        'completed': _count_where(Task.status == 'completed'),
+        'in_progress': _count_where(Task.status == 'in-progress'),
+        'cancelled': _count_where(Task.status.in_(CANCELLED_STATUSES)),
+        'high_priority': _count_where(Task.priority == 'high'),
+        'medium_priority': _count_where(Task.priority == 'medium'),
+        'low_priority': _count_where(Task.priority == 'low'),
+        'overdue': _count_where(db.and_(Task.due_date < now, still_open)),
+        'due_today': _count_where(db.and_(Task.due_date >= today_start, Task.due_date < tomorrow_start)),
+        'due_this_week': _count_where(db.and_(Task.due_date >= today_start, Task.due_date < week_end)),
+        'completed_this_week': _count_where(Task.completed_at >= now - timedelta(days=7)),
+    }
+
+    row = db.session.query(*(expr.label(name) for name, expr in counters.items())).filter(
+        Task.user_id == user_id).one()
+
+    stats = {name: int(getattr(row, name) or 0) for name in counters}
+    stats['todo'] = stats['total'] - stats['completed'] - stats['in_progress'] - stats['cancelled']
+    return stats
+
+
+def compute_project_progress(project_ids):
+    """
+    Task count, completed count and percent for each project, from one query
+    grouped over project_task_association. Returns {project_id: {...}};
+    projects without tasks are included with zero counts.
+    """
+    project_ids = list(project_ids)
+    progress = {pid: {'task_count': 0, 'completed_count': 0, 'progress': 0} for pid in project_ids}
+    if not project_ids:
+        return progress
+
+    link = project_task_association
+    rows = db.session.query(
+        link.c.project_id,
+        func.count(Task.id),
+        func.coalesce(func.sum(case((Task.status == 'completed', 1), else_=0)), 0)
+    ).join(Task, Task.id == link.c.task_id).filter(
+        link.c.project_id.in_(project_ids)
+    ).group_by(link.c.project_id)
+
+    for project_id, task_count, completed_count in rows:
+        progress[project_id] = {
+            'task_count': task_count,
+            'completed_count': int(completed_count),
+            'progress': int((completed_count / task_count) * 100) if task_count else 0
+        }
+    return progress
@@ -0,0 +1,110 @@
+# app/services/task_tree.py
+from sqlalchemy import case, func, literal
+from ..extensions import db
+from ..models.task import Task
+
+DEFAULT_MAX_DEPTH = 10
+MAX_DEPTH_LIMIT = 50
+
+
+class TaskNode:
+    """A task with its loaded children and precomputed progress."""
+
+    def __init__(self, task, depth):
+        self.task = task
+        self.depth = depth
+        self.children = []
+        self.progress = 0
+
+    def to_dict(self, max_depth=None):
+        data = self.task.to_dict(progress=self.progress)
+        data['depth'] = self.depth
+        if max_depth is None or self.depth < max_depth:
+            data['subtasks'] = [child.to_dict(max_depth) for child in self.children]
+        else:
+            # Children were loaded only to compute progress; report how many exist
+            data['subtasks'] = []
+            data['truncated_subtasks'] = len(self.children)
+        return data
+
+
+def _progress(task, children):
+    """Same rule as Task.get_progress_percentage(), without touching the relationship."""
+    if not children:
+        return 100 if task.status == 'completed' else 0
+    completed = sum(1 for child in children if child.task.status == 'completed')
+    return (completed / len(children)) * 100
+
+
+def load_task_tree(user_id, root_ids=None, max_depth=DEFAULT_MAX_DEPTH):
+    """
+    Load whole task hierarchies with one WITH RECURSIVE query.
+    Without root_ids every top-level task of the user is a root. Returns the
+    list of root TaskNodes with progress computed bottom-up for every node.
+    """
+    max_depth = max(0, min(max_depth, MAX_DEPTH_LIMIT))
+
+    if root_ids is None:
+        anchor_filter = Task.parent_task_id.is_(None)
+    else:
+        anchor_filter = Task.id.in_(root_ids)
+
+    tree = db.session.query(Task.id.label('id'), literal(0).label('depth')).filter(
+        Task.user_id == user_id, anchor_filter).cte('task_tree', recursive=True)
+
+    # Go one level past max_depth so the deepest returned nodes still get correct progress
+    tree = tree.union_all(
+        db.session.query(Task.id, tree.c.depth + 1).join(
+            tree, Task.parent_task_id == tree.c.id
+        ).filter(Task.user_id == user_id, tree.c.depth < max_depth + 1)
+    )
+
+    rows = db.session.query(Task, tree.c.depth).join(tree, tree.c.id == Task.id).order_by(
+        tree.c.depth, Task.rank.is_(None), Task.rank, Task.id).all()
+
+    nodes = {}
+    for task, depth in rows:
+        # A task can be reached once per path; keep the shallowest occurrence
+        if task.id not in nodes:
+            nodes[task.id] = TaskNode(task, depth)
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node.task.parent_task_id)
+        if parent is not None and parent.depth < node.depth:
+            parent.children.append(node)
+        else:
+            roots.append(node)
+
+    # Deepest nodes first, so every child is done before its parent
+    for node in sorted(nodes.values(), key=lambda n: n.depth, reverse=True):
+        node.progress = _progress(node.task, node.children)
+
+    return roots
+
+
+def progress_for_tasks(tasks):
+    """
+    {task_id: progress_percentage} for a flat list of tasks, from one grouped
+    query over their direct subtasks instead of one lazy load per task.
+    """
+    task_ids = [t.id for t in tasks]
+    counts = {}
+    if task_ids:
+        counts = {
+            parent_id: (total, int(completed or 0))
+            for parent_id, total, completed in db.session.query(
+                Task.parent_task_id,
+                func.count(Task.id),
+                func.sum(case((Task.status == 'completed', 1), else_=0))
+            ).filter(Task.parent_task_id.in_(task_ids)).group_by(Task.parent_task_id)
+        }
+
+    progress = {}
+    for task in tasks:
+        total, completed = counts.get(task.id, (0, 0))
+        if total:
+            progress[task.id] = (completed / total) * 100
+        else:
+            progress[task.id] = 100 if task.status == 'completed' else 0
+    return progress
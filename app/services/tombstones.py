@@ -0,0 +1,104 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select, update
+from ..extensions import db
+from ..models.note import Note
+from ..models.project import Project, project_task_association
+from ..models.task import Task
+from ..models.task_counter import TaskCounterDeltas
+from .project_delete import delete_projects, delete_tasks, detach_subtasks
+from .project_index import invalidate_on_commit
+
+PURGE_BATCH_SIZE = 500
+PURGE_SLEEP = 0.5
+PURGE_AFTER = timedelta(hours=24)
+
+
+def soft_delete_task(task):
+    """Tombstone one task; the caller commits."""
+    detach_subtasks([task.id])
+    task.soft_delete()
+
+
+def soft_delete_project(user_id, project_id):
+    """
+    Tombstone a project together with its tasks and notes, one set-based
+    UPDATE per table. The caller has checked ownership and commits.
+    Returns the number of rows deleted per table.
+    """
+    now = datetime.utcnow()
+    task_ids = select(project_task_association.c.task_id).where(
+        project_task_association.c.project_id == project_id)
+
+    counter_deltas = TaskCounterDeltas()
+    grouped = db.session.execute(
+        select(Task.category_id, Task.status, func.count())
+        .where(Task.id.in_(task_ids))
+        .group_by(Task.category_id, Task.status)
+    )
+    for category_id, status, count in grouped:
+        counter_deltas.add(user_id, category_id, status, -count)
+
+    detach_subtasks(task_ids, keep_ids=task_ids)
+    tasks = db.session.execute(
+        update(Task).where(Task.id.in_(task_ids), Task.deleted_at.is_(None))
+        .values(deleted_at=now).execution_options(synchronize_session=False)
+    ).rowcount
+    notes = db.session.execute(
+        update(Note).where(Note.project_id == project_id, Note.deleted_at.is_(None))
+        .values(deleted_at=now).execution_options(synchronize_session=False)
+    ).rowcount
+    projects = db.session.execute(
+        update(Project).where(Project.id == project_id, Project.user_id == user_id, Project.deleted_at.is_(None))
+        .values(deleted_at=now).execution_options(synchronize_session=False)
+    ).rowcount
+
+    counter_deltas.apply(db.session.connection())
+    invalidate_on_commit(db.session, user_id)
+    return {'tasks': tasks, 'notes': notes, 'projects': projects}
+
+
+def _tombstoned_ids(model, cutoff, batch_size):
+    return db.session.execute(
+        select(model.id).where(model.deleted_at < cutoff).order_by(model.deleted_at).limit(batch_size),
+        execution_options={'include_deleted': True}
+    ).scalars().all()
+
+
+def _purge_notes(ids):
+    notes = db.session.execute(
+        delete(Note).where(Note.id.in_(ids)).execution_options(synchronize_session=False)
+    ).rowcount
+    return {'notes': notes}
+
+
+# Tasks and notes first, so a purged project has little left to cascade to
+PURGE_ORDER = ((Task, delete_tasks), (Note, _purge_notes), (Project, delete_projects))
+
+
+def purge_tombstones(older_than=PURGE_AFTER, batch_size=PURGE_BATCH_SIZE, sleep=PURGE_SLEEP, max_batches=None):
+    """
+    Physically delete rows tombstoned more than `older_than` ago, at most
+    `batch_size` rows per transaction, pausing `sleep` seconds between
+    batches so autovacuum and replicas keep up. Stops after `max_batches`
+    batches if given. Returns the number of rows removed per table.
+    """
+    cutoff = datetime.utcnow() - older_than
+    removed = {'tasks': 0, 'focus_sessions': 0, 'task_time_rollups': 0, 'notes': 0, 'projects': 0}
+    batches = 0
+
+    for model, purge in PURGE_ORDER:
+        while max_batches is None or batches < max_batches:
+            ids = _tombstoned_ids(model, cutoff, batch_size)
+            if not ids:
+                break
+            if batches and sleep:
+                time.sleep(sleep)
+            for name, count in purge(ids).items():
+                removed[name] += count
+            db.session.commit()
+            batches += 1
+            logging.info(f"Purged {len(ids)} {model.__tablename__} row(s).")
+
+    return {'batches': batches, 'removed': removed}
@@ -0,0 +1,59 @@
+"""cascade deletes from projects and tasks to their dependents
+
+Revision ID: 4b9d3e7a2f16
+Revises: e28c4b9f0a17
+Create Date: 2025-09-27 11:04:52.603917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b9d3e7a2f16'
+down_revision = 'e28c4b9f0a17'
+branch_labels = None
+depends_on = None
+
+# (table, constraint name, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = [
+    ('project_task_association', 'project_task_association_project_id_fkey', 'project_id', 'projects', 'CASCADE'),
+    ('project_task_association', 'project_task_association_task_id_fkey', 'task_id', 'tasks', 'CASCADE'),
+    ('focus_sessions', 'focus_sessions_task_id_fkey', 'task_id', 'tasks', 'CASCADE'),
+    ('notes', 'notes_project_id_fkey', 'project_id', 'projects', 'CASCADE'),
+    ('tasks', 'tasks_parent_task_id_fkey', 'parent_task_id', 'tasks', 'SET NULL'),
+]
+
+
+def _replace_foreign_keys(with_action):
+    # NOT VALID skips the full-table check, so the ACCESS EXCLUSIVE lock of the
+    # ALTER is held only briefly, until the migration transaction commits
+    for table, name, column, referenced, action in FOREIGN_KEYS:
+        on_delete = f' ON DELETE {action}' if with_action else ''
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, '
+                   f'ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referenced} (id){on_delete} NOT VALID')
+
+    # The check itself runs afterwards, one constraint per transaction. VALIDATE
+    # only takes SHARE UPDATE EXCLUSIVE, so reads and writes continue meanwhile
+    with op.get_context().autocommit_block():
+        for table, name, _, _, _ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # SET NULL on parent_task_id looks up the subtasks of every deleted task
+        with op.get_context().autocommit_block():
+            op.create_index('ix_tasks_parent_task_id', 'tasks', ['parent_task_id'],
+                            postgresql_concurrently=True, if_not_exists=True)
+        _replace_foreign_keys(with_action=True)
+    else:
+        # SQLite does not enforce foreign keys by default; the set-based deletes
+        # in app/services/project_delete.py clean up explicitly there
+        op.create_index('ix_tasks_parent_task_id', 'tasks', ['parent_task_id'])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        _replace_foreign_keys(with_action=False)
+    op.drop_index('ix_tasks_parent_task_id', table_name='tasks')
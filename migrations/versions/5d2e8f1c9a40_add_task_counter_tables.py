@@ -0,0 +1,63 @@
+"""add materialized task counter tables
+
+Revision ID: 5d2e8f1c9a40
+Revises: 3a928d5de5dc
+Create Date: 2025-09-22 10:12:41.318020
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8f1c9a40'
+down_revision = '3a928d5de5dc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_task_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('completed', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('pending', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('category_task_counters',
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('completed', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('category_id')
+    )
+
+    # Backfill from existing tasks; `flask counters reconcile` can re-run this at any time
+    op.execute("""
+        INSERT INTO user_task_counters (user_id, total, completed, pending, updated_at)
+        SELECT user_id,
+               COUNT(*),
+               SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status IN ('todo', 'in_progress', 'in-progress') THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM tasks
+        GROUP BY user_id
+    """)
+    op.execute("""
+        INSERT INTO category_task_counters (category_id, total, completed, updated_at)
+        SELECT category_id,
+               COUNT(*),
+               SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM tasks
+        WHERE category_id IS NOT NULL
+        GROUP BY category_id
+    """)
+
+
+def downgrade():
+    op.drop_table('category_task_counters')
+    op.drop_table('user_task_counters')
@@ -0,0 +1,87 @@
+"""add deleted_at tombstones and partial indexes over live rows
+
+Revision ID: 6c1f0a9d4b27
+Revises: 4b9d3e7a2f16
+Create Date: 2025-09-28 14:37:09.441826
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1f0a9d4b27'
+down_revision = '4b9d3e7a2f16'
+branch_labels = None
+depends_on = None
+
+TABLES = ['tasks', 'notes', 'projects']
+
+# Existing indexes rebuilt over live rows only: (index name, table, columns)
+LIVE_INDEXES = [
+    ('ix_tasks_user_id_status', 'tasks', ['user_id', 'status']),
+    ('ix_tasks_user_id_due_date', 'tasks', ['user_id', 'due_date']),
+    ('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at']),
+    ('ix_tasks_user_id_category_id_rank', 'tasks', ['user_id', 'category_id', 'rank']),
+    ('ix_notes_user_id_updated_at', 'notes', ['user_id', 'updated_at']),
+    ('ix_projects_user_id_status_created_at', 'projects', ['user_id', 'status', 'created_at']),
+]
+
+LIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def upgrade():
+    # A nullable column without a default is a metadata-only change, even on large tables
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            # Build each partial index beside the old one, then swap names
+            for name, table, columns in LIVE_INDEXES:
+                op.create_index(f'{name}_live', table, columns, postgresql_where=LIVE,
+                                postgresql_concurrently=True, if_not_exists=True)
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+                op.execute(f'ALTER INDEX {name}_live RENAME TO {name}')
+            op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_search_vector_live '
+                       'ON notes USING GIN (search_vector) WHERE deleted_at IS NULL')
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_notes_search_vector')
+            op.execute('ALTER INDEX ix_notes_search_vector_live RENAME TO ix_notes_search_vector')
+            for table in TABLES:
+                op.create_index(f'ix_{table}_deleted_at', table, ['deleted_at'], postgresql_where=DELETED,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in LIVE_INDEXES:
+            op.drop_index(name, table_name=table)
+            op.create_index(name, table, columns, sqlite_where=LIVE)
+        for table in TABLES:
+            op.create_index(f'ix_{table}_deleted_at', table, ['deleted_at'], sqlite_where=DELETED)
+
+
+def downgrade():
+    # Rows that are only tombstoned would reappear, so remove them first
+    op.execute('DELETE FROM project_task_association WHERE task_id IN (SELECT id FROM tasks WHERE deleted_at IS NOT NULL) '
+               'OR project_id IN (SELECT id FROM projects WHERE deleted_at IS NOT NULL)')
+    op.execute('DELETE FROM focus_sessions WHERE task_id IN (SELECT id FROM tasks WHERE deleted_at IS NOT NULL)')
+    op.execute('UPDATE tasks SET parent_task_id = NULL '
+               'WHERE parent_task_id IN (SELECT id FROM tasks WHERE deleted_at IS NOT NULL)')
+    op.execute('DELETE FROM tasks WHERE deleted_at IS NOT NULL')
+    op.execute('DELETE FROM notes WHERE deleted_at IS NOT NULL '
+               'OR project_id IN (SELECT id FROM projects WHERE deleted_at IS NOT NULL)')
+    op.execute('DELETE FROM projects WHERE deleted_at IS NOT NULL')
+
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_deleted_at', table_name=table)
+    for name, table, columns in LIVE_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns)
+    if is_postgresql:
+        op.execute('DROP INDEX IF EXISTS ix_notes_search_vector')
+        op.execute('CREATE INDEX ix_notes_search_vector ON notes USING GIN (search_vector)')
+
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('deleted_at')
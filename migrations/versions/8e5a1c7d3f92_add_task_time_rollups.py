@@ -0,0 +1,52 @@
+"""add per-day task time rollups and backfill tasks.actual_duration
+
+Revision ID: 8e5a1c7d3f92
+Revises: 6c1f0a9d4b27
+Create Date: 2025-10-02 09:18:44.207513
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e5a1c7d3f92'
+down_revision = '6c1f0a9d4b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_time_rollups',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('sessions', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'day')
+    )
+
+    # Backfill from finished, non-break sessions, credited to the day they started
+    day = 'CAST(started_at AS DATE)' if op.get_bind().dialect.name == 'postgresql' else 'DATE(started_at)'
+    op.execute(f"""
+        INSERT INTO task_time_rollups (task_id, day, minutes, sessions, updated_at)
+        SELECT task_id, {day}, SUM(duration), COUNT(*), CURRENT_TIMESTAMP
+        FROM focus_sessions
+        WHERE task_id IS NOT NULL
+          AND ended_at IS NOT NULL
+          AND duration > 0
+          AND COALESCE(session_type, '') <> 'break'
+        GROUP BY task_id, {day}
+    """)
+    op.execute("""
+        UPDATE tasks
+        SET actual_duration = (
+            SELECT SUM(minutes) FROM task_time_rollups WHERE task_time_rollups.task_id = tasks.id
+        )
+        WHERE id IN (SELECT task_id FROM task_time_rollups)
+    """)
+
+
+def downgrade():
+    op.drop_table('task_time_rollups')
@@ -0,0 +1,43 @@
+"""add note title and full-text search vector
+
+Revision ID: 9f4b7a2d61e3
+Revises: 5d2e8f1c9a40
+Create Date: 2025-09-23 14:05:12.904113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f4b7a2d61e3'
+down_revision = '5d2e8f1c9a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('title', sa.String(length=200), nullable=True))
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # A stored generated column keeps the vector in sync on every write
+    op.execute("""
+        ALTER TABLE notes ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_notes_search_vector ON notes USING GIN (search_vector)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_notes_search_vector")
+        op.execute("ALTER TABLE notes DROP COLUMN IF EXISTS search_vector")
+
+    with op.batch_alter_table('notes', schema=None) as batch_op:
+        batch_op.drop_column('title')
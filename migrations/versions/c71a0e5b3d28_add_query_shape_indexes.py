@@ -0,0 +1,50 @@
+"""add composite indexes for the api query shapes
+
+Revision ID: c71a0e5b3d28
+Revises: 9f4b7a2d61e3
+Create Date: 2025-09-24 09:41:03.550871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71a0e5b3d28'
+down_revision = '9f4b7a2d61e3'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_tasks_user_id_status', 'tasks', ['user_id', 'status']),
+    ('ix_tasks_user_id_due_date', 'tasks', ['user_id', 'due_date']),
+    ('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at']),
+    ('ix_notes_user_id_updated_at', 'notes', ['user_id', 'updated_at']),
+    ('ix_notes_project_id', 'notes', ['project_id']),
+    ('ix_projects_user_id_status_created_at', 'projects', ['user_id', 'status', 'created_at']),
+    ('ix_focus_sessions_user_id_started_at', 'focus_sessions', ['user_id', 'started_at']),
+    ('ix_focus_sessions_task_id', 'focus_sessions', ['task_id']),
+    ('ix_project_task_association_task_id', 'project_task_association', ['task_id']),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY cannot run inside a transaction, and avoids locking writes
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
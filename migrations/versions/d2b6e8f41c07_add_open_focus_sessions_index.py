@@ -0,0 +1,37 @@
+"""add a partial index over open focus sessions for the reaper
+
+Revision ID: d2b6e8f41c07
+Revises: 8e5a1c7d3f92
+Create Date: 2025-10-04 16:25:39.118240
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b6e8f41c07'
+down_revision = '8e5a1c7d3f92'
+branch_labels = None
+depends_on = None
+
+OPEN = sa.text('ended_at IS NULL')
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY cannot run inside a transaction, and avoids locking writes
+        with op.get_context().autocommit_block():
+            op.create_index('ix_focus_sessions_open', 'focus_sessions', ['started_at'], postgresql_where=OPEN,
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index('ix_focus_sessions_open', 'focus_sessions', ['started_at'], sqlite_where=OPEN)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_focus_sessions_open', table_name='focus_sessions',
+                          postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index('ix_focus_sessions_open', table_name='focus_sessions')
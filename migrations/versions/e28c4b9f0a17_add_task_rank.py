@@ -0,0 +1,35 @@
+"""add fractional rank key to tasks
+
+Revision ID: e28c4b9f0a17
+Revises: c71a0e5b3d28
+Create Date: 2025-09-25 16:20:37.118452
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e28c4b9f0a17'
+down_revision = 'c71a0e5b3d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rank', sa.String(length=255), nullable=True))
+
+    # Existing columns get keys on their first move, or via `flask ranks rebalance`
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_tasks_user_id_category_id_rank', 'tasks', ['user_id', 'category_id', 'rank'],
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index('ix_tasks_user_id_category_id_rank', 'tasks', ['user_id', 'category_id', 'rank'])
+
+
+def downgrade():
+    op.drop_index('ix_tasks_user_id_category_id_rank', table_name='tasks')
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('rank')
@@ -270,10 +270,18 @@ class PlanoraApp {
                     ]
                 };
             } else {
-                [statsData, dashboardData] = await Promise.all([
-                    this.api.getDashboardStats(),
-                    this.api.getDashboardData()
-                ]);
+                // The overview only needs the stat cards, recent tasks and projects
+                const { data } = await this.api.getDashboardData(['stats', 'tasks', 'projects']);
+                statsData = {
+                    totalTasks: data.stats.total_tasks,
+                    completedTasks: data.stats.completed_tasks,
+                    activeProjects: data.stats.total_projects,
+                    overdueTasks: data.stats.overdue_tasks
+                };
+                dashboardData = {
+                    recentTasks: data.tasks,
+                    activeProjects: data.projects
+                };
             }
 
             // Update stats cards
@@ -694,7 +702,7 @@ class PlanoraApp {
             aiBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Generating...';
             aiBtn.disabled = true;
             
-            setTimeout(() => {
+            setTimeout(async () => {
                 let project;
                 if (this.demoMode) {
                     // Demo AI generation with different project types
@@ -1410,8 +1418,26 @@ class APIClient {
         return this.request('/dashboard/stats');
     }
 
-    async getDashboardData() {
-        return this.request('/dashboard/data');
+    async getDashboardData(include = null) {
+        const query = include ? `?include=${include.join(',')}` : '';
+        return this.request(`/dashboard/data${query}`);
+    }
+
+    async getDashboardProjects() {
+        return this.request('/dashboard/projects');
+    }
+
+    async getDashboardTasks() {
+        return this.request('/dashboard/tasks');
+    }
+
+    async getDashboardCalendar(start, end) {
+        const params = new URLSearchParams({ start, end });
+        return this.request(`/dashboard/calendar?${params}`);
+    }
+
+    async getDashboardCharts() {
+        return this.request('/dashboard/charts');
     }
 
     // Tasks
@@ -1488,10 +1514,27 @@ class APIClient {
 
     // AI
     async generateAIProject(prompt) {
-        return this.request('/ai/generate-project', {
+        // Generation runs as a background job; poll it until it finishes.
+        // A cached plan is turned into a project right away, without a job.
+        const data = await this.request('/ai/generate-project', {
             method: 'POST',
-            body: JSON.stringify({ prompt })
+            body: JSON.stringify({ goal: prompt })
         });
+        if (data.project_id) return data;
+        return this.waitForJob(data.job_id);
+    }
+
+    async getJob(jobId) {
+        return this.request(`/ai/jobs/${jobId}`);
+    }
+
+    async waitForJob(jobId, intervalMs = 1000) {
+        while (true) {
+            const { job } = await this.getJob(jobId);
+            if (job.status === 'succeeded') return job.result;
+            if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
     }
 
     async chatWithAI(message) {
@@ -1500,6 +1543,40 @@ class APIClient {
             body: JSON.stringify({ message })
         });
     }
+
+    // Streams answer text to onToken as it arrives and resolves with the final reply
+    async streamChatWithAI(message, onToken) {
+        const response = await fetch(`${this.baseURL}/roadmap/chat/stream`, {
+            method: 'POST',
+            headers: this.getHeaders(),
+            body: JSON.stringify({ message })
+        });
+        if (!response.ok) {
+            const errorData = await response.json().catch(() => ({}));
+            throw new Error(errorData.message || `HTTP ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const raw = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                const event = (raw.match(/^event: (.*)$/m) || [])[1];
+                const data = JSON.parse((raw.match(/^data: (.*)$/m) || [])[1] || '{}');
+                if (event === 'token') onToken(data.text);
+                if (event === 'done') return data;
+                if (event === 'error') throw new Error(data.message);
+            }
+        }
+        throw new Error('Chat stream ended unexpectedly');
+    }
 }
 
 // Initialize application
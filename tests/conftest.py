@@ -0,0 +1,83 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+
+
+@pytest.fixture
+def app():
+    """
+    An app on in-memory SQLite. No app context stays pushed, so each test
+    request gets a fresh session and `g` as it would in production; wrap
+    direct database work in `with app.app_context():`.
+    """
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user_id(app):
+    with app.app_context():
+        user = User(username='tester', email='tester@example.com')
+        user.set_password('password')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+@pytest.fixture
+def auth_headers(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+
+class Recording:
+    """The statements captured by one `with sql as recorded:` block."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+class StatementRecorder:
+    """Records every SQL statement sent to the database while a block is active."""
+
+    def __init__(self):
+        self.recording = None
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.recording is not None:
+            self.recording.statements.append((statement, parameters))
+
+    def __enter__(self):
+        # A fresh Recording per block, so two blocks in one test can be compared
+        self.recording = Recording()
+        return self.recording
+
+    def __exit__(self, *exc):
+        self.recording = None
+
+
+@pytest.fixture
+def sql(app):
+    """`with sql as recorded:` captures the statements issued inside the block."""
+    recorder = StatementRecorder()
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', recorder)
+    yield recorder
+    event.remove(engine, 'before_cursor_execute', recorder)
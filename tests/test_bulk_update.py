@@ -0,0 +1,67 @@
+"""PUT /api/tasks/bulk applies every entry with a fixed number of statements."""
+from sqlalchemy import insert
+from app.extensions import db
+from app.models.project import Project, project_task_association
+from app.models.task import Task
+
+
+def seed(user_id, count):
+    connection = db.session.connection()
+    project_id = connection.execute(
+        insert(Project).returning(Project.id), [{'name': 'Project', 'user_id': user_id}]).scalar()
+    task_ids = connection.execute(insert(Task).returning(Task.id), [
+        {'title': f'Task {i}', 'user_id': user_id, 'status': 'todo', 'priority': 'low'} for i in range(count)
+    ]).scalars().all()
+    db.session.commit()
+    return project_id, task_ids
+
+
+def entries(project_id, task_ids):
+    return [{'id': task_id, 'status': 'completed', 'priority': 'high', 'position': i, 'project_id': project_id}
+            for i, task_id in enumerate(task_ids)]
+
+
+def test_statement_count_does_not_grow_with_the_entries(app, client, user_id, auth_headers, sql):
+    with app.app_context():
+        project_id, task_ids = seed(user_id, 53)
+
+    with sql as small:
+        response = client.put('/api/tasks/bulk', headers=auth_headers, json={'tasks': entries(project_id, task_ids[:3])})
+    assert response.status_code == 200
+    with sql as large:
+        response = client.put('/api/tasks/bulk', headers=auth_headers, json={'tasks': entries(project_id, task_ids[3:])})
+
+    assert response.get_json()['updated_count'] == 50
+    assert large.count == small.count
+    with app.app_context():
+        tasks = Task.query.filter(Task.id.in_(task_ids[3:])).order_by(Task.id).all()
+        assert [task.position for task in tasks] == list(range(50))
+        assert {(task.status, task.priority) for task in tasks} == {('completed', 'high')}
+        assert all(task.completed_at is not None for task in tasks)
+        linked = db.session.execute(db.select(project_task_association.c.task_id).where(
+            project_task_association.c.project_id == project_id)).scalars().all()
+        assert sorted(linked) == task_ids
+
+
+def test_each_entry_reports_its_own_result(app, client, user_id, auth_headers):
+    with app.app_context():
+        project_id, task_ids = seed(user_id, 2)
+
+    response = client.put('/api/tasks/bulk', headers=auth_headers, json={'tasks': [
+        {'id': task_ids[0], 'status': 'in-progress'},
+        {'status': 'completed'},
+        {'id': 999_999, 'status': 'completed'},
+        {'id': task_ids[1], 'project_id': 999_999},
+        {'id': task_ids[1], 'position': 'top'},
+        {'id': task_ids[1], 'priority': 'medium'},
+    ]})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['updated_count'] == 2
+    assert [(r['id'], r['success']) for r in body['results']] == [
+        (task_ids[0], True), (None, False), (999_999, False), (task_ids[1], False), (task_ids[1], False),
+        (task_ids[1], True)]
+    with app.app_context():
+        first, second = (db.session.get(Task, task_id) for task_id in task_ids)
+        assert (first.status, second.priority, second.position) == ('in-progress', 'medium', 0)
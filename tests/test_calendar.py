@@ -0,0 +1,89 @@
+"""Calendar events inside a window, and an iCalendar feed that folds and escapes per RFC 5545."""
+from datetime import datetime
+import pytest
+from app.extensions import db
+from app.models.focus_session import FocusSession
+from app.models.task import Task
+
+# Two octets a character, so the 75-octet fold lands inside one unless it backs off
+LONG_TITLE = 'Réunions ' + 'é' * 80
+AWKWARD_DESCRIPTION = 'Bring: pens, paper; a C:\\path\nand a second line'
+
+
+def seed(user_id):
+    db.session.add_all([
+        Task(title='February', user_id=user_id, due_date=datetime(2025, 2, 20)),
+        Task(title='Planning', user_id=user_id, due_date=datetime(2025, 3, 3, 9), description=AWKWARD_DESCRIPTION),
+        Task(title=LONG_TITLE, user_id=user_id, due_date=datetime(2025, 3, 4, 9)),
+        Task(title='Dropped', user_id=user_id, status='cancelled', due_date=datetime(2025, 3, 5, 9)),
+        Task(title='Someday', user_id=user_id),
+        FocusSession(user_id=user_id, session_type='pomodoro', duration=25, started_at=datetime(2025, 3, 3, 10)),
+    ])
+    db.session.commit()
+
+
+def ics(client, auth_headers, query=''):
+    response = client.get(f'/api/calendar.ics?{query}', headers=auth_headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.mimetype == 'text/calendar'
+    return response.get_data()
+
+
+def unfold(body):
+    return body.decode('utf-8').replace('\r\n ', '').split('\r\n')
+
+
+def test_events_inside_the_window(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    response = client.get('/api/calendar/events?start=2025-03-01&end=2025-03-05', headers=auth_headers)
+    assert response.status_code == 200
+    events = response.get_json()['events']
+
+    assert [event['title'] for event in events] == ['Planning', LONG_TITLE, 'Focus: pomodoro']
+    assert events[-1]['start'] == '2025-03-03T10:00:00' and events[-1]['end'] == '2025-03-03T10:25:00'
+
+
+@pytest.mark.parametrize('window', [
+    'start=2025-03-05&end=2025-03-01',
+    'start=2025-01-01&end=2026-06-01',
+    'start=2025-03-01&end=soon',
+])
+def test_invalid_windows_are_rejected(client, auth_headers, window):
+    assert client.get(f'/api/calendar/events?{window}', headers=auth_headers).status_code == 400
+
+
+def test_ics_lines_are_folded_at_75_octets(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    body = ics(client, auth_headers)
+
+    assert body.endswith(b'END:VCALENDAR\r\n')
+    physical = body.split(b'\r\n')[:-1]
+    assert all(len(line) <= 75 for line in physical)
+    # Every folded piece is valid UTF-8 on its own: no character was cut in half
+    for line in physical:
+        line.decode('utf-8')
+    assert f'SUMMARY:{LONG_TITLE}' in unfold(body)
+    assert sum(line.startswith(b' ') for line in physical) >= 2
+
+
+def test_ics_escapes_text_and_marks_cancelled_tasks(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    lines = unfold(ics(client, auth_headers))
+
+    assert r'DESCRIPTION:Bring: pens\, paper\; a C:\\path\nand a second line' in lines
+    assert lines.count('BEGIN:VEVENT') == 5
+    dropped = lines.index('SUMMARY:Dropped')
+    assert lines[dropped + 1] == 'STATUS:CANCELLED'
+    assert 'DTSTART:20250303T100000Z' in lines and 'DTEND:20250303T102500Z' in lines
+
+
+def test_ics_bounds(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    lines = unfold(ics(client, auth_headers, 'start=2025-03-04&end=2025-03-05'))
+    assert [line for line in lines if line.startswith('SUMMARY:')] == [f'SUMMARY:{LONG_TITLE}']
+
+    assert client.get('/api/calendar.ics?start=not-a-date', headers=auth_headers).status_code == 400
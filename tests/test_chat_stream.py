@@ -0,0 +1,82 @@
+"""Streamed chat replies: answers arrive token by token, actions once their JSON is complete."""
+import json
+import pytest
+from app.extensions import db
+from app.models.task import Task
+from app.services.chat import AnswerStreamer
+from app.services.llm import FakeLLMClient
+
+PATH = '/api/roadmap/chat/stream'
+# Escapes that a chunk boundary can split: \n, \", \\, \/ and a \u sequence
+ANSWER = 'Start with "flour",\nthen wait.\tC:\\oven / café ☕'
+ANSWER_REPLY = json.dumps({'action': 'answer', 'response': ANSWER})
+
+
+def chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 8, 1000])
+def test_answer_text_is_decoded_whatever_the_chunking(size):
+    reply = json.dumps({'action': 'answer', 'response': ANSWER}, ensure_ascii=True)
+    streamer = AnswerStreamer()
+    streamed = ''.join(streamer.feed(chunk) for chunk in chunks(reply, size))
+
+    assert streamed == ANSWER
+    assert streamer.buffer == reply
+
+
+def test_response_before_action_is_held_until_the_action_is_known():
+    streamer = AnswerStreamer()
+    assert streamer.feed('{"response": "Hel') == ''
+    assert streamer.feed('lo", "action": "answer"}') == 'Hello'
+
+
+def test_other_actions_stream_nothing():
+    reply = json.dumps({'action': 'add_task', 'response': 'ignored', 'task': {'title': 'Knead'}})
+    streamer = AnswerStreamer()
+    assert [streamer.feed(chunk) for chunk in chunks(reply, 4)] == [''] * len(chunks(reply, 4))
+
+
+def events(response):
+    parsed = []
+    for block in response.get_data(as_text=True).split('\n\n'):
+        if block:
+            event, data = block.split('\n')
+            parsed.append((event.removeprefix('event: '), json.loads(data.removeprefix('data: '))))
+    return parsed
+
+
+def test_answers_stream_as_token_events(app, client, auth_headers):
+    app.extensions['llm_client'] = FakeLLMClient(response=ANSWER_REPLY)
+    response = client.post(PATH, headers=auth_headers, json={'message': 'How do I bake bread?'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    sent = events(response)
+
+    tokens = [payload['text'] for event, payload in sent if event == 'token']
+    assert len(tokens) > 5
+    assert ''.join(tokens) == ANSWER
+    event, done = sent[-1]
+    assert event == 'done'
+    assert (done['reply'], done['action_taken']) == (ANSWER, 'none')
+    assert done['ttfb_ms'] >= 0
+
+
+def test_add_task_is_acted_on_once_the_reply_is_complete(app, client, user_id, auth_headers):
+    project = client.post('/api/projects', headers=auth_headers, json={'name': 'Bakery'}).get_json()['data']['project']
+    app.extensions['llm_client'] = FakeLLMClient(response=json.dumps({
+        'action': 'add_task', 'task': {'title': 'Buy flour', 'project_name': 'bakery'}}))
+    sent = events(client.post(PATH, headers=auth_headers, json={'message': 'Add buying flour to Bakery'}))
+
+    assert [event for event, _ in sent] == ['done']
+    assert sent[0][1]['action_taken'] == 'task_added'
+    with app.app_context():
+        task = db.session.get(Task, sent[0][1]['new_task']['id'])
+        assert task.title == 'Buy flour' and [p.id for p in task.projects] == [project['id']]
+
+
+def test_unparseable_replies_end_with_an_error_event(app, client, auth_headers):
+    app.extensions['llm_client'] = FakeLLMClient(response='not json at all')
+    sent = events(client.post(PATH, headers=auth_headers, json={'message': 'Hello'}))
+    assert [event for event, _ in sent] == ['error']
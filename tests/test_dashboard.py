@@ -0,0 +1,111 @@
+"""Dashboard sections, the calendar window, and project progress from one grouped query at any size."""
+import time
+from datetime import datetime
+import pytest
+from sqlalchemy import insert
+from app.extensions import cache, db
+from app.models.project import Project, project_task_association
+from app.models.task import Task
+
+PATH = '/api/dashboard/projects'
+
+
+def seed(user_id, projects, tasks_per_project):
+    """Active projects with `tasks_per_project` tasks each, every third one completed."""
+    connection = db.session.connection()
+    project_ids = connection.execute(insert(Project).returning(Project.id), [
+        {'name': f'Project {p}', 'user_id': user_id, 'status': 'active'} for p in range(projects)
+    ]).scalars().all()
+    task_ids = connection.execute(insert(Task).returning(Task.id), [
+        {'title': f'Task {t}', 'user_id': user_id, 'status': 'completed' if t % 3 == 0 else 'todo'}
+        for _ in project_ids for t in range(tasks_per_project)
+    ]).scalars().all()
+    connection.execute(insert(project_task_association), [
+        {'project_id': project_ids[i // tasks_per_project], 'task_id': task_id} for i, task_id in enumerate(task_ids)
+    ])
+    db.session.commit()
+    # Core inserts bypass the cache invalidation of the API
+    cache.invalidate_user(user_id)
+
+
+def fetch(client, auth_headers, sql):
+    with sql as recorded:
+        started = time.perf_counter()
+        response = client.get(PATH, headers=auth_headers)
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()['data'], recorded.count, elapsed
+
+
+def test_project_progress(app, client, user_id, auth_headers, sql):
+    with app.app_context():
+        seed(user_id, 2, 6)
+    projects, _, _ = fetch(client, auth_headers, sql)
+
+    assert [(p['task_count'], p['completed_count'], p['progress']) for p in projects] == [(6, 2, 33)] * 2
+
+
+def test_statement_count_and_time_stay_flat(app, client, user_id, auth_headers, sql):
+    with app.app_context():
+        seed(user_id, 2, 25)
+    small, small_count, _ = fetch(client, auth_headers, sql)
+
+    # The scale from the original report: 200 projects, 50k tasks
+    with app.app_context():
+        seed(user_id, 198, 250)
+    large, large_count, elapsed = fetch(client, auth_headers, sql)
+
+    assert (len(small), len(large)) == (2, 200)
+    assert sum(p['task_count'] for p in large) == 2 * 25 + 198 * 250
+    assert large_count == small_count
+    # About 40 ms on SQLite; the bound leaves room for slow CI machines
+    assert elapsed < 0.5, f'{PATH} took {elapsed:.2f}s for 200 projects and 50k tasks'
+
+
+def test_include_narrows_the_payload(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id, 1, 3)
+    response = client.get('/api/dashboard/data?include=projects,stats', headers=auth_headers)
+    assert response.status_code == 200
+    data = response.get_json()['data']
+
+    assert set(data) == {'stats', 'projects', 'last_updated'}
+    assert data['stats'] == client.get('/api/dashboard/stats', headers=auth_headers).get_json()['data']
+    assert data['projects'] == client.get(PATH, headers=auth_headers).get_json()['data']
+
+    full = client.get('/api/dashboard/data', headers=auth_headers).get_json()['data']
+    assert set(full) == {'user', 'stats', 'projects', 'tasks', 'calendar_tasks', 'calendar_window', 'last_updated'}
+
+
+@pytest.mark.parametrize('include', ['bogus', 'stats,bogus', ','])
+def test_unknown_sections_are_rejected(client, auth_headers, include):
+    assert client.get(f'/api/dashboard/data?include={include}', headers=auth_headers).status_code == 400
+
+
+def test_calendar_window_is_half_open(app, client, user_id, auth_headers):
+    with app.app_context():
+        db.session.add_all([
+            Task(title=title, user_id=user_id, due_date=due)
+            for title, due in [('Before', datetime(2025, 2, 28, 23, 59)), ('Start', datetime(2025, 3, 1)),
+                               ('Inside', datetime(2025, 3, 15, 9)), ('End', datetime(2025, 4, 1))]
+        ])
+        db.session.commit()
+    window = 'start=2025-03-01&end=2025-04-01'
+
+    events = client.get(f'/api/dashboard/calendar?{window}', headers=auth_headers).get_json()['data']
+    assert [event['title'] for event in events] == ['Start', 'Inside']
+
+    data = client.get(f'/api/dashboard/data?include=calendar&{window}', headers=auth_headers).get_json()['data']
+    assert data['calendar_tasks'] == events
+    assert data['calendar_window'] == {'start': '2025-03-01T00:00:00', 'end': '2025-04-01T00:00:00'}
+
+
+@pytest.mark.parametrize('window', [
+    'start=2025-03-01&end=2025-03-01',       # empty
+    'start=2025-04-01&end=2025-03-01',       # backwards
+    'start=2025-01-01&end=2026-01-03',       # longer than MAX_WINDOW_DAYS
+    'start=yesterday',                       # unparseable
+])
+def test_invalid_calendar_windows_are_rejected(client, auth_headers, window):
+    assert client.get(f'/api/dashboard/calendar?{window}', headers=auth_headers).status_code == 400
+    assert client.get(f'/api/dashboard/data?include=calendar&{window}', headers=auth_headers).status_code == 400
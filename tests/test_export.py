@@ -0,0 +1,121 @@
+"""Exports stream in bounded memory, keep their documented layout, and never include secrets."""
+import csv
+import io
+import json
+import tracemalloc
+import zipfile
+from datetime import datetime
+import pytest
+from sqlalchemy import insert
+from app.extensions import db
+from app.models.focus_session import FocusSession
+from app.models.note import Note
+from app.models.project import Project, project_task_association
+from app.models.task import Task
+from app.services.export import EXPORT_TABLES
+
+# Scaled down from the 1M tasks of the original request to keep the suite quick.
+# The peak is about 3 MiB at any size, one EXPORT_BATCH_SIZE batch at a time.
+MANY_TASKS = 30_000
+PEAK_MEMORY_BOUND = 5 * 1024 * 1024
+
+
+def seed(user_id, tasks):
+    connection = db.session.connection()
+    project_id = connection.execute(
+        insert(Project).returning(Project.id), [{'name': 'Project', 'user_id': user_id}]).scalar()
+    task_ids = connection.execute(insert(Task).returning(Task.id), [
+        {'title': f'Task {t}', 'description': f'Description of task {t}', 'user_id': user_id,
+         'status': 'todo', 'created_at': datetime(2025, 1, 1)}
+        for t in range(tasks)
+    ]).scalars().all()
+    connection.execute(insert(project_task_association), [
+        {'project_id': project_id, 'task_id': task_id} for task_id in task_ids[:3]])
+    connection.execute(insert(Note), [{'title': 'Note', 'content': 'Body', 'user_id': user_id,
+                                       'project_id': project_id}])
+    connection.execute(insert(FocusSession), [{'user_id': user_id, 'task_id': task_ids[0], 'duration': 25}])
+    db.session.commit()
+
+
+def export(client, auth_headers, export_format):
+    response = client.get(f'/api/export?format={export_format}', headers=auth_headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response
+
+
+def test_ndjson_layout(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id, 5)
+    body = export(client, auth_headers, 'ndjson').get_data(as_text=True)
+    lines = [json.loads(line) for line in body.splitlines()]
+
+    tables = [line['table'] for line in lines]
+    assert tables == sorted(tables, key=EXPORT_TABLES.index)
+    assert {table: tables.count(table) for table in set(tables)} == {
+        'users': 1, 'projects': 1, 'tasks': 5, 'project_tasks': 3, 'notes': 1, 'focus_sessions': 1,
+    }
+    user = next(line['data'] for line in lines if line['table'] == 'users')
+    assert user['id'] == user_id and 'password_hash' not in user
+    task = next(line['data'] for line in lines if line['table'] == 'tasks')
+    assert task['title'] == 'Task 0' and task['created_at'] == '2025-01-01T00:00:00'
+
+
+def test_csv_layout(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id, 5)
+    archive = zipfile.ZipFile(io.BytesIO(export(client, auth_headers, 'csv').get_data()))
+
+    assert archive.namelist() == [f'{table}.csv' for table in EXPORT_TABLES]
+    rows = {name: list(csv.DictReader(io.TextIOWrapper(archive.open(name), encoding='utf-8')))
+            for name in archive.namelist()}
+    assert [len(rows[f'{table}.csv']) for table in EXPORT_TABLES] == [1, 1, 0, 5, 3, 1, 1]
+    assert rows['users.csv'][0]['id'] == str(user_id)
+    assert rows['tasks.csv'][4]['description'] == 'Description of task 4'
+
+
+def test_parquet_layout(app, client, user_id, auth_headers):
+    pq = pytest.importorskip('pyarrow.parquet')
+    with app.app_context():
+        seed(user_id, 5)
+    archive = zipfile.ZipFile(io.BytesIO(export(client, auth_headers, 'parquet').get_data()))
+
+    assert archive.namelist() == [f'{table}.parquet' for table in EXPORT_TABLES]
+    tables = {name: pq.read_table(io.BytesIO(archive.read(name))) for name in archive.namelist()}
+    assert [tables[f'{table}.parquet'].num_rows for table in EXPORT_TABLES] == [1, 1, 0, 5, 3, 1, 1]
+    assert 'password_hash' not in tables['users.parquet'].column_names
+
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_password_hash_is_never_exported(app, client, user_id, auth_headers, export_format):
+    with app.app_context():
+        password_hash = db.session.execute(db.text('SELECT password_hash FROM users')).scalar()
+    body = export(client, auth_headers, export_format).get_data()
+    if export_format == 'csv':
+        archive = zipfile.ZipFile(io.BytesIO(body))
+        body = b''.join(archive.read(name) for name in archive.namelist())
+
+    assert password_hash and password_hash.encode() not in body
+    assert b'password_hash' not in body
+
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_export_memory_stays_bounded(app, client, user_id, auth_headers, export_format):
+    with app.app_context():
+        seed(user_id, MANY_TASKS)
+
+    tracemalloc.start()
+    try:
+        response = client.get(f'/api/export?format={export_format}', headers=auth_headers, buffered=False)
+        assert response.status_code == 200
+        exported = 0
+        for chunk in response.response:
+            exported += len(chunk)
+        response.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < PEAK_MEMORY_BOUND, f'peak {peak / 2**20:.1f} MiB while exporting {exported / 2**20:.1f} MiB'
+    if export_format == 'ndjson':
+        # Not buffered anywhere: the body is several times the bound
+        assert exported > 2 * PEAK_MEMORY_BOUND
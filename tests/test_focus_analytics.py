@@ -0,0 +1,92 @@
+"""Focus analytics: local-day bucketing across time zones and DST, and the one-year latency target."""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.extensions import db
+from app.models.focus_session import FocusSession
+from app.models.task import Task
+from app.services.focus_analytics import compute_focus_analytics
+
+NOW = datetime(2025, 3, 12, 12, 0)
+
+# (UTC start, minutes). New York switched from UTC-5 to UTC-4 on 2025-03-09.
+SESSIONS = [
+    (datetime(2025, 3, 9, 4, 30), 10),   # Sat 23:30 in New York, Sun 04:30 in UTC
+    (datetime(2025, 3, 10, 2, 0), 25),   # Sun 22:00 in New York, Mon 02:00 in UTC
+    (datetime(2025, 3, 10, 14, 0), 30),  # Mon 10:00 in New York
+    (datetime(2025, 3, 11, 3, 30), 20),  # Mon 23:30 in New York, Tue 03:30 in UTC
+    (datetime(2025, 3, 12, 11, 0), 15),  # Wed 07:00 in New York
+]
+
+MON, TUE, WED, SAT, SUN = 0, 1, 2, 5, 6
+
+
+def add_sessions(user_id, sessions):
+    db.session.add_all([
+        FocusSession(user_id=user_id, duration=minutes, session_type='pomodoro',
+                     started_at=started_at, ended_at=started_at + timedelta(minutes=minutes))
+        for started_at, minutes in sessions
+    ])
+    db.session.commit()
+
+
+def nonzero_heatmap(analytics):
+    return {(weekday, hour): minutes
+            for weekday, row in enumerate(analytics['heatmap']['minutes'])
+            for hour, minutes in enumerate(row) if minutes}
+
+
+def test_days_weeks_streaks_and_heatmap_follow_the_local_time_zone(app, user_id):
+    with app.app_context():
+        add_sessions(user_id, SESSIONS)
+        utc = compute_focus_analytics(user_id, days=7, tz_name='UTC', now=NOW)
+        new_york = compute_focus_analytics(user_id, days=7, tz_name='America/New_York', now=NOW)
+
+    assert {day['date']: day['minutes'] for day in utc['daily'] if day['minutes']} == {
+        '2025-03-09': 10, '2025-03-10': 55, '2025-03-11': 20, '2025-03-12': 15}
+    assert {day['date']: day['minutes'] for day in new_york['daily'] if day['minutes']} == {
+        '2025-03-08': 10, '2025-03-09': 25, '2025-03-10': 50, '2025-03-12': 15}
+
+    # Weeks start on Monday, in local time
+    assert [(week['week_start'], week['minutes']) for week in utc['weekly']] == [
+        ('2025-03-03', 10), ('2025-03-10', 90)]
+    assert [(week['week_start'], week['minutes']) for week in new_york['weekly']] == [
+        ('2025-03-03', 35), ('2025-03-10', 65)]
+
+    assert utc['streaks'] == {
+        'current': 4, 'longest': 4, 'longest_start': '2025-03-09', 'longest_end': '2025-03-12'}
+    # Tuesday the 11th has nothing in New York, which breaks the run
+    assert new_york['streaks'] == {
+        'current': 1, 'longest': 3, 'longest_start': '2025-03-08', 'longest_end': '2025-03-10'}
+
+    assert nonzero_heatmap(utc) == {
+        (SUN, 4): 10, (MON, 2): 25, (MON, 14): 30, (TUE, 3): 20, (WED, 11): 15}
+    assert nonzero_heatmap(new_york) == {
+        (SAT, 23): 10, (SUN, 22): 25, (MON, 10): 30, (MON, 23): 20, (WED, 7): 15}
+    assert utc['totals']['minutes'] == new_york['totals']['minutes'] == 100
+
+
+def test_a_year_of_sessions_is_analysed_within_50_ms(app, user_id):
+    with app.app_context():
+        task_ids = db.session.connection().execute(insert(Task).returning(Task.id), [
+            {'title': f'Task {t}', 'user_id': user_id} for t in range(40)
+        ]).scalars().all()
+        # Eight sessions a day for a year, a few of them breaks
+        start = datetime.utcnow() - timedelta(days=364)
+        db.session.connection().execute(insert(FocusSession), [
+            {'user_id': user_id, 'task_id': task_ids[i % len(task_ids)], 'duration': 25,
+             'session_type': 'break' if i % 8 == 7 else 'pomodoro', 'productivity_score': i % 10 + 1,
+             'started_at': start + timedelta(hours=3 * i), 'ended_at': start + timedelta(hours=3 * i, minutes=25)}
+            for i in range(8 * 364)
+        ])
+        db.session.commit()
+
+        compute_focus_analytics(user_id, tz_name='Europe/Berlin')  # warm up imports and caches
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            analytics = compute_focus_analytics(user_id, tz_name='Europe/Berlin')
+            timings.append(time.perf_counter() - started)
+
+    assert analytics['totals']['sessions'] == 7 * 364
+    assert min(timings) < 0.050, f'best of 5 took {min(timings) * 1000:.1f} ms'
@@ -0,0 +1,68 @@
+"""Focus sessions are always closed eventually, whichever worker held their timer."""
+from datetime import datetime, timedelta
+import pytest
+from app import create_app
+from app.extensions import db, focus_timers
+from app.models.focus_session import FocusSession
+from app.models.task import Task
+from app.models.task_time import TaskTimeRollup
+from app.services.focus_sessions import reap_orphaned_sessions
+
+
+def add_session(user_id, age):
+    session = FocusSession(user_id=user_id, duration=0, started_at=datetime.utcnow() - age)
+    db.session.add(session)
+    db.session.commit()
+    return session.id
+
+
+def test_reaper_closes_sessions_that_lost_their_timer(app, client, auth_headers, user_id):
+    timeout = timedelta(seconds=focus_timers.timeout)
+    tracked = client.post('/api/focus_sessions/start', headers=auth_headers, json={}).get_json()['session_id']
+    with app.app_context():
+        # Long-running, but still sending heartbeats
+        db.session.get(FocusSession, tracked).started_at -= timeout * 3
+        db.session.commit()
+        # Its timer lived in a worker that has since restarted
+        lost = add_session(user_id, timeout * 2)
+        # Too young to tell apart from one whose timer is just being created
+        recent = add_session(user_id, timeout / 2)
+
+        assert reap_orphaned_sessions(force=True) == 1
+
+        db.session.expire_all()
+        closed = db.session.get(FocusSession, lost)
+        assert closed.ended_at == closed.started_at
+        assert (closed.duration, closed.was_completed) == (0, False)
+        assert db.session.get(FocusSession, recent).ended_at is None
+        assert db.session.get(FocusSession, tracked).ended_at is None
+
+
+def test_stop_after_a_lost_timer_closes_the_session_as_the_reaper_would(app, client, auth_headers, user_id):
+    with app.app_context():
+        task = Task(title='Focus on me', user_id=user_id)
+        db.session.add(task)
+        db.session.commit()
+        task_id = task.id
+    started = client.post('/api/focus_sessions/start', headers=auth_headers, json={'task_id': task_id})
+    session_id = started.get_json()['session_id']
+    with app.app_context():
+        # An hour into the session, the worker holding its timer restarts
+        db.session.get(FocusSession, session_id).started_at -= timedelta(hours=1)
+        db.session.commit()
+        focus_timers.stop(session_id)
+
+    response = client.post(f'/api/focus_sessions/{session_id}/stop', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['duration'] == 0
+    with app.app_context():
+        session = db.session.get(FocusSession, session_id)
+        assert session.ended_at == session.started_at
+        assert (session.duration, session.was_completed) == (0, False)
+        assert db.session.query(TaskTimeRollup).count() == 0
+
+
+def test_several_workers_require_redis():
+    with pytest.raises(RuntimeError, match='REDIS_URL'):
+        create_app('testing', {'WEB_WORKERS': 2})
@@ -0,0 +1,49 @@
+"""Imported cancelled tasks keep their status, and stats and counters agree about them."""
+import json
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.task_counter import UserTaskCounter
+from app.services.counters import rebuild_task_counters
+
+YESTERDAY = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+BOARD = {
+    'name': 'Board',
+    'lists': [{'id': 'l1', 'name': 'Doing'}],
+    'cards': [
+        {'name': 'Open card', 'idList': 'l1'},
+        {'name': 'Done card', 'idList': 'l1', 'dueComplete': True},
+        {'name': 'Closed card', 'idList': 'l1', 'closed': True, 'due': YESTERDAY},
+    ],
+}
+
+
+def test_closed_trello_cards_are_imported_as_cancelled(app, client, auth_headers, user_id):
+    response = client.post('/api/import?format=json', headers=auth_headers, data=json.dumps(BOARD))
+    assert response.status_code == 201, response.get_json()
+
+    tasks = client.get('/api/tasks?limit=100', headers=auth_headers).get_json()['data']['tasks']
+    assert sorted(task['status'] for task in tasks) == ['cancelled', 'completed', 'todo']
+
+    stats = client.get('/api/tasks/stats', headers=auth_headers).get_json()['data']
+    counts = [stats[name] for name in ('total_tasks', 'completed_tasks', 'todo_tasks', 'cancelled_tasks')]
+    assert counts == [3, 1, 1, 1]
+    # A cancelled task is closed, so its past due date does not make it overdue
+    assert stats['overdue_tasks'] == 0
+
+    with app.app_context():
+        counter = db.session.get(UserTaskCounter, user_id)
+        assert (counter.total, counter.completed, counter.pending) == (3, 1, 1)
+        assert rebuild_task_counters([user_id], dry_run=True)['users'] == []
+
+
+def test_status_aliases_map_to_cancelled(app, client, auth_headers):
+    rows = [{'title': f'Task {status}', 'status': status} for status in ('canceled', 'closed', 'archived', 'done')]
+    response = client.post('/api/import?format=json', headers=auth_headers, data=json.dumps(rows))
+    assert response.status_code == 201, response.get_json()
+
+    tasks = client.get('/api/tasks?limit=100', headers=auth_headers).get_json()['data']['tasks']
+    assert {task['title']: task['status'] for task in tasks} == {
+        'Task canceled': 'cancelled', 'Task closed': 'cancelled',
+        'Task archived': 'cancelled', 'Task done': 'completed',
+    }
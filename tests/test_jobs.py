@@ -0,0 +1,76 @@
+"""AI project generation runs as a background job that the caller polls."""
+import time
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models.project import Project
+from app.models.user import User
+from app.services.llm import FakeLLMClient, fake_response
+
+PATH = '/api/ai/generate-project'
+
+
+def wait_for(client, auth_headers, status_url, timeout=5.0):
+    """Poll a job until it finishes; fails the test instead of hanging."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get(status_url, headers=auth_headers)
+        assert response.status_code == 200, response.get_json()
+        job = response.get_json()['job']
+        if job['status'] in ('succeeded', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'job still {job["status"]} after {timeout}s')
+
+
+def test_request_returns_before_the_model_answers(app, client, user_id, auth_headers):
+    llm = app.extensions['llm_client'] = FakeLLMClient(latency=0.3)
+
+    started = time.perf_counter()
+    response = client.post(PATH, headers=auth_headers, json={'goal': 'learn to bake bread'})
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 202, response.get_json()
+    body = response.get_json()
+    assert elapsed < 0.3
+    job = wait_for(client, auth_headers, body['status_url'])
+
+    assert (job['status'], job['progress'], job['stage']) == ('succeeded', 100, 'done')
+    assert job['result']['task_count'] == 9 and job['result']['cached'] is False
+    with app.app_context():
+        project = db.session.get(Project, job['result']['project_id'])
+        assert project.user_id == user_id and project.name == 'Roadmap: learn to bake bread'
+
+    # The plan is cached now: the same goal skips the model and the queue
+    response = client.post(PATH, headers=auth_headers, json={'goal': 'Learn to bake bread '})
+    assert response.status_code == 201
+    assert response.get_json()['cached'] is True
+    assert llm.calls == 1
+
+
+def test_failed_jobs_report_a_public_error(app, client, auth_headers):
+    app.extensions['llm_client'] = FakeLLMClient(response='Sorry, I cannot help with that.')
+    body = client.post(PATH, headers=auth_headers, json={'goal': 'write a novel'}).get_json()
+    job = wait_for(client, auth_headers, body['status_url'])
+
+    assert job['status'] == 'failed'
+    assert job['error'] == 'The AI response could not be turned into a project.'
+    assert job['result'] is None
+
+
+def test_jobs_are_private_to_their_owner(app, client, auth_headers):
+    app.extensions['llm_client'] = FakeLLMClient(response=fake_response)
+    body = client.post(PATH, headers=auth_headers, json={'goal': 'run a marathon'}).get_json()
+    with app.app_context():
+        other = User(username='other', email='other@example.com')
+        other.set_password('password')
+        db.session.add(other)
+        db.session.commit()
+        other_headers = {'Authorization': f'Bearer {create_access_token(identity=str(other.id))}'}
+
+    assert client.get(body['status_url'], headers=other_headers).status_code == 404
+    assert client.get('/api/ai/jobs/does-not-exist', headers=auth_headers).status_code == 404
+    wait_for(client, auth_headers, body['status_url'])
+
+
+def test_goal_is_required(client, auth_headers):
+    assert client.post(PATH, headers=auth_headers, json={'goal': '  '}).status_code == 400
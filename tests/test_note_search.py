@@ -0,0 +1,72 @@
+"""Note search ranks title hits first, highlights matches and pages through results."""
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.note import Note
+from app.models.project import Project
+
+
+def seed(user_id):
+    base = datetime(2025, 1, 1)
+    project = Project(name='Home', user_id=user_id)
+    db.session.add(project)
+    db.session.flush()
+    notes = [
+        Note(title='Grocery list', content='Milk, eggs and a Budget for the week', user_id=user_id,
+             updated_at=base),
+        Note(title='Budget review', content='Compare the budget with last month', user_id=user_id,
+             updated_at=base + timedelta(days=1)),
+        Note(title='Holiday plans', content='Flights, hotel. Budget still open; budget approved later',
+             user_id=user_id, updated_at=base + timedelta(days=2)),
+        Note(title='Budget draft', content='Budget numbers, but marked private', user_id=user_id,
+             updated_at=base + timedelta(days=3)),
+        Note(title='Unrelated', content='Nothing to see here', user_id=user_id, updated_at=base),
+    ]
+    for note in notes:
+        note.project_id = project.id
+    db.session.add_all(notes)
+    db.session.commit()
+
+
+def search(client, auth_headers, query):
+    response = client.get(f'/api/notes/search?{query}', headers=auth_headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def test_title_hits_rank_first_and_matches_are_highlighted_in_any_case(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    results = search(client, auth_headers, 'q=budget')['results']
+
+    # The two title hits tie on score, so the more recently updated one comes first
+    assert [result['title'] for result in results] == [
+        'Budget draft', 'Budget review', 'Holiday plans', 'Grocery list']
+    assert [result['rank'] for result in results] == sorted((r['rank'] for r in results), reverse=True)
+    assert results[1]['highlighted_title'] == '<mark>Budget</mark> review'
+    assert results[1]['content_preview'] == 'Compare the <mark>budget</mark> with last month'
+    assert '<mark>Budget</mark> still open; <mark>budget</mark> approved' in results[2]['content_preview']
+
+
+def test_quoted_phrases_and_exclusions(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    titles = [result['title'] for result in search(client, auth_headers, 'q=budget -private')['results']]
+    assert 'Budget draft' not in titles and len(titles) == 3
+
+    results = search(client, auth_headers, 'q="budget review"')['results']
+    assert [result['title'] for result in results] == ['Budget review']
+
+
+def test_pages_do_not_overlap(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    first = search(client, auth_headers, 'q=budget&per_page=3')
+    second = search(client, auth_headers, 'q=budget&per_page=3&page=2')
+
+    assert first['has_more'] and not second['has_more']
+    assert [r['title'] for r in first['results'] + second['results']] == [
+        r['title'] for r in search(client, auth_headers, 'q=budget')['results']]
+
+
+def test_query_is_required(client, auth_headers):
+    assert client.get('/api/notes/search?q=%20', headers=auth_headers).status_code == 400
@@ -0,0 +1,82 @@
+"""Cursor pages of GET /api/tasks add up to the full listing in every sort mode."""
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models.task import Task
+
+SORTS = ['created_at', 'due_date', 'priority', 'title', 'rank']
+PAGE = 3
+
+
+def seed(user_id):
+    """Tasks with repeated sort values and NULLs, so ties and NULL ordering are exercised."""
+    base = datetime(2025, 1, 1)
+    db.session.add_all([
+        Task(title=f'Task {i % 4}', user_id=user_id,
+             priority=('high', 'medium', 'low')[i % 3],
+             created_at=base + timedelta(hours=i // 2),
+             due_date=None if i % 3 == 0 else base + timedelta(days=i % 5),
+             rank=None if i % 4 == 0 else f'a{i % 6}')
+        for i in range(17)
+    ])
+    db.session.commit()
+
+
+def listing(client, auth_headers, query):
+    response = client.get(f'/api/tasks?{query}', headers=auth_headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+@pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+@pytest.mark.parametrize('sort_by', SORTS)
+def test_cursor_pages_round_trip(app, client, user_id, auth_headers, sort_by, sort_order):
+    with app.app_context():
+        seed(user_id)
+    sort = f'sort_by={sort_by}&sort_order={sort_order}'
+    expected = [task['id'] for task in listing(client, auth_headers, f'{sort}&limit=100')['tasks']]
+
+    paged, cursor = [], None
+    for _ in range(len(expected)):  # a cursor that does not advance must not loop forever
+        data = listing(client, auth_headers, f'{sort}&limit={PAGE}' + (f'&cursor={cursor}' if cursor else ''))
+        paged += [task['id'] for task in data['tasks']]
+        assert data['has_more'] == (data['next_cursor'] is not None)
+        if not data['has_more']:
+            break
+        cursor = data['next_cursor']
+
+    assert len(expected) == 17
+    assert paged == expected
+
+
+def test_null_due_dates_sort_last_in_both_directions(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    for sort_order in ('asc', 'desc'):
+        tasks = listing(client, auth_headers, f'sort_by=due_date&sort_order={sort_order}&limit=100')['tasks']
+        due = [task['due_date'] for task in tasks]
+        dated = [d for d in due if d is not None]
+        assert due == dated + [None] * (len(due) - len(dated))
+        assert dated == sorted(dated, reverse=sort_order == 'desc')
+
+
+def test_cursor_must_match_the_sort(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    cursor = listing(client, auth_headers, f'sort_by=title&limit={PAGE}')['next_cursor']
+
+    response = client.get(f'/api/tasks?sort_by=due_date&cursor={cursor}', headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get('/api/tasks?cursor=not-a-cursor', headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_fields_projection_loads_only_the_requested_columns(app, client, user_id, auth_headers, sql):
+    with app.app_context():
+        seed(user_id)
+    with sql as recorded:
+        data = listing(client, auth_headers, 'fields=title&sort_by=title&limit=100')
+
+    assert all(set(task) == {'id', 'title'} for task in data['tasks'])
+    select = next(statement for statement, _ in recorded.statements if 'FROM tasks' in statement)
+    assert 'tasks.title' in select and 'tasks.description' not in select
@@ -0,0 +1,20 @@
+"""Plan cache keys: trivially different spellings share an entry, different goals never do."""
+import pytest
+from app.services.plan_cache import PlanCache, normalize_goal
+
+
+@pytest.mark.parametrize('goal, expected', [
+    ('Learn C++', 'learn c++'),
+    ('Learn C#', 'learn c#'),
+    ('  LEARN   Node.js!! ', 'learn node.js'),
+    ('ＬＥＡＲＮ Ｃ＋＋', 'learn c++'),
+    ('Build a blog.', 'build a blog'),
+])
+def test_normalize_goal(goal, expected):
+    assert normalize_goal(goal) == expected
+
+
+def test_distinct_goals_get_distinct_keys():
+    keys = {PlanCache.key(goal, 'model', 1) for goal in ('Learn C++', 'Learn C#', 'learn c')}
+    assert len(keys) == 3
+    assert PlanCache.key('Learn C++', 'model', 1) == PlanCache.key('learn c++?', 'model', 1)
@@ -0,0 +1,61 @@
+"""Plans become a project and tasks with a fixed number of statements, keeping their grouping in tags."""
+import json
+from datetime import date, timedelta
+from app.extensions import db
+from app.models.project import project_task_association
+from app.models.task import Task
+from app.services.counters import rebuild_task_counters
+from app.services.llm import fake_plan
+from app.services.plans import materialize_plan
+
+
+def materialize(app, user_id, plan, sql=None):
+    with app.app_context():
+        if sql is None:
+            project_id = materialize_plan(user_id, plan).id
+        else:
+            with sql as recorded:
+                project_id = materialize_plan(user_id, plan).id
+        db.session.commit()
+    return project_id, recorded.count if sql is not None else None
+
+
+def project_tasks(project_id):
+    return Task.query.join(project_task_association).filter(
+        project_task_association.c.project_id == project_id).order_by(Task.rank).all()
+
+
+def test_tasks_keep_plan_order_grouping_and_resources(app, user_id):
+    with app.app_context():
+        db.session.add(Task(title='Already there', user_id=user_id, rank='m'))
+        db.session.commit()
+    plan = fake_plan('learn Rust', mini_projects=2, major_projects=1, tasks_per_project=3)
+    project_id, _ = materialize(app, user_id, plan)
+
+    with app.app_context():
+        tasks = project_tasks(project_id)
+        tags = [json.loads(task.tags) for task in tasks]
+
+        assert [task.title for task in tasks] == [
+            f'{group} task {n}' for group in ('Mini project 1', 'Mini project 2', 'Major project 1')
+            for n in (1, 2, 3)]
+        # Appended after the existing column, in plan order
+        assert all(task.rank > 'm' for task in tasks)
+        assert [t['group'] for t in tags] == ['mini_project'] * 6 + ['major_project'] * 3
+        assert [t['sub_project'] for t in tags][::3] == ['Mini project 1', 'Mini project 2', 'Major project 1']
+        assert tags[4]['resources'] == plan['mini_projects'][1]['tasks'][1]['resources']
+        assert tags[4]['source'] == 'ai_plan' and tags[4]['day'] == 5
+        assert tasks[4].due_date.date() == date.today() + timedelta(days=4)
+        assert tasks[4].estimated_duration == plan['mini_projects'][1]['tasks'][1]['estimated_duration_minutes']
+        assert {task.status for task in tasks} == {'todo'}
+
+        assert rebuild_task_counters([user_id], dry_run=True) == {'users': [], 'categories': []}
+
+
+def test_statement_count_does_not_grow_with_the_plan(app, user_id, sql):
+    _, small = materialize(app, user_id, fake_plan('small', 1, 0, 2), sql)
+    project_id, large = materialize(app, user_id, fake_plan('large', 6, 4, 12), sql)
+
+    assert large == small
+    with app.app_context():
+        assert len(project_tasks(project_id)) == 120
@@ -0,0 +1,56 @@
+"""Chat project lookup: fuzzy matches above the threshold, ambiguity below the margin, and a cached index."""
+import pytest
+from app.services.chat import find_project
+from app.services.project_index import MIN_MARGIN, MIN_SIMILARITY, ProjectNameIndex, similarity
+
+NAMES = ['Home Renovation', 'Marketing Plan', 'Website Launch', 'Website Redesign']
+INDEX = ProjectNameIndex(list(enumerate(NAMES, start=1)))
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('marketing plan', 'Marketing Plan'),        # case
+    ('Marketing-Plan!', 'Marketing Plan'),       # punctuation
+    ('plan marketing', 'Marketing Plan'),        # word order
+    ('Marketng plan', 'Marketing Plan'),         # typo
+    ('home reno', 'Home Renovation'),            # partial word
+    ('redesign the website', 'Website Redesign'),
+])
+def test_close_names_match(query, expected):
+    project_id, candidates = INDEX.match(query)
+    assert NAMES[project_id - 1] == expected and candidates == [expected]
+
+
+def test_names_below_the_threshold_do_not_match():
+    assert similarity('web', 'Website Launch') < MIN_SIMILARITY
+    assert INDEX.match('web') == (None, [])
+    assert INDEX.match('Grocery list') == (None, [])
+    assert INDEX.match('') == (None, [])
+
+
+def test_names_too_close_to_call_return_candidates():
+    scores = sorted((similarity('website', name) for name in NAMES), reverse=True)
+    assert scores[0] - scores[1] < MIN_MARGIN
+
+    assert INDEX.match('website') == (None, ['Website Launch', 'Website Redesign'])
+    # An exact name wins however close the runner-up is
+    index = ProjectNameIndex([(1, 'Website'), (2, 'Websites')])
+    assert index.match('WEBSITE') == (1, ['Website'])
+
+
+def test_index_is_cached_until_projects_change(app, client, user_id, auth_headers, sql):
+    created = client.post('/api/projects', headers=auth_headers, json={'name': 'Garden'}).get_json()['data']['project']
+    with app.app_context():
+        assert find_project(user_id, 'gardn')[0].id == created['id']
+        with sql as recorded:
+            find_project(user_id, 'garden')
+        # One statement to load the project row; the index itself came from the cache
+        assert recorded.count == 1
+
+    client.put(f"/api/projects/{created['id']}", headers=auth_headers, json={'name': 'Vegetable patch'})
+    with app.app_context():
+        assert find_project(user_id, 'garden') == (None, [])
+        assert find_project(user_id, 'vegetable patch')[0].id == created['id']
+
+    client.delete(f"/api/projects/{created['id']}", headers=auth_headers)
+    with app.app_context():
+        assert find_project(user_id, 'vegetable patch') == (None, [])
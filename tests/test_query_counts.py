@@ -0,0 +1,53 @@
+"""The list endpoints must issue the same number of statements for 5 rows as for 50."""
+import pytest
+from app.extensions import db
+from app.models.note import Note
+from app.models.project import Project, project_task_association
+from app.models.task import Task
+
+SMALL, LARGE = 5, 50
+
+
+def seed(user_id, rows):
+    """`rows` tasks and notes, each linked to a project of its own."""
+    projects = [Project(name=f'Project {i}', user_id=user_id) for i in range(rows)]
+    tasks = [Task(title=f'Task {i}', user_id=user_id) for i in range(rows)]
+    db.session.add_all(projects + tasks)
+    db.session.flush()
+    db.session.add_all([Note(title=f'Note {i}', content=f'searchable note {i}', user_id=user_id, project_id=project.id)
+                        for i, project in enumerate(projects)])
+    db.session.execute(project_task_association.insert(), [
+        {'project_id': project.id, 'task_id': task.id} for project, task in zip(projects, tasks)
+    ])
+    db.session.commit()
+
+
+ENDPOINTS = {
+    'get_tasks': ('/api/tasks?limit=100', lambda data: len(data['tasks'])),
+    'get_notes': ('/api/notes', lambda data: data['count']),
+    'search_notes': ('/api/notes/search?q=searchable&per_page=100', lambda data: len(data['results'])),
+}
+
+
+def statements_for(client, auth_headers, sql, path, rows_of):
+    with sql as recorded:
+        response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return recorded.count, rows_of(response.get_json()['data'])
+
+
+@pytest.mark.parametrize('endpoint', sorted(ENDPOINTS))
+def test_statement_count_does_not_grow_with_rows(app, client, user_id, auth_headers, sql, endpoint):
+    path, rows_of = ENDPOINTS[endpoint]
+
+    with app.app_context():
+        seed(user_id, SMALL)
+    small_count, small_rows = statements_for(client, auth_headers, sql, path, rows_of)
+    with app.app_context():
+        seed(user_id, LARGE - SMALL)
+    large_count, large_rows = statements_for(client, auth_headers, sql, path, rows_of)
+
+    assert (small_rows, large_rows) == (SMALL, LARGE)
+    assert large_count == small_count, (
+        f'{endpoint} issued {small_count} statements for {SMALL} rows but {large_count} for {LARGE}'
+    )
@@ -0,0 +1,10 @@
+"""Every statement the hot endpoints send must be answerable from an index."""
+from app.services.query_plans import ENDPOINTS, check_query_plans
+
+
+def test_endpoint_sql_uses_indexes(app):
+    results = check_query_plans(app, users=10, rows=100)
+
+    assert {name for name, _, _, _ in results} >= {name for name, _ in ENDPOINTS}
+    full_scans = [(name, tables, statement) for name, statement, tables, _ in results if tables]
+    assert not full_scans, full_scans
@@ -0,0 +1,87 @@
+"""Rank keys must keep their order however often tasks are moved to the ends of a column."""
+import random
+import pytest
+from app.extensions import db
+from app.models.project import Project
+from app.models.task import Task
+from app.services.chat import perform_action
+from app.services.ranking import MAX_LENGTH, evenly_spaced_keys, key_between
+
+MOVES = 500
+
+
+def test_repeated_move_to_top_keeps_descending():
+    top = evenly_spaced_keys(1000)[0]
+    for _ in range(MOVES):
+        key = key_between(None, top)
+        assert key < top
+        top = key
+    assert len(top) < MAX_LENGTH
+
+
+def test_repeated_move_to_bottom_keeps_ascending():
+    bottom = evenly_spaced_keys(1000)[-1]
+    for _ in range(MOVES):
+        key = key_between(bottom, None)
+        assert key > bottom
+        bottom = key
+    assert len(bottom) < MAX_LENGTH
+
+
+@pytest.mark.parametrize('before, after', [
+    (None, None), (None, '1'), (None, '001'), (None, 'i'), ('zzz', None), ('z', None),
+    ('h', 'i'), ('h', 'h1'), ('a', 'a001'), ('0z', '1'), ('zy', 'zz'),
+])
+def test_key_between_sorts_between_its_neighbours(before, after):
+    key = key_between(before, after)
+    assert key and not key.endswith('0') and not key.strip('0123456789abcdefghijklmnopqrstuvwxyz')
+    assert before is None or before < key
+    assert after is None or key < after
+
+
+def test_key_between_random_inserts_stay_sorted():
+    rng = random.Random(8)
+    keys = evenly_spaced_keys(10)
+    for _ in range(MOVES):
+        i = rng.randint(0, len(keys))
+        keys.insert(i, key_between(keys[i - 1] if i else None, keys[i] if i < len(keys) else None))
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+
+
+def test_key_between_rejects_misordered_neighbours():
+    with pytest.raises(ValueError):
+        key_between('i', 'h')
+
+
+def test_move_to_top_through_the_api(app, client, user_id, auth_headers):
+    with app.app_context():
+        tasks = [Task(title=f'Task {i}', user_id=user_id, rank=key)
+                 for i, key in enumerate(evenly_spaced_keys(1000)[:3])]
+        db.session.add_all(tasks)
+        db.session.commit()
+        ids = [task.id for task in tasks]
+        top = tasks[0].rank
+
+    # Repeatedly move whichever task is last to the top of the column
+    for _ in range(60):
+        response = client.post(f'/api/tasks/{ids[-1]}/move', json={'after_id': ids[0]}, headers=auth_headers)
+        assert response.status_code == 200, response.get_json()
+        rank = response.get_json()['data']['task']['rank']
+        assert rank < top
+        top = rank
+        ids = ids[-1:] + ids[:-1]
+
+    response = client.get('/api/tasks?sort_by=rank&sort_order=asc', headers=auth_headers)
+    assert [task['id'] for task in response.get_json()['data']['tasks']] == ids
+
+
+def test_chat_added_task_goes_to_the_end_of_its_column(app, user_id):
+    with app.app_context():
+        db.session.add_all([Project(name='Launch', user_id=user_id),
+                            Task(title='Existing', user_id=user_id, rank='m')])
+        db.session.commit()
+
+        result = perform_action(user_id, {'action': 'add_task', 'task': {'title': 'New', 'project_name': 'Launch'}})
+
+        assert result['action_taken'] == 'task_added'
+        assert db.session.get(Task, result['new_task']['id']).rank > 'm'
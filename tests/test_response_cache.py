@@ -0,0 +1,32 @@
+"""Cached payloads must never outlive a write that committed while they were built."""
+from app.extensions import cache
+from app.services.cache import cached_json_response
+
+
+def test_payload_built_across_a_write_is_not_cached(app, user_id):
+    builds = []
+
+    def build():
+        builds.append(1)
+        if len(builds) == 1:
+            cache.invalidate_user(user_id)  # a write commits mid-build
+        return {'build': len(builds)}, 200
+
+    with app.test_request_context():
+        first = cached_json_response('race', user_id, build)
+    with app.test_request_context():
+        second = cached_json_response('race', user_id, build)
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'MISS'
+    assert second.get_json() == {'build': 2}
+
+
+def test_profile_update_invalidates_dashboard(client, auth_headers):
+    assert client.get('/api/dashboard/data', headers=auth_headers).headers['X-Cache'] == 'MISS'
+    assert client.get('/api/dashboard/data', headers=auth_headers).headers['X-Cache'] == 'HIT'
+
+    response = client.put('/api/profile', headers=auth_headers, json={'first_name': 'Renamed'})
+    assert response.status_code == 200
+
+    assert client.get('/api/dashboard/data', headers=auth_headers).headers['X-Cache'] == 'MISS'
@@ -0,0 +1,70 @@
+"""Task stats come from one aggregate query and agree with counting the tasks one by one."""
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import cache, db
+from app.models.task import Task
+from app.services.stats import compute_task_stats
+
+NOW = datetime(2025, 6, 11, 15, 0)  # a Wednesday afternoon
+
+
+def seed(user_id, count, offset=0):
+    tasks = []
+    for i in range(offset, offset + count):
+        status = ('todo', 'in-progress', 'completed', 'cancelled')[i % 4]
+        tasks.append(Task(
+            title=f'Task {i}', user_id=user_id, status=status,
+            priority=('low', 'medium', 'high')[i % 3],
+            due_date=None if i % 5 == 0 else NOW + timedelta(hours=7 * (i % 11) - 30),
+            completed_at=NOW - timedelta(days=i % 10) if status == 'completed' else None,
+        ))
+    db.session.add_all(tasks)
+    db.session.commit()
+    return tasks
+
+
+def recount(tasks):
+    """The per-counter list comprehensions the aggregate query replaced."""
+    today = datetime.combine(NOW.date(), datetime.min.time())
+    is_open = [t for t in tasks if t.status not in ('completed', 'cancelled')]
+    counts = {
+        'total': len(tasks),
+        'completed': sum(t.status == 'completed' for t in tasks),
+        'in_progress': sum(t.status == 'in-progress' for t in tasks),
+        'cancelled': sum(t.status == 'cancelled' for t in tasks),
+        'high_priority': sum(t.priority == 'high' for t in tasks),
+        'medium_priority': sum(t.priority == 'medium' for t in tasks),
+        'low_priority': sum(t.priority == 'low' for t in tasks),
+        'overdue': sum(t.due_date is not None and t.due_date < NOW for t in is_open),
+        'due_today': sum(t.due_date is not None and t.due_date.date() == today.date() for t in tasks),
+        'due_this_week': sum(t.due_date is not None and 0 <= (t.due_date.date() - today.date()).days <= 7
+                             for t in tasks),
+        'completed_this_week': sum(t.completed_at is not None and t.completed_at >= NOW - timedelta(days=7)
+                                   for t in tasks),
+    }
+    counts['todo'] = sum(t.status == 'todo' for t in tasks)
+    return counts
+
+
+def test_counters_match_a_recount(app, user_id):
+    with app.app_context():
+        tasks = seed(user_id, 60)
+        assert compute_task_stats(user_id, now=NOW) == recount(tasks)
+
+
+@pytest.mark.parametrize('path', ['/api/tasks/stats', '/api/dashboard/stats'])
+def test_stats_endpoints_send_the_same_statements_for_more_tasks(app, client, user_id, auth_headers, sql, path):
+    with app.app_context():
+        seed(user_id, 5)
+        cache.invalidate_user(user_id)
+    with sql as small:
+        assert client.get(path, headers=auth_headers).status_code == 200
+    with app.app_context():
+        seed(user_id, 200, offset=5)
+        cache.invalidate_user(user_id)
+    with sql as large:
+        response = client.get(path, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['total_tasks'] == 205
+    assert large.count == small.count
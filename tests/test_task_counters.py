@@ -0,0 +1,70 @@
+"""The materialized task counters always agree with a recount from the tasks table."""
+from app.extensions import db
+from app.models.category import Category
+from app.models.task_counter import CategoryTaskCounter, UserTaskCounter
+from app.services.counters import rebuild_task_counters
+
+
+def assert_no_drift(app, user_id):
+    with app.app_context():
+        report = rebuild_task_counters([user_id], dry_run=True)
+    assert report['users'] == [] and report['categories'] == [], report
+
+
+def test_counters_follow_every_kind_of_write(app, client, user_id, auth_headers):
+    with app.app_context():
+        categories = [Category(name=name, user_id=user_id) for name in ('Work', 'Home')]
+        db.session.add_all(categories)
+        db.session.commit()
+        work, home = (category.id for category in categories)
+    project = client.post('/api/projects', headers=auth_headers, json={'name': 'Launch'}).get_json()['data']['project']
+
+    # Create
+    ids = []
+    for i, status in enumerate(['todo', 'in-progress', 'completed', 'todo', 'todo']):
+        response = client.post('/api/tasks', headers=auth_headers, json={
+            'title': f'Task {i}', 'status': status, 'project_id': project['id'] if i < 2 else None})
+        assert response.status_code == 201, response.get_json()
+        ids.append(response.get_json()['data']['task']['id'])
+    assert_no_drift(app, user_id)
+
+    # Move between categories, then change status
+    for task_id, category_id in zip(ids, (work, work, home, home)):
+        assert client.post(f'/api/tasks/{task_id}/move', headers=auth_headers,
+                           json={'category_id': category_id}).status_code == 200
+    assert client.put(f'/api/tasks/{ids[0]}', headers=auth_headers, json={'status': 'completed'}).status_code == 200
+    assert client.put(f'/api/tasks/{ids[2]}', headers=auth_headers, json={'status': 'todo'}).status_code == 200
+    assert_no_drift(app, user_id)
+
+    # Bulk update, with the same task twice
+    response = client.put('/api/tasks/bulk', headers=auth_headers, json={'tasks': [
+        {'id': ids[3], 'status': 'in-progress'},
+        {'id': ids[3], 'status': 'completed'},
+        {'id': ids[4], 'status': 'completed'},
+    ]})
+    assert response.status_code == 200
+    assert_no_drift(app, user_id)
+
+    # Delete a task, then the project with the rest of its tasks
+    assert client.delete(f'/api/tasks/{ids[2]}', headers=auth_headers).status_code == 200
+    assert client.delete(f"/api/projects/{project['id']}", headers=auth_headers).status_code == 200
+    assert_no_drift(app, user_id)
+
+    stats = client.get('/api/auth/me', headers=auth_headers).get_json()['data']['stats']
+    assert (stats['total'], stats['completed'], stats['pending']) == (2, 2, 0)
+    with app.app_context():
+        assert db.session.get(CategoryTaskCounter, home).total == 1
+        assert db.session.get(Category, work).get_task_count() == 0
+
+
+def test_rebuild_reports_and_repairs_drift(app, client, user_id, auth_headers):
+    client.post('/api/tasks', headers=auth_headers, json={'title': 'Counted'})
+    with app.app_context():
+        db.session.get(UserTaskCounter, user_id).total = 7
+        db.session.commit()
+
+        report = rebuild_task_counters([user_id])
+        assert [(row['id'], row['stored']['total'], row['actual']['total']) for row in report['users']] == [
+            (user_id, 7, 1)]
+        db.session.commit()
+    assert_no_drift(app, user_id)
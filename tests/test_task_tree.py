@@ -0,0 +1,100 @@
+"""GET /api/tasks/tree: one recursive query, a depth limit, and progress computed bottom-up."""
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.models.task import Task
+from app.models.user import User
+from app.services.task_tree import MAX_DEPTH_LIMIT
+
+
+def seed(user_id):
+    """
+    Root (todo)
+    ├── A (todo)
+    │   ├── A1 (completed)
+    │   └── A2 (todo)
+    │       └── A2x (completed)
+    └── B (completed)
+    """
+    def add(title, status, parent=None):
+        task = Task(title=title, status=status, user_id=user_id, parent_task_id=parent.id if parent else None)
+        db.session.add(task)
+        db.session.flush()
+        return task
+
+    root = add('Root', 'todo')
+    a = add('A', 'todo', root)
+    add('A1', 'completed', a)
+    a2 = add('A2', 'todo', a)
+    add('A2x', 'completed', a2)
+    add('B', 'completed', root)
+    db.session.commit()
+    return root.id
+
+
+def tree(client, auth_headers, query=''):
+    response = client.get(f'/api/tasks/tree?{query}', headers=auth_headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def flatten(nodes):
+    for node in nodes:
+        yield node
+        yield from flatten(node['subtasks'])
+
+
+def test_progress_rolls_up_from_the_leaves(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    nodes = {node['title']: node for node in flatten(tree(client, auth_headers)['tasks'])}
+
+    assert {title: (node['depth'], node['progress_percentage']) for title, node in nodes.items()} == {
+        'Root': (0, 50), 'A': (1, 50), 'A1': (2, 100), 'A2': (2, 100), 'A2x': (3, 100), 'B': (1, 100)}
+    assert [child['title'] for child in nodes['Root']['subtasks']] == ['A', 'B']
+
+
+def test_depth_limit_truncates_but_keeps_progress(app, client, user_id, auth_headers):
+    with app.app_context():
+        seed(user_id)
+    data = tree(client, auth_headers, 'max_depth=2')
+    nodes = {node['title']: node for node in flatten(data['tasks'])}
+
+    assert data['max_depth'] == 2
+    assert 'A2x' not in nodes
+    assert nodes['A2']['subtasks'] == [] and nodes['A2']['truncated_subtasks'] == 1
+    assert nodes['A2']['progress_percentage'] == 100
+    assert nodes['A1']['truncated_subtasks'] == 0
+
+    assert tree(client, auth_headers, 'max_depth=1000')['max_depth'] == MAX_DEPTH_LIMIT
+    assert [node['title'] for node in tree(client, auth_headers, 'max_depth=0')['tasks']] == ['Root']
+
+
+def test_one_query_for_the_whole_tree(app, client, user_id, auth_headers, sql):
+    with app.app_context():
+        root_id = seed(user_id)
+        # Make it deeper; the statement count must not follow
+        parent_id = root_id
+        for depth in range(8):
+            task = Task(title=f'Level {depth}', user_id=user_id, parent_task_id=parent_id)
+            db.session.add(task)
+            db.session.flush()
+            parent_id = task.id
+        db.session.commit()
+
+    with sql as recorded:
+        data = tree(client, auth_headers, f'root_id={root_id}')
+    assert len(list(flatten(data['tasks']))) == 14
+    assert sum('task_tree' in statement for statement, _ in recorded.statements) == 1
+    assert sum('FROM tasks' in statement for statement, _ in recorded.statements) == 1
+
+
+def test_other_users_root_is_not_found(app, client, user_id, auth_headers):
+    with app.app_context():
+        root_id = seed(user_id)
+        other = User(username='other', email='other@example.com')
+        other.set_password('password')
+        db.session.add(other)
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(other.id))}'}
+
+    assert client.get(f'/api/tasks/tree?root_id={root_id}', headers=headers).status_code == 404
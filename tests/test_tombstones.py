@@ -0,0 +1,111 @@
+"""Tombstoned rows disappear from every listing and search until a purge removes them for good."""
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.extensions import db
+from app.models.focus_session import FocusSession
+from app.models.note import Note
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_time import TaskTimeRollup, record_task_time
+from app.services.counters import rebuild_task_counters
+from app.services.tombstones import purge_tombstones
+
+
+def seed(client, auth_headers):
+    """A project with two dated tasks and a note; a loose task, and a note in another project."""
+    def post(path, **body):
+        response = client.post(path, headers=auth_headers, json=body)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['data']
+
+    project = post('/api/projects', name='Move house')['project']
+    errands = post('/api/projects', name='Errands')['project']
+    post('/api/notes', title='Loose note', content='Remember the boxes', project_id=errands['id'])
+    ids = {
+        'project': project['id'],
+        'errands': errands['id'],
+        'note': post('/api/notes', title='Movers', content='Boxes arrive Friday', project_id=project['id'])['note']['id'],
+        'loose_task': post('/api/tasks', title='Pack boxes', due_date='2025-03-03T09:00:00')['task']['id'],
+        'tasks': [post('/api/tasks', title=f'Boxes {i}', project_id=project['id'],
+                       due_date='2025-03-04T09:00:00')['task']['id'] for i in range(2)],
+    }
+    return ids
+
+
+def visible(client, auth_headers):
+    """Ids of what the user can still see through the API."""
+    def get(path):
+        response = client.get(path, headers=auth_headers)
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()
+
+    return {
+        'projects': {p['id'] for p in get('/api/projects')['data']['projects']},
+        'tasks': {t['id'] for t in get('/api/tasks?limit=100')['data']['tasks']},
+        'notes': {n['id'] for n in get('/api/notes')['data']['notes']},
+        'search': {n['id'] for n in get('/api/notes/search?q=boxes')['data']['results']},
+        'calendar': {e['id'] for e in get('/api/calendar/events?start=2025-03-01&end=2025-03-08')['events']},
+        'total_tasks': get('/api/tasks/stats')['data']['total_tasks'],
+    }
+
+
+def stored(model, ids):
+    """Ids of rows still in the table, tombstoned or not."""
+    return set(db.session.execute(
+        select(model.id).where(model.id.in_(ids)), execution_options={'include_deleted': True}).scalars())
+
+
+def test_deleted_task_and_note_are_hidden_but_kept(app, client, user_id, auth_headers):
+    ids = seed(client, auth_headers)
+    assert client.delete(f"/api/tasks/{ids['loose_task']}", headers=auth_headers).status_code == 200
+    assert client.delete(f"/api/notes/{ids['note']}", headers=auth_headers).status_code == 200
+
+    seen = visible(client, auth_headers)
+    assert ids['loose_task'] not in seen['tasks'] and f"task_{ids['loose_task']}" not in seen['calendar']
+    assert ids['note'] not in seen['notes'] | seen['search']
+    assert len(seen['search']) == 1 and seen['total_tasks'] == 2
+    assert client.put(f"/api/tasks/{ids['loose_task']}", headers=auth_headers,
+                      json={'title': 'Back'}).status_code == 404
+    with app.app_context():
+        assert stored(Task, [ids['loose_task']]) == {ids['loose_task']}
+        assert stored(Note, [ids['note']]) == {ids['note']}
+
+
+def test_deleting_a_project_hides_its_tasks_and_notes(app, client, user_id, auth_headers):
+    ids = seed(client, auth_headers)
+    response = client.delete(f"/api/projects/{ids['project']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()['data']['deleted'] == {'tasks': 2, 'notes': 1, 'projects': 1}
+
+    seen = visible(client, auth_headers)
+    assert seen['projects'] == {ids['errands']}
+    assert seen['tasks'] == {ids['loose_task']} and seen['total_tasks'] == 1
+    assert seen['calendar'] == {f"task_{ids['loose_task']}"}
+    assert ids['note'] not in seen['notes'] | seen['search']
+    with app.app_context():
+        assert rebuild_task_counters([user_id], dry_run=True) == {'users': [], 'categories': []}
+
+        # Recent tombstones survive a purge; old enough ones are removed for good
+        assert purge_tombstones(sleep=0)['batches'] == 0
+        report = purge_tombstones(older_than=timedelta(0), sleep=0)
+        assert {name: report['removed'][name] for name in ('tasks', 'notes', 'projects')} == {
+            'tasks': 2, 'notes': 1, 'projects': 1}
+        assert stored(Task, ids['tasks']) == set() and stored(Project, [ids['project']]) == set()
+        assert stored(Task, [ids['loose_task']]) == {ids['loose_task']}
+
+
+def test_purge_removes_task_time_rollups(app, user_id):
+    with app.app_context():
+        task = Task(title='Tracked', user_id=user_id, estimated_duration=30)
+        db.session.add(task)
+        db.session.flush()
+        db.session.add(FocusSession(user_id=user_id, task_id=task.id, duration=25))
+        record_task_time(db.session, task.id, datetime.utcnow().date(), 25)
+        task.soft_delete(datetime.utcnow() - timedelta(days=2))
+        db.session.commit()
+
+        report = purge_tombstones(older_than=timedelta(hours=1), sleep=0)
+
+        assert report['removed']['tasks'] == 1
+        assert report['removed']['task_time_rollups'] == 1
+        assert db.session.query(TaskTimeRollup).count() == 0